@@ -0,0 +1,88 @@
+"""Load/save throughput of the available JSON codecs.
+
+Usage:
+  PYTHONPATH=src python benchmarks/bench_codecs.py [--n 200000]
+
+Saves and reloads a synthetic reservations file through JsonStore with
+every installed codec, in indented and compact mode, and reports file
+size and records per second for each direction.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from reservation_system.storage import (
+    LAYOUTS,
+    JsonStore,
+    available_codecs,
+    get_codec,
+    paths_in,
+)
+
+
+def _records(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    base = date(2026, 1, 1)
+    out = []
+    for i in range(n):
+        start = base + timedelta(days=rng.randrange(365))
+        out.append(
+            {
+                "resv_id": "R{:08d}".format(i),
+                "hotel_id": "H{:04d}".format(rng.randrange(200)),
+                "customer_id": "C{:06d}".format(rng.randrange(50000)),
+                "check_in": start.isoformat(),
+                "check_out": (
+                    start + timedelta(days=rng.randint(1, 7))
+                ).isoformat(),
+                "room_no": rng.randint(1, 60),
+            }
+        )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--layout", choices=LAYOUTS, default="array")
+    opts = parser.parse_args()
+
+    items = _records(opts.n)
+    print("records: {:,}  layout: {}".format(opts.n, opts.layout))
+    print("{:<18}{:>10}{:>14}{:>14}".format(
+        "codec", "MiB", "save rec/s", "load rec/s"))
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = paths_in(tmp, opts.layout)
+        for name in available_codecs():
+            for compact in (False, True):
+                if opts.layout != "array" and compact:
+                    continue  # records are always one compact line
+                codec = get_codec(name, compact=compact)
+                store = JsonStore(paths, layout=opts.layout, codec=codec)
+                t0 = time.perf_counter()
+                store.save_reservations(items)
+                t_save = time.perf_counter() - t0
+                # Fresh store so the load is a cold parse of the file.
+                store = JsonStore(paths, layout=opts.layout, codec=codec)
+                t0 = time.perf_counter()
+                loaded = store.load_reservations()
+                t_load = time.perf_counter() - t0
+                assert len(loaded) == opts.n
+                label = name + (" compact" if compact else "")
+                print("{:<18}{:>10.1f}{:>14,.0f}{:>14,.0f}".format(
+                    label,
+                    os.path.getsize(paths.reservations) / 2**20,
+                    opts.n / t_save,
+                    opts.n / t_load,
+                ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""On-disk footprint and speed of compressed storage.
+
+Usage:
+  PYTHONPATH=src python benchmarks/bench_compression.py [--n 200000]
+
+Writes the same synthetic reservations as a plain JSON array, as
+gzip/bz2/xz compressed arrays and in the "blocks" layout with each
+block compressor, then reports file size, full load time and the time
+of a point lookup on a freshly opened store (after its index is built).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from bench_codecs import _records  # type: ignore[import-not-found]
+
+from reservation_system.storage import (
+    BLOCK_COMPRESSION,
+    JsonStore,
+    StorePaths,
+)
+
+
+def _paths(tmp: str, name: str) -> StorePaths:
+    return StorePaths(
+        hotels=os.path.join(tmp, "hotels" + name),
+        customers=os.path.join(tmp, "customers" + name),
+        reservations=os.path.join(tmp, "reservations" + name),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    opts = parser.parse_args()
+
+    items = _records(opts.n)
+    probe = items[len(items) // 2]["resv_id"]
+    cases = [("array", ext, "zlib") for ext in (".json", ".json.gz",
+                                                ".json.bz2", ".json.xz")]
+    cases += [("blocks", ".blk", name) for name in BLOCK_COMPRESSION]
+    print("records: {:,}".format(opts.n))
+    print("{:<22}{:>10}{:>12}{:>14}".format(
+        "format", "MiB", "load s", "lookup ms"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout, ext, compression in cases:
+            paths = _paths(tmp, ext)
+            JsonStore(paths, layout=layout, compression=compression) \
+                .save_reservations(items)
+            store = JsonStore(paths, layout=layout, compression=compression)
+            t0 = time.perf_counter()
+            store.load_reservations()
+            t_load = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            store.get_reservation(probe)
+            t_get = time.perf_counter() - t0
+            label = ext if layout == "array" else "blocks/" + compression
+            print("{:<22}{:>10.1f}{:>12.2f}{:>14.2f}".format(
+                label,
+                os.path.getsize(paths.reservations) / 2**20,
+                t_load,
+                1000 * t_get,
+            ))
+
+
+if __name__ == "__main__":
+    main()
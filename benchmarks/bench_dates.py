@@ -0,0 +1,107 @@
+"""Per-record cost of date handling, with and without memoized parsing.
+
+Usage:
+  PYTHONPATH=src python benchmarks/bench_dates.py [--n 200000]
+
+Builds ReservationRow and Reservation objects from synthetic records and
+compares the memoized ``iso_ordinal`` against parsing every date with
+``date.fromisoformat`` (the cache disabled), then times a night-overlap
+scan on ISO strings versus the precomputed ordinals.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+from reservation_system import rows, validators
+from reservation_system.reservation import Reservation
+from reservation_system.rows import ReservationRow
+
+
+def _records(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    base = date(2026, 1, 1)
+    out = []
+    for i in range(n):
+        start = base + timedelta(days=rng.randrange(365))
+        out.append(
+            {
+                "resv_id": "R{:08d}".format(i),
+                "hotel_id": "H{:04d}".format(rng.randrange(200)),
+                "customer_id": "C{:06d}".format(rng.randrange(50000)),
+                "check_in": start.isoformat(),
+                "check_out": (
+                    start + timedelta(days=rng.randint(1, 7))
+                ).isoformat(),
+                "room_no": rng.randint(1, 60),
+            }
+        )
+    return out
+
+
+def _uncached(val: str) -> int:
+    return date.fromisoformat(val).toordinal()
+
+
+def _per_record(fn: Callable[[], object], n: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best / n * 1e6
+
+
+def _build(items: List[Dict[str, Any]]) -> None:
+    for d in items:
+        Reservation.from_row(ReservationRow.from_dict(d))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    opts = parser.parse_args()
+
+    items = _records(opts.n)
+    print("records: {:,}".format(opts.n))
+    print("{:<34}{:>12}{:>12}".format("step", "uncached us", "cached us"))
+
+    with mock.patch.object(rows, "iso_ordinal", _uncached), \
+            mock.patch.object(validators, "iso_ordinal", _uncached):
+        slow = _per_record(lambda: _build(items), opts.n)
+    validators.iso_ordinal.cache_clear()
+    fast = _per_record(lambda: _build(items), opts.n)
+    print("{:<34}{:>12.2f}{:>12.2f}".format("row + Reservation", slow, fast))
+
+    built = [ReservationRow.from_dict(d) for d in items]
+    lo, hi = "2026-06-01", "2026-06-08"
+    lo_ord, hi_ord = validators.iso_ordinal(lo), validators.iso_ordinal(hi)
+
+    def by_parse() -> int:
+        a, b = date.fromisoformat(lo), date.fromisoformat(hi)
+        return sum(
+            1 for r in built
+            if date.fromisoformat(r.check_in) < b
+            and date.fromisoformat(r.check_out) > a
+        )
+
+    def by_ord() -> int:
+        return sum(
+            1 for r in built
+            if r.check_in_ord < hi_ord and r.check_out_ord > lo_ord
+        )
+
+    assert by_parse() == by_ord()
+    print("{:<34}{:>12.2f}{:>12.2f}".format(
+        "overlap scan", _per_record(by_parse, opts.n),
+        _per_record(by_ord, opts.n)))
+    print("date cache: {}".format(validators.iso_ordinal.cache_info()))
+
+
+if __name__ == "__main__":
+    main()
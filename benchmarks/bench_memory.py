@@ -0,0 +1,82 @@
+"""Memory footprint of loaded reservations: dicts vs interned rows.
+
+Usage:
+  PYTHONPATH=src python benchmarks/bench_memory.py [--n 1000000]
+
+Builds a synthetic reservations payload, decodes it the way the store
+does and measures the retained size of each in-memory representation
+with tracemalloc. Results are scaled to bytes per record and per 1M.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, List
+
+from reservation_system.reservation import Reservation
+from reservation_system.rows import ReservationRow
+
+
+def _payload(n: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    base = date(2026, 1, 1)
+    items = []
+    for i in range(n):
+        start = base + timedelta(days=rng.randrange(365))
+        items.append(
+            {
+                "resv_id": "R{:08d}".format(i),
+                "hotel_id": "H{:04d}".format(rng.randrange(200)),
+                "customer_id": "C{:06d}".format(rng.randrange(50000)),
+                "check_in": start.isoformat(),
+                "check_out": (
+                    start + timedelta(days=rng.randint(1, 7))
+                ).isoformat(),
+                "room_no": rng.randint(1, 60),
+            }
+        )
+    return json.dumps(items).encode("utf-8")
+
+
+def _measure(build: Callable[[], List[Any]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    opts = parser.parse_args()
+
+    raw = _payload(opts.n)
+    cases = {
+        "dicts (json.loads)": lambda: json.loads(raw),
+        "dataclasses (Reservation)": lambda: [
+            Reservation.from_dict(d) for d in json.loads(raw)
+        ],
+        "rows (interned tuples)": lambda: [
+            ReservationRow.from_dict(d) for d in json.loads(raw)
+        ],
+    }
+    print("records: {:,}".format(opts.n))
+    print("{:<28}{:>14}{:>16}".format("representation", "B/record",
+                                      "MiB per 1M"))
+    for name, build in cases.items():
+        per = _measure(build) / opts.n
+        print("{:<28}{:>14.1f}{:>16.1f}".format(name, per,
+                                                per * 1_000_000 / 2**20))
+
+
+if __name__ == "__main__":
+    main()
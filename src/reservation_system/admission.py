@@ -0,0 +1,227 @@
+"""Admission control in front of a thread-safe ReservationService.
+
+Without it every caller goes straight into the service and waits on its
+locks, so under a traffic spike the queue of blocked threads, and with
+it latency, grows without bound. ``AdmissionControl`` bounds that work:
+
+* at most ``max_concurrent`` requests run at once, and at most
+  ``max_per_hotel`` of them for the same hotel;
+* each hotel has a FIFO waiting queue of at most ``max_queue``
+  requests; a request arriving at a full queue fails at once;
+* a request that cannot start within its ``timeout`` leaves the queue.
+
+Shed requests raise ``OverloadError``, so callers can retry later or
+report "busy" instead of hanging. Admitted requests wait at most their
+timeout before they run, which bounds their latency.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .exceptions import OverloadError
+from .reservation import Reservation
+from .service import ReservationService
+
+# Queue key of requests that are not about one hotel.
+CATALOG = ""
+
+
+@dataclass(slots=True)
+class _Queue:
+    waiting: Deque[object] = field(default_factory=deque)
+    running: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionStats:
+    """Snapshot of the controller's queues and counters."""
+
+    running: int
+    queued: int
+    # Waiting requests per hotel; hotels with none are left out.
+    queue_depth: Dict[str, int]
+    admitted: int
+    rejected: int
+    timed_out: int
+    max_queued: int
+
+
+class AdmissionControl:
+    """Bounded, deadline-aware access to a ReservationService.
+
+    ``call`` runs any function under the limits of a hotel's queue; the
+    booking methods of the service are wrapped for convenience. The
+    service must be built with ``thread_safe=True``.
+    """
+
+    def __init__(
+        self,
+        service: ReservationService,
+        max_concurrent: int = 8,
+        max_per_hotel: int = 2,
+        max_queue: int = 16,
+        timeout: float = 0.5,
+    ) -> None:
+        if not service.thread_safe:
+            raise ValueError(
+                "AdmissionControl needs a thread_safe ReservationService."
+            )
+        if min(max_concurrent, max_per_hotel) < 1:
+            raise ValueError("Concurrency limits must be >= 1.")
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0.")
+        if timeout <= 0:
+            raise ValueError("timeout must be > 0.")
+        self.service = service
+        self.max_concurrent = max_concurrent
+        self.max_per_hotel = max_per_hotel
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._queues: Dict[str, _Queue] = {}
+        self._running = 0
+        self._queued = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._max_queued = 0
+
+    # -------- admission --------
+    def call(
+        self,
+        hotel_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``fn(*args, **kwargs)`` once admitted for ``hotel_id``.
+
+        Raises OverloadError if the hotel's queue is full or the request
+        could not start within ``timeout`` seconds (default: the
+        controller's).
+        """
+        key = hotel_id if isinstance(hotel_id, str) else CATALOG
+        deadline = time.monotonic() + (
+            self.timeout if timeout is None else timeout
+        )
+        q = self._enter(key, deadline)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._leave(key, q)
+
+    def _enter(self, key: str, deadline: float) -> _Queue:
+        with self._cond:
+            q = self._queues.get(key)
+            if q is None:
+                q = self._queues[key] = _Queue()
+            if self._can_run(q) and not q.waiting:
+                return self._start(q)
+            if len(q.waiting) >= self.max_queue:
+                self._rejected += 1
+                self._forget(key, q)
+                raise OverloadError(
+                    "Too many requests waiting for {}.".format(
+                        key or "the catalog")
+                )
+            ticket = object()
+            q.waiting.append(ticket)
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+            try:
+                # FIFO per hotel: only the oldest waiter may start.
+                while not (q.waiting[0] is ticket and self._can_run(q)):
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        self._timed_out += 1
+                        raise OverloadError(
+                            "Request timed out waiting for {}.".format(
+                                key or "the catalog")
+                        )
+                    self._cond.wait(left)
+            except BaseException:
+                self._dequeue(q, ticket)
+                self._forget(key, q)
+                raise
+            self._dequeue(q, ticket)
+            return self._start(q)
+
+    def _dequeue(self, q: _Queue, ticket: object) -> None:
+        q.waiting.remove(ticket)
+        self._queued -= 1
+        # The next waiter may be able to start now.
+        self._cond.notify_all()
+
+    def _can_run(self, q: _Queue) -> bool:
+        return (
+            self._running < self.max_concurrent
+            and q.running < self.max_per_hotel
+        )
+
+    def _start(self, q: _Queue) -> _Queue:
+        q.running += 1
+        self._running += 1
+        self._admitted += 1
+        return q
+
+    def _leave(self, key: str, q: _Queue) -> None:
+        with self._cond:
+            q.running -= 1
+            self._running -= 1
+            self._forget(key, q)
+            self._cond.notify_all()
+
+    def _forget(self, key: str, q: _Queue) -> None:
+        # Idle hotels are dropped so the table stays small.
+        if not q.running and not q.waiting:
+            del self._queues[key]
+
+    # -------- metrics --------
+    def stats(self) -> AdmissionStats:
+        with self._cond:
+            return AdmissionStats(
+                running=self._running,
+                queued=self._queued,
+                queue_depth={
+                    k: len(q.waiting)
+                    for k, q in self._queues.items()
+                    if q.waiting
+                },
+                admitted=self._admitted,
+                rejected=self._rejected,
+                timed_out=self._timed_out,
+                max_queued=self._max_queued,
+            )
+
+    # -------- service operations --------
+    def reserve_room(self, resv_id: str, hotel_id: str, *args: Any,
+                     **kwargs: Any) -> Reservation:
+        return self.call(hotel_id, self.service.reserve_room, resv_id,
+                         hotel_id, *args, **kwargs)
+
+    def reserve_block(self, hotel_id: str, *args: Any,
+                      **kwargs: Any) -> List[int]:
+        return self.call(hotel_id, self.service.reserve_block, hotel_id,
+                         *args, **kwargs)
+
+    def rooms_left(self, hotel_id: str, *args: Any, **kwargs: Any) -> int:
+        return self.call(hotel_id, self.service.rooms_left, hotel_id,
+                         *args, **kwargs)
+
+    def cancel_reservation(self, resv_id: str) -> None:
+        # Finding the hotel reads the store, so it is admitted too, in
+        # the catalog queue; both steps share one timeout.
+        deadline = time.monotonic() + self.timeout
+        it = None
+        if isinstance(resv_id, str):
+            it = self.call(CATALOG, self.service.store.get_reservation,
+                           resv_id)
+        hotel_id = it.get("hotel_id") if it else CATALOG
+        self.call(hotel_id, self.service.cancel_reservation, resv_id,
+                  timeout=max(0.0, deadline - time.monotonic()))
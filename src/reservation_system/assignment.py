@@ -0,0 +1,113 @@
+"""Room repacking for a hotel's future reservations.
+
+Picking the lowest free room for each booking as it arrives leaves
+free nights scattered over many rooms, so a long stay may find no single
+room free for all its nights even though enough room-nights are free.
+Repacking recomputes the rooms of the movable stays (those whose room
+the service chose) with the interval-graph colouring greedy: visit the
+stays by check-in and give each one a room that is free again by then,
+opening a new room only when none is. Without fixed stays this uses as
+few rooms as the busiest night needs, which leaves the remaining rooms
+free for any stay length.
+
+Stays whose room the guest asked for, or that have already started, keep
+their room and block it for their nights.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Dates are day ordinals (see ``validators.iso_ordinal``).
+# (resv_id, check_in, check_out) of a stay that may change rooms.
+Stay = Tuple[str, int, int]
+# (room_no, check_in, check_out) of a stay that keeps its room.
+Fixed = Tuple[int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class RepackReport:
+    """Outcome of ``ReservationService.optimize_assignments``.
+
+    ``rooms_before``/``rooms_after`` count the rooms holding at least
+    one stay from ``from_date`` on; the difference is the number of
+    rooms that became free for the whole period.
+    """
+
+    hotel_id: str
+    from_date: str
+    movable: int
+    moved: int
+    rooms_before: int
+    rooms_after: int
+
+    @property
+    def rooms_freed(self) -> int:
+        return self.rooms_before - self.rooms_after
+
+
+class _Blocked:
+    """Nights blocked by fixed stays, per room."""
+
+    def __init__(self, fixed: Iterable[Fixed]) -> None:
+        by_room: Dict[int, List[Tuple[int, int]]] = {}
+        for room, cin, cout in fixed:
+            by_room.setdefault(room, []).append((cin, cout))
+        self._stays = {r: sorted(s) for r, s in by_room.items()}
+        self._starts = {
+            r: [cin for cin, _ in s] for r, s in self._stays.items()
+        }
+
+    def rooms(self) -> List[int]:
+        return sorted(self._stays)
+
+    def clear(self, room: int, cin: int, cout: int) -> bool:
+        """Is ``room`` free of fixed stays on the nights [cin, cout)?"""
+        stays = self._stays.get(room)
+        if not stays:
+            return True
+        # Fixed stays in a room do not overlap, so the last one starting
+        # before ``cout`` is also the one ending last.
+        i = bisect_left(self._starts[room], cout) - 1
+        return i < 0 or stays[i][1] <= cin
+
+
+def repack(
+    movable: Iterable[Stay], fixed: Iterable[Fixed], rooms_total: int
+) -> Optional[Dict[str, int]]:
+    """New room for each movable stay, or None if they do not all fit.
+
+    O(n log n) in the number of stays, plus the rooms a stay has to skip
+    because a fixed stay blocks them.
+    """
+    blocked = _Blocked(fixed)
+    # Rooms in use as (free from, room_no); rooms holding fixed stays
+    # are in use from the start. Other rooms open lowest number first.
+    ready = [
+        (0, room) for room in blocked.rooms() if 1 <= room <= rooms_total
+    ]
+    heapq.heapify(ready)
+    in_use = set(blocked.rooms())
+    unopened = (r for r in range(1, rooms_total + 1) if r not in in_use)
+    rooms: Dict[str, int] = {}
+    for rid, cin, cout in sorted(movable, key=lambda s: (s[1], s[2], s[0])):
+        skipped = []
+        chosen = None
+        while ready and ready[0][0] <= cin:
+            entry = heapq.heappop(ready)
+            if blocked.clear(entry[1], cin, cout):
+                chosen = entry[1]
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(ready, entry)
+        if chosen is None:
+            chosen = next(unopened, None)
+            if chosen is None:
+                return None
+        rooms[rid] = chosen
+        heapq.heappush(ready, (cout, chosen))
+    return rooms
@@ -0,0 +1,253 @@
+"""Tailable log of the changes a ReservationService makes.
+
+Each change is one JSON line::
+
+    {"seq": 7, "op": "created", "entity": "reservation", "id": "R1",
+     "data": {...}}
+
+``seq`` increases by one per event. ``op`` is one of ``created``,
+``updated``, ``cancelled`` or ``deleted``; ``data`` holds the new record
+for created/updated and is null otherwise. Consumers keep the last seq
+they processed and resume from it with ``follow``, so they only read
+the changes made since.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .exceptions import StorageError
+from .storage import StdlibCodec, get_codec
+
+OPS = ("created", "updated", "cancelled", "deleted")
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    seq: int
+    op: str
+    entity: str
+    key: str
+    data: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "op": self.op,
+            "entity": self.entity,
+            "id": self.key,
+            "data": self.data,
+        }
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "ChangeEvent":
+        return ChangeEvent(d["seq"], d["op"], d["entity"], d["id"],
+                           d.get("data"))
+
+
+# (op, entity, id, data) of an event that has no seq yet.
+Change = Tuple[str, str, str, Optional[Dict[str, Any]]]
+
+
+def _drop_torn_line(f: BinaryIO) -> int:
+    """Cut a partial last line, left by a crash mid-append, off ``f``.
+
+    An event written after it would merge into that line and be lost,
+    and its seq reused. Returns the file size afterwards.
+    """
+    end = f.seek(0, os.SEEK_END)
+    keep, pos = 0, end
+    while pos > 0:
+        step = min(4096, pos)
+        pos -= step
+        f.seek(pos)
+        nl = f.read(step).rfind(b"\n")
+        if nl >= 0:
+            keep = pos + nl + 1
+            break
+    if keep != end:
+        f.truncate(keep)
+    return keep
+
+
+class ChangeFeed:
+    """Append-only change log with resumable readers.
+
+    One process appends; any number of readers may ``follow`` the file,
+    also from other processes.
+    """
+
+    def __init__(
+        self, path: str, codec: Optional[StdlibCodec] = None
+    ) -> None:
+        self.path = path
+        self.codec = codec or get_codec()
+        self._lock = threading.Lock()
+        self._seq: Optional[int] = None
+        # File size after our last append; any other size means the
+        # file changed behind our back and the last seq is re-read.
+        self._size: Optional[int] = None
+
+    # -------- writing --------
+    def append(self, changes: List[Change]) -> List[ChangeEvent]:
+        """Number and persist ``changes`` in order; return the events."""
+        if not changes:
+            return []
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a+b") as f:
+                    size = f.seek(0, os.SEEK_END)
+                    if self._seq is None or size != self._size:
+                        _drop_torn_line(f)
+                        self._seq = self._last_seq()
+                    events = [
+                        ChangeEvent(self._seq + i, op, entity, key, data)
+                        for i, (op, entity, key, data) in enumerate(
+                            changes, start=1
+                        )
+                    ]
+                    f.write(b"".join(
+                        self.codec.dumps_line(e.to_dict()) for e in events
+                    ))
+                    self._size = f.tell()
+            except OSError as exc:
+                msg = "Failed writing {}: {}".format(self.path, exc)
+                raise StorageError(msg) from exc
+            self._seq = events[-1].seq
+            return events
+
+    def last_seq(self) -> int:
+        """Sequence number of the newest event (0 if there is none)."""
+        with self._lock:
+            return self._last_seq()
+
+    def _last_seq(self) -> int:
+        try:
+            with open(self.path, "rb") as f:
+                end = f.seek(0, os.SEEK_END)
+                # Walk back from the end to the last complete line.
+                pos, tail = end, b""
+                while pos > 0:
+                    step = min(4096, pos)
+                    pos -= step
+                    f.seek(pos)
+                    tail = f.read(step) + tail
+                    # The last piece follows the final newline; unless we
+                    # reached the start, the first one may be cut off.
+                    lines = tail.split(b"\n")[(1 if pos else 0):-1]
+                    complete = [ln for ln in lines if ln.strip()]
+                    if complete:
+                        return self._seq_of(complete[-1])
+        except FileNotFoundError:
+            return 0
+        except OSError as exc:
+            msg = "Failed reading {}: {}".format(self.path, exc)
+            raise StorageError(msg) from exc
+        return 0
+
+    def _seq_of(self, line: bytes) -> int:
+        try:
+            seq = self.codec.loads(line)["seq"]
+        except (ValueError, TypeError, KeyError) as exc:
+            msg = "Unreadable change feed line in {}: {!r}".format(
+                self.path, line[:80]
+            )
+            raise StorageError(msg) from exc
+        if not isinstance(seq, int):
+            msg = "Bad seq in change feed {}: {!r}".format(self.path, seq)
+            raise StorageError(msg)
+        return seq
+
+    # -------- reading --------
+    def follow(
+        self, after: int = 0, poll: Optional[float] = None
+    ) -> Iterator[ChangeEvent]:
+        """Yield the events with ``seq > after`` in order.
+
+        Without ``poll`` the generator stops at the end of the file.
+        With ``poll`` it keeps tailing the file, checking for new
+        events every ``poll`` seconds, until the consumer stops.
+        """
+        f = self._open(poll)
+        if f is None:
+            return
+        with f:
+            f.seek(self._start_offset(f, after))
+            while True:
+                start = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    # End of file, or a line still being written.
+                    if poll is None:
+                        return
+                    f.seek(start)
+                    time.sleep(poll)
+                    continue
+                if not line.strip():
+                    continue
+                try:
+                    event = ChangeEvent.from_dict(self.codec.loads(line))
+                except (ValueError, TypeError, KeyError) as exc:
+                    msg = "[ERROR] Skipping change feed line at byte {}: {}"
+                    msg = msg.format(start, exc)
+                    print(msg)
+                    continue
+                if event.seq > after:
+                    yield event
+
+    def _open(self, poll: Optional[float]) -> Optional[BinaryIO]:
+        while True:
+            try:
+                return open(self.path, "rb")
+            except FileNotFoundError:
+                if poll is None:
+                    return None
+                time.sleep(poll)
+            except OSError as exc:
+                msg = "Failed reading {}: {}".format(self.path, exc)
+                raise StorageError(msg) from exc
+
+    def _start_offset(self, f: BinaryIO, after: int) -> int:
+        """Offset of the first line with ``seq > after``.
+
+        Seqs grow with the offset, so this is a binary search over
+        byte positions: O(log size) reads instead of a full scan.
+        """
+        if after <= 0:
+            return 0
+        size = f.seek(0, os.SEEK_END)
+        lo, hi = 0, size
+        try:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                _, seq = self._line_from(f, mid)
+                if seq is None or seq > after:
+                    hi = mid
+                else:
+                    lo = mid + 1
+        except StorageError:
+            # A damaged line breaks the search; read from the start and
+            # let follow() skip what it cannot parse.
+            return 0
+        return self._line_from(f, lo)[0]
+
+    def _line_from(self, f: BinaryIO, pos: int) -> Tuple[int, Optional[int]]:
+        """(offset, seq) of the first complete line starting at or after
+        ``pos``; seq is None when there is no such line."""
+        if pos > 0:
+            f.seek(pos - 1)
+            f.readline()
+        else:
+            f.seek(0)
+        while True:
+            start = f.tell()
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                return start, None
+            if line.strip():
+                return start, self._seq_of(line)
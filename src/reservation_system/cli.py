@@ -3,16 +3,37 @@
 Usage:
   python -m reservation_system.cli seed
   python -m reservation_system.cli demo
+  python -m reservation_system.cli profile [options]
+  python -m reservation_system.cli check [options]
+  python -m reservation_system.cli loadtest [options]
+  python -m reservation_system.cli archive --before YYYY-MM-DD [options]
+  python -m reservation_system.cli repack HOTEL_ID --from YYYY-MM-DD
+  python -m reservation_system.cli changes FEED [--after SEQ] [--follow]
+
+Run ``<command> --help`` for the options of each command.
 """
 
 from __future__ import annotations
 
+import argparse
+import json
 import sys
 
+from . import loadtest as _loadtest
+from .changefeed import ChangeFeed
 from .customer import Customer
+from .exceptions import NotFoundError, ValidationError
 from .hotel import Hotel
+from .integrity import check_store
+from .profiling import DEFAULT_MIX, run_profile
 from .service import ReservationService
-from .storage import JsonStore, StorePaths
+from .storage import (
+    ARCHIVE_PARTITIONS,
+    LAYOUTS,
+    JsonStore,
+    StorePaths,
+    paths_in,
+)
 
 
 def _service() -> ReservationService:
@@ -49,7 +70,264 @@ def demo() -> None:
     print("Cancelled reservation RDEMO1")
 
 
+def profile(args: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="reservation_system.cli profile",
+        description="Profile a service workload and write a report.",
+    )
+    parser.add_argument(
+        "--data",
+        help="directory whose data files are copied and replayed "
+        "(default: generate a synthetic dataset)",
+    )
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default="array"
+    )
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help="weights for reserve, auto, cancel, update, delete "
+        "(default: %(default)s)",
+    )
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--hotels", type=int, default=20)
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--reservations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-alloc",
+        action="store_true",
+        help="skip tracemalloc (faster, timings closer to production)",
+    )
+    parser.add_argument("--report", default="profile_report.txt")
+    opts = parser.parse_args(args)
+
+    try:
+        run_profile(
+            opts.report,
+            data_dir=opts.data,
+            layout=opts.layout,
+            ops=opts.ops,
+            mix=opts.mix,
+            top=opts.top,
+            hotels=opts.hotels,
+            customers=opts.customers,
+            reservations=opts.reservations,
+            seed=opts.seed,
+            trace_allocs=not opts.no_alloc,
+        )
+    except ValueError as exc:
+        print("[ERROR] {}".format(exc))
+        return 2
+    print("Profile report written to {}".format(opts.report))
+    return 0
+
+
+def check(args: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="reservation_system.cli check",
+        description="Check the data files for integrity problems.",
+    )
+    parser.add_argument("--data", default="data")
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default="array"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="process pool size (default: CPU count; 1 = no pool)",
+    )
+    parser.add_argument(
+        "--plan", help="write a JSON repair plan to this file"
+    )
+    opts = parser.parse_args(args)
+
+    store = JsonStore(paths_in(opts.data, opts.layout), layout=opts.layout)
+    report = check_store(store, workers=opts.workers)
+    print("Checked {} reservations.".format(report.checked))
+    for kind, count in sorted(report.counts().items()):
+        print("  {}: {}".format(kind, count))
+    for issue in report.issues[:20]:
+        print("[ERROR] {} {}: {}".format(issue.kind, issue.resv_id,
+                                         issue.detail))
+    if len(report.issues) > 20:
+        print("... {} more".format(len(report.issues) - 20))
+    if opts.plan:
+        with open(opts.plan, "w", encoding="utf-8") as f:
+            json.dump(report.repair_plan(), f, ensure_ascii=False, indent=2)
+        print("Repair plan written to {}".format(opts.plan))
+    return 0 if report.ok else 1
+
+
+def loadtest(args: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="reservation_system.cli loadtest",
+        description="Run concurrent clients against a scratch dataset.",
+    )
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="seconds"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="seconds per timeline row (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--mix",
+        default=_loadtest.DEFAULT_MIX,
+        help="weights for reserve, auto, cancel, get, update "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default="lines"
+    )
+    parser.add_argument("--hotels", type=int, default=20)
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--reservations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", help="also write the report here")
+    opts = parser.parse_args(args)
+
+    try:
+        result = _loadtest.run_loadtest(
+            clients=opts.clients,
+            duration=opts.duration,
+            mix=opts.mix,
+            layout=opts.layout,
+            interval=opts.interval,
+            hotels=opts.hotels,
+            customers=opts.customers,
+            reservations=opts.reservations,
+            seed=opts.seed,
+        )
+    except ValueError as exc:
+        print("[ERROR] {}".format(exc))
+        return 2
+    text = result.format()
+    print(text)
+    if opts.report:
+        with open(opts.report, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0
+
+
+def archive(args: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="reservation_system.cli archive",
+        description="Move past stays into the cold archive.",
+    )
+    parser.add_argument(
+        "--before",
+        required=True,
+        help="archive stays checking out before this date",
+    )
+    parser.add_argument("--data", default="data")
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default="array"
+    )
+    parser.add_argument(
+        "--by", choices=sorted(ARCHIVE_PARTITIONS), default="month",
+        help="one archive file per check-out month or year",
+    )
+    opts = parser.parse_args(args)
+
+    paths = paths_in(opts.data, opts.layout)
+    store = JsonStore(paths, layout=opts.layout, archive_by=opts.by)
+    try:
+        moved = ReservationService(store=store).archive(opts.before)
+    except ValidationError as exc:
+        print("[ERROR] {}".format(exc))
+        return 2
+    print("Archived {} reservations to {}.".format(moved, paths.archive))
+    return 0
+
+
+def repack(args: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="reservation_system.cli repack",
+        description="Reassign rooms of future bookings to free up rooms.",
+    )
+    parser.add_argument("hotel_id")
+    parser.add_argument(
+        "--from",
+        dest="from_date",
+        required=True,
+        help="repack stays checking in on or after this date",
+    )
+    parser.add_argument("--data", default="data")
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default="array"
+    )
+    opts = parser.parse_args(args)
+
+    store = JsonStore(paths_in(opts.data, opts.layout), layout=opts.layout)
+    try:
+        report = ReservationService(store=store).optimize_assignments(
+            opts.hotel_id, opts.from_date
+        )
+    except (NotFoundError, ValidationError) as exc:
+        print("[ERROR] {}".format(exc))
+        return 2
+    print(
+        "Moved {} of {} movable reservations; rooms in use {} -> {} "
+        "({} freed).".format(
+            report.moved,
+            report.movable,
+            report.rooms_before,
+            report.rooms_after,
+            report.rooms_freed,
+        )
+    )
+    return 0
+
+
+def changes(args: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="reservation_system.cli changes",
+        description="Print change feed events as JSON lines.",
+    )
+    parser.add_argument("feed", help="change feed file")
+    parser.add_argument(
+        "--after",
+        type=int,
+        default=0,
+        help="only events with a greater seq (default: all)",
+    )
+    parser.add_argument(
+        "--follow",
+        type=float,
+        nargs="?",
+        const=1.0,
+        metavar="SECONDS",
+        help="keep waiting for new events, polling every SECONDS",
+    )
+    opts = parser.parse_args(args)
+
+    try:
+        for event in ChangeFeed(opts.feed).follow(opts.after, opts.follow):
+            print(json.dumps(event.to_dict(), ensure_ascii=False),
+                  flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+_COMMANDS = {
+    "profile": profile,
+    "check": check,
+    "loadtest": loadtest,
+    "archive": archive,
+    "repack": repack,
+    "changes": changes,
+}
+
+
 def main(argv: list[str]) -> int:
+    if len(argv) >= 2 and argv[1].strip().lower() in _COMMANDS:
+        return _COMMANDS[argv[1].strip().lower()](argv[2:])
     if len(argv) != 2:
         print(__doc__)
         return 2
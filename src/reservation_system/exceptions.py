@@ -15,3 +15,7 @@ class ConflictError(RuntimeError):
 
 class StorageError(RuntimeError):
     """Raised when persistence layer fails unexpectedly."""
+
+
+class OverloadError(RuntimeError):
+    """Raised when a request is shed because the service is overloaded."""
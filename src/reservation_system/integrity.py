@@ -0,0 +1,223 @@
+"""Store-wide integrity checks.
+
+Detects reservations whose hotel or customer no longer exists, rooms
+outside ``1..rooms_total``, invalid date ranges and double-booked
+rooms. Foreign keys are checked against hash sets; double bookings are
+found by sorting each hotel's reservations by (room_no, check_in) and
+sweeping once, so the whole check is O(n log n). Dates are compared as
+day ordinals from the memoized ``iso_ordinal``, so every ISO form of a
+date (``2026-07-01`` or ``20260701``) orders correctly. Hotels are
+spread over a process pool for large stores.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .storage import JsonStore
+from .validators import iso_ordinal
+
+# Reservations per process below which the pool is not worth starting.
+_MIN_PARALLEL = 50_000
+
+# Actions proposed for each issue kind in the repair plan.
+_REPAIRS = {
+    "invalid_record": "delete",
+    "orphan_hotel": "delete",
+    "orphan_customer": "delete",
+    "invalid_dates": "delete",
+    "room_out_of_range": "reassign",
+    "room_missing": "reassign",
+    "double_booked": "reassign",
+}
+
+# (resv_id, room_no, check_in, check_out): the fields a sweep needs.
+_Stay = Tuple[str, Optional[int], str, str]
+# (room_no, check_in, check_out as day ordinals, resv_id, stay): sorts
+# by room, then dates; resv_ids are unique, so stays never compare.
+_Placed = Tuple[int, int, int, str, _Stay]
+
+
+@dataclass(frozen=True, slots=True)
+class Issue:
+    kind: str
+    resv_id: str
+    detail: str
+    other: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CheckReport:
+    checked: int = 0
+    issues: List[Issue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def counts(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for issue in self.issues:
+            out[issue.kind] = out.get(issue.kind, 0) + 1
+        return out
+
+    def repair_plan(self) -> List[Dict[str, Optional[str]]]:
+        """One action per affected reservation, deletes taking priority.
+
+        ``reassign`` means the booking is valid but must move to another
+        free room (or be cancelled if none is left).
+        """
+        plan: Dict[str, Dict[str, Optional[str]]] = {}
+        for issue in self.issues:
+            action = _REPAIRS[issue.kind]
+            current = plan.get(issue.resv_id)
+            if current is None or (
+                action == "delete" and current["action"] != "delete"
+            ):
+                plan[issue.resv_id] = {
+                    "action": action,
+                    "resv_id": issue.resv_id,
+                    "reason": issue.kind,
+                    "detail": issue.detail,
+                }
+        return list(plan.values())
+
+
+def _day_range(check_in: str, check_out: str) -> Optional[Tuple[int, int]]:
+    """Day ordinals of a valid stay, or None."""
+    try:
+        first, end = iso_ordinal(check_in), iso_ordinal(check_out)
+    except ValueError:
+        return None
+    return (first, end) if first < end else None
+
+
+def _check_hotel(
+    hotel_id: str, rooms_total: int, stays: List[_Stay]
+) -> List[Issue]:
+    """Range and overlap checks for one hotel's reservations."""
+    issues: List[Issue] = []
+    placed: List[_Placed] = []
+    for stay in stays:
+        rid, room_no, cin, cout = stay
+        days = _day_range(cin, cout)
+        if days is None:
+            issues.append(Issue("invalid_dates", rid,
+                                "{} -> {}".format(cin, cout)))
+        elif room_no is None:
+            issues.append(Issue("room_missing", rid,
+                                "no room assigned in " + hotel_id))
+        elif not 1 <= room_no <= rooms_total:
+            issues.append(Issue(
+                "room_out_of_range", rid,
+                "room {} of {} in {}".format(room_no, rooms_total, hotel_id),
+            ))
+        else:
+            placed.append((room_no, days[0], days[1], rid, stay))
+
+    placed.sort()
+    holder: Optional[_Placed] = None
+    for cur in placed:
+        if holder is None or cur[0] != holder[0]:
+            holder = cur
+            continue
+        if cur[1] < holder[2]:
+            stay, held = cur[4], holder[4]
+            issues.append(Issue(
+                "double_booked", cur[3],
+                "room {} of {}: {} -> {} overlaps {} -> {}".format(
+                    cur[0], hotel_id, stay[2], stay[3], held[2], held[3]
+                ),
+                other=holder[3],
+            ))
+        # Keep the stay that blocks the room longest as the holder.
+        if cur[2] > holder[2]:
+            holder = cur
+    return issues
+
+
+def _check_batch(
+    batch: Sequence[Tuple[str, int, List[_Stay]]]
+) -> List[Issue]:
+    issues: List[Issue] = []
+    for hotel_id, rooms_total, stays in batch:
+        issues.extend(_check_hotel(hotel_id, rooms_total, stays))
+    return issues
+
+
+def _batches(
+    groups: List[Tuple[str, int, List[_Stay]]], n: int
+) -> List[List[Tuple[str, int, List[_Stay]]]]:
+    """Split hotel groups into ``n`` batches of similar total size."""
+    out: List[List[Tuple[str, int, List[_Stay]]]] = [[] for _ in range(n)]
+    sizes = [0] * n
+    for group in sorted(groups, key=lambda g: len(g[2]), reverse=True):
+        i = sizes.index(min(sizes))
+        out[i].append(group)
+        sizes[i] += len(group[2])
+    return [b for b in out if b]
+
+
+def check_store(
+    store: JsonStore, workers: Optional[int] = None
+) -> CheckReport:
+    """Run every integrity check over ``store``.
+
+    ``workers`` caps the process pool (default: CPU count); 1 forces an
+    in-process run. Small stores are always checked in-process.
+    """
+    rooms: Dict[str, int] = {}
+    for h in store.load_hotels():
+        hotel_id, total = h.get("hotel_id"), h.get("rooms_total")
+        if isinstance(hotel_id, str):
+            rooms[hotel_id] = total if isinstance(total, int) else 0
+    customers: Set[str] = {
+        c["customer_id"]
+        for c in store.load_customers()
+        if isinstance(c.get("customer_id"), str)
+    }
+
+    report = CheckReport()
+    by_hotel: Dict[str, List[_Stay]] = {}
+    # Raw dicts rather than rows: this pass touches every record once,
+    # so building (and interning) rows would only add overhead.
+    for r in store.iter_reservations():
+        report.checked += 1
+        rid, hotel_id = r.get("resv_id"), r.get("hotel_id")
+        cin, cout = r.get("check_in"), r.get("check_out")
+        room_no = r.get("room_no")
+        if not (
+            isinstance(rid, str)
+            and isinstance(cin, str)
+            and isinstance(cout, str)
+            and (room_no is None or isinstance(room_no, int))
+        ):
+            report.issues.append(
+                Issue("invalid_record", str(rid), "record {}".format(r))
+            )
+            continue
+        if hotel_id not in rooms:
+            report.issues.append(
+                Issue("orphan_hotel", rid, "hotel {}".format(hotel_id))
+            )
+            continue
+        if r.get("customer_id") not in customers:
+            report.issues.append(Issue(
+                "orphan_customer", rid,
+                "customer {}".format(r.get("customer_id")),
+            ))
+        by_hotel.setdefault(hotel_id, []).append((rid, room_no, cin, cout))
+
+    groups = [(hid, rooms[hid], stays) for hid, stays in by_hotel.items()]
+    n = workers or os.cpu_count() or 1
+    n = max(1, min(n, len(groups), report.checked // _MIN_PARALLEL))
+    if n == 1:
+        report.issues.extend(_check_batch(groups))
+        return report
+    with ProcessPoolExecutor(max_workers=n) as pool:
+        for issues in pool.map(_check_batch, _batches(groups, n)):
+            report.issues.extend(issues)
+    return report
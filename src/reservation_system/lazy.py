@@ -0,0 +1,101 @@
+"""Read-only mappings that build entities only when they are accessed.
+
+A ``LazyRecords`` view stands for a whole store collection without
+loading it. Listing ids reads the store's offset or block index (the
+"lines" and "blocks" layouts decode nothing for it), and an entity is
+decoded, validated and built only when its key is looked up. Built
+entities are cached with the store stamp they were read under, so later
+lookups of the same key cost a stamp check until the collection
+changes. Work and memory thus follow the records a caller touches, not
+the size of the collection.
+"""
+
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .exceptions import ValidationError
+
+T = TypeVar("T")
+
+
+class LazyRecords(Mapping[str, T], Generic[T]):
+    """Collection view: id -> entity, built and cached on first access.
+
+    ``ids`` lists the live ids, ``fetch`` returns one raw record (None
+    if missing), ``build`` turns a record into an entity and ``stamp``
+    returns a token that changes whenever the collection does. The view
+    always reflects the current store; it is not a snapshot. Records
+    that fail validation are reported as missing.
+    """
+
+    def __init__(
+        self,
+        ids: Callable[[], List[str]],
+        fetch: Callable[[str], Optional[Dict[str, Any]]],
+        build: Callable[[Dict[str, Any]], T],
+        stamp: Callable[[], object],
+    ) -> None:
+        self._ids = ids
+        self._fetch = fetch
+        self._build = build
+        self._stamp = stamp
+        # key -> (stamp read under, entity). Entries from an older stamp
+        # are never served; the dict is replaced once the stamp moves.
+        self._cache: Dict[str, Tuple[object, T]] = {}
+        self._cache_stamp: object = None
+
+    def __getitem__(self, key: str) -> T:
+        stamp = self._stamp()
+        if stamp != self._cache_stamp:
+            self._cache, self._cache_stamp = {}, stamp
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        raw = self._fetch(key) if isinstance(key, str) else None
+        if raw is None:
+            raise KeyError(key)
+        try:
+            entity = self._build(raw)
+        except (KeyError, TypeError, ValidationError) as exc:
+            msg = "[ERROR] Skip invalid record {!r}: {}".format(key, exc)
+            print(msg)
+            raise KeyError(key) from exc
+        self._cache[key] = (stamp, entity)
+        return entity
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids())
+
+    def __len__(self) -> int:
+        return len(self._ids())
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def discard(self, key: str) -> None:
+        """Forget a cached entity, for writers that just changed it.
+
+        Stamps are file sizes and mtimes, which a same-size rewrite
+        within the clock's resolution may leave unchanged.
+        """
+        self._cache.pop(key, None)
+
+    def cached(self) -> int:
+        """Number of entities built and held for the current stamp."""
+        return len(self._cache)
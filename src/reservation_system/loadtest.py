@@ -0,0 +1,261 @@
+"""Closed-loop load generator for ReservationService.
+
+``clients`` threads share one thread-safe service over a generated
+dataset in a scratch directory. Each client issues its next request as
+soon as the previous one returns, so throughput is whatever the service
+sustains at that concurrency. The report gives throughput, latency
+percentiles per operation and, per time interval, throughput, p99
+latency and the share of requests rejected with ConflictError. Any
+other failure is counted as an "error" outcome and the client goes on.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from .exceptions import ConflictError, NotFoundError, ValidationError
+from .profiling import generate_dataset, parse_mix, percentile, random_stay
+from .service import ReservationService
+from .storage import JsonStore, paths_in
+
+DEFAULT_MIX = "reserve=3,auto=3,cancel=2,get=4,update=1"
+
+# (seconds since start at completion, op name, latency, outcome)
+_Sample = Tuple[float, str, float, str]
+
+
+@dataclass
+class _Shared:
+    """State the client threads share; ``live`` is guarded by ``lock``."""
+
+    svc: ReservationService
+    hotels: List[Tuple[str, int]]
+    customers: List[str]
+    live: List[str]
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    ids: "itertools.count[int]" = field(default_factory=itertools.count)
+
+    def next_id(self) -> str:
+        # next() on a count is atomic under the GIL.
+        return "RL{:08d}".format(next(self.ids))
+
+
+def _op_reserve(s: _Shared, rng: random.Random, auto: bool) -> None:
+    hotel_id, rooms = rng.choice(s.hotels)
+    cin, cout = random_stay(rng)
+    r = s.svc.reserve_room(
+        s.next_id(),
+        hotel_id,
+        rng.choice(s.customers),
+        cin,
+        cout,
+        room_no=None if auto else rng.randint(1, rooms),
+    )
+    with s.lock:
+        s.live.append(r.resv_id)
+
+
+def _op_cancel(s: _Shared, rng: random.Random) -> None:
+    with s.lock:
+        if not s.live:
+            raise NotFoundError("No reservation to cancel.")
+        i = rng.randrange(len(s.live))
+        s.live[i], s.live[-1] = s.live[-1], s.live[i]
+        resv_id = s.live.pop()
+    s.svc.cancel_reservation(resv_id)
+
+
+def _op_get(s: _Shared, rng: random.Random) -> None:
+    s.svc.get_hotel(rng.choice(s.hotels)[0])
+
+
+def _op_update(s: _Shared, rng: random.Random) -> None:
+    s.svc.update_customer(
+        rng.choice(s.customers), name_full="Guest {}".format(rng.random())
+    )
+
+
+_OPS: Dict[str, Callable[[_Shared, random.Random], None]] = {
+    "reserve": lambda s, rng: _op_reserve(s, rng, auto=False),
+    "auto": lambda s, rng: _op_reserve(s, rng, auto=True),
+    "cancel": _op_cancel,
+    "get": _op_get,
+    "update": _op_update,
+}
+
+
+def _client(
+    s: _Shared,
+    rng: random.Random,
+    mix: Dict[str, int],
+    start: float,
+    deadline: float,
+    samples: List[_Sample],
+) -> None:
+    names = [n for n in mix if mix[n]]
+    weights = [mix[n] for n in names]
+    while True:
+        name = rng.choices(names, weights)[0]
+        t0 = time.perf_counter()
+        if t0 >= deadline:
+            return
+        try:
+            _OPS[name](s, rng)
+            outcome = "ok"
+        except ConflictError:
+            outcome = "conflict"
+        except (NotFoundError, ValidationError) as exc:
+            outcome = type(exc).__name__
+        except Exception:
+            # E.g. StorageError: keep the client and its samples alive.
+            outcome = "error"
+        t1 = time.perf_counter()
+        # list.append is atomic, so clients share one list.
+        samples.append((t1 - start, name, t1 - t0, outcome))
+
+
+@dataclass
+class LoadResult:
+    clients: int
+    elapsed: float
+    interval: float
+    samples: List[_Sample]
+
+    @property
+    def throughput(self) -> float:
+        return len(self.samples) / self.elapsed if self.elapsed else 0.0
+
+    def conflict_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        conflicts = sum(1 for s in self.samples if s[3] == "conflict")
+        return conflicts / len(self.samples)
+
+    def by_op(self) -> Dict[str, List[_Sample]]:
+        out: Dict[str, List[_Sample]] = {}
+        for sample in self.samples:
+            out.setdefault(sample[1], []).append(sample)
+        return out
+
+    def timeline(self) -> List[Tuple[float, int, float, float]]:
+        """(interval start, requests, conflict rate, p99 latency) rows."""
+        buckets: Dict[int, List[_Sample]] = {}
+        for sample in self.samples:
+            buckets.setdefault(int(sample[0] // self.interval), []).append(
+                sample
+            )
+        rows = []
+        for i in sorted(buckets):
+            group = buckets[i]
+            lat = sorted(s[2] for s in group)
+            conflicts = sum(1 for s in group if s[3] == "conflict")
+            rows.append((i * self.interval, len(group),
+                         conflicts / len(group), percentile(lat, 0.99)))
+        return rows
+
+    def format(self) -> str:
+        lines = [
+            "clients: {}  requests: {}  elapsed: {:.2f}s".format(
+                self.clients, len(self.samples), self.elapsed),
+            "throughput: {:.1f} req/s  conflict rate: {:.1%}".format(
+                self.throughput, self.conflict_rate()),
+            "",
+            "{:<10}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}  outcomes".format(
+                "op", "count", "p50 ms", "p95 ms", "p99 ms", "max ms",
+                "conflict"),
+        ]
+        groups = self.by_op()
+        groups["all"] = self.samples
+        for name in sorted(groups, key=lambda n: (n == "all", n)):
+            group = groups[name]
+            if not group:
+                continue
+            lat = sorted(s[2] for s in group)
+            outcomes: Dict[str, int] = {}
+            for s in group:
+                outcomes[s[3]] = outcomes.get(s[3], 0) + 1
+            lines.append(
+                "{:<10}{:>8}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.1%}"
+                "  {}".format(
+                    name,
+                    len(group),
+                    1000 * percentile(lat, 0.50),
+                    1000 * percentile(lat, 0.95),
+                    1000 * percentile(lat, 0.99),
+                    1000 * lat[-1],
+                    outcomes.get("conflict", 0) / len(group),
+                    ", ".join("{}={}".format(k, v)
+                              for k, v in sorted(outcomes.items())),
+                )
+            )
+        lines += [
+            "",
+            "{:>8}{:>10}{:>10}{:>10}".format(
+                "t s", "req/s", "conflict", "p99 ms"),
+        ]
+        for t, count, rate, p99 in self.timeline():
+            width = min(self.interval, self.elapsed - t)
+            lines.append("{:>8.1f}{:>10.1f}{:>10.1%}{:>10.3f}".format(
+                t, count / width, rate, 1000 * p99))
+        return "\n".join(lines)
+
+
+def run_loadtest(
+    clients: int = 8,
+    duration: float = 10.0,
+    mix: str = DEFAULT_MIX,
+    layout: str = "lines",
+    interval: float = 1.0,
+    hotels: int = 20,
+    customers: int = 500,
+    reservations: int = 2000,
+    seed: int = 0,
+) -> LoadResult:
+    """Drive ``clients`` concurrent clients for ``duration`` seconds.
+
+    The service runs in thread-safe mode over a generated dataset in a
+    temporary directory that is removed afterwards.
+    """
+    if clients < 1:
+        raise ValueError("clients must be >= 1.")
+    if duration <= 0 or interval <= 0:
+        raise ValueError("duration and interval must be > 0.")
+    weights = parse_mix(mix, _OPS)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JsonStore(paths_in(tmp, layout), layout=layout)
+        generate_dataset(store, hotels, customers, reservations, seed)
+        shared = _Shared(
+            svc=ReservationService(store=store, thread_safe=True),
+            hotels=[(h["hotel_id"], h["rooms_total"])
+                    for h in store.load_hotels()],
+            customers=[c["customer_id"] for c in store.load_customers()],
+            live=[r["resv_id"] for r in store.load_reservations()],
+        )
+        if not shared.hotels or not shared.customers:
+            raise ValueError("Dataset needs at least one hotel and customer.")
+        # Build the occupancy index before the clock starts.
+        shared.svc.in_house(shared.hotels[0][0], "2026-01-01")
+
+        samples: List[_Sample] = []
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(
+                target=_client,
+                args=(shared, random.Random(seed * 1_000 + i), weights,
+                      start, start + duration, samples),
+                daemon=True,
+            )
+            for i in range(clients)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    return LoadResult(clients, elapsed, interval, samples)
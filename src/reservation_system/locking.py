@@ -0,0 +1,94 @@
+"""Locks used by ReservationService in thread-safe mode.
+
+Lock order, outermost first: hotel catalog, customer catalog, per-hotel
+locks (in hotel_id order), commit lock. Every code path acquires locks
+in that order, so they cannot deadlock.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator
+
+
+class RWLock:
+    """Readers-writer lock that lets waiting writers go first.
+
+    Not reentrant: a thread must not take it again while holding it.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class ServiceLocks:
+    """Catalog locks, one lock per hotel and the commit lock."""
+
+    def __init__(self) -> None:
+        self.hotels = RWLock()
+        self.customers = RWLock()
+        # Serializes reservation writes with the matching index update.
+        self.commit: ContextManager[object] = threading.RLock()
+        self._per_hotel: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def hotel(self, hotel_id: str) -> ContextManager[object]:
+        lock = self._per_hotel.get(hotel_id)
+        if lock is None:
+            with self._guard:
+                lock = self._per_hotel.setdefault(hotel_id, threading.Lock())
+        return lock
+
+
+class _NoRWLock:
+    def read(self) -> ContextManager[None]:
+        return nullcontext()
+
+    def write(self) -> ContextManager[None]:
+        return nullcontext()
+
+
+class NoLocks:
+    """Drop-in for ServiceLocks when the service runs single-threaded."""
+
+    hotels = _NoRWLock()
+    customers = _NoRWLock()
+    commit: ContextManager[object] = nullcontext()
+
+    def hotel(self, _hotel_id: str) -> ContextManager[object]:
+        return nullcontext()
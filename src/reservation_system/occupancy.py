@@ -0,0 +1,237 @@
+"""In-memory per-hotel occupancy index over reservation rows.
+
+Each hotel keeps its stays sorted by check-in and by check-out, so date
+window questions are answered with ``bisect`` in O(log n + k) instead of
+a scan over every reservation. A per-night count of booked rooms
+answers "how full is the hotel" in O(nights), which rejects sold-out
+requests without looking at any room. The counters include every stay;
+while a hotel has stays without a room, or in rooms outside its
+current range (it shrank), its counts are rebuilt from those stays
+that hold a valid room instead. The index is maintained
+incrementally by ``add``/``discard`` as the service changes
+reservations.
+
+All keys and comparisons use the day ordinals the rows carry; query
+dates are converted once per call with the memoized ``iso_ordinal``.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .rows import ReservationRow
+from .validators import iso_ordinal
+
+# (day ordinal, resv_id) pairs; resv_id breaks ties so keys are unique.
+_Key = Tuple[int, str]
+
+
+def _nights(row: ReservationRow) -> range:
+    """Date ordinals of the nights a row occupies."""
+    return range(row.check_in_ord, row.check_out_ord)
+
+
+def _between(keys: List[_Key], start: int, end: int) -> List[str]:
+    """Return resv_ids whose day ordinal is in [start, end)."""
+    lo = bisect_left(keys, (start,))
+    hi = bisect_left(keys, (end,), lo)
+    return [rid for _, rid in keys[lo:hi]]
+
+
+@dataclass(slots=True)
+class _HotelStays:
+    by_in: List[_Key] = field(default_factory=list)
+    by_out: List[_Key] = field(default_factory=list)
+    # Longest indexed stay; bounds how far back an in-house query has
+    # to look. ``lengths`` counts stays per length so it can shrink
+    # when the longest one goes.
+    max_nights: int = 1
+    lengths: Dict[int, int] = field(default_factory=dict)
+    # Booked rooms per night, keyed by date ordinal; nights with no
+    # booking are absent.
+    booked: Dict[int, int] = field(default_factory=dict)
+    # room_no of every stay with a room, sorted, and the number of
+    # stays without one: tell whether the counters are exact.
+    rooms: List[int] = field(default_factory=list)
+    unplaced: int = 0
+
+    def exact(self, rooms_total: int) -> bool:
+        """Do the counters count only rooms in 1..rooms_total?"""
+        rooms = self.rooms
+        return not self.unplaced and (
+            not rooms or (rooms[0] >= 1 and rooms[-1] <= rooms_total)
+        )
+
+
+class OccupancyIndex:
+    """Reservation rows grouped per hotel with sorted date keys."""
+
+    def __init__(self, rows: Iterable[ReservationRow] = ()) -> None:
+        self._rows: Dict[str, ReservationRow] = {}
+        self._hotels: Dict[str, _HotelStays] = {}
+        # Opaque token describing the store state this index reflects.
+        self.stamp: object = None
+        # Rows with malformed dates were already skipped at load.
+        for row in rows:
+            self.add(row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, resv_id: str) -> Optional[ReservationRow]:
+        return self._rows.get(resv_id)
+
+    def rows_for_hotel(self, hotel_id: str) -> List[ReservationRow]:
+        h = self._hotels.get(hotel_id)
+        if h is None:
+            return []
+        return [self._rows[rid] for _, rid in h.by_in]
+
+    def for_customer(self, customer_id: str) -> List[str]:
+        """resv_ids of a customer's stays; a scan over the rows."""
+        return [
+            rid for rid, row in self._rows.items()
+            if row.customer_id == customer_id
+        ]
+
+    # -------- maintenance --------
+    def add(self, row: ReservationRow) -> None:
+        """Index a row built by ``ReservationRow.from_dict``."""
+        nights = _nights(row)
+        if row.resv_id in self._rows:
+            self.discard(row.resv_id)
+        h = self._hotels.get(row.hotel_id)
+        if h is None:
+            h = self._hotels[row.hotel_id] = _HotelStays()
+        n = len(nights)
+        h.lengths[n] = h.lengths.get(n, 0) + 1
+        h.max_nights = max(h.max_nights, n)
+        booked = h.booked
+        for night in nights:
+            booked[night] = booked.get(night, 0) + 1
+        insort(h.by_in, (row.check_in_ord, row.resv_id))
+        insort(h.by_out, (row.check_out_ord, row.resv_id))
+        if row.room_no is None:
+            h.unplaced += 1
+        else:
+            insort(h.rooms, row.room_no)
+        self._rows[row.resv_id] = row
+
+    def discard(self, resv_id: str) -> Optional[ReservationRow]:
+        row = self._rows.pop(resv_id, None)
+        if row is None:
+            return None
+        h = self._hotels[row.hotel_id]
+        del h.by_in[bisect_left(h.by_in, (row.check_in_ord, resv_id))]
+        del h.by_out[bisect_left(h.by_out, (row.check_out_ord, resv_id))]
+        if row.room_no is None:
+            h.unplaced -= 1
+        else:
+            del h.rooms[bisect_left(h.rooms, row.room_no)]
+        booked = h.booked
+        nights = _nights(row)
+        for night in nights:
+            left = booked[night] - 1
+            if left:
+                booked[night] = left
+            else:
+                del booked[night]
+        if not h.by_in:
+            del self._hotels[row.hotel_id]
+            return row
+        n = len(nights)
+        left = h.lengths[n] - 1
+        if left:
+            h.lengths[n] = left
+        else:
+            del h.lengths[n]
+            if n == h.max_nights:
+                # Distinct stay lengths are few, so this is cheap.
+                h.max_nights = max(1, max(h.lengths))
+        return row
+
+    # -------- queries --------
+    def arrivals(self, hotel_id: str, start: str, end: str) -> List[str]:
+        """resv_ids checking in on a day in [start, end)."""
+        h = self._hotels.get(hotel_id)
+        if h is None:
+            return []
+        return _between(h.by_in, iso_ordinal(start), iso_ordinal(end))
+
+    def departures(self, hotel_id: str, start: str, end: str) -> List[str]:
+        """resv_ids checking out on a day in [start, end)."""
+        h = self._hotels.get(hotel_id)
+        if h is None:
+            return []
+        return _between(h.by_out, iso_ordinal(start), iso_ordinal(end))
+
+    def in_house(self, hotel_id: str, day: str) -> List[str]:
+        """resv_ids staying the night of ``day`` (check_in <= day < out)."""
+        d = iso_ordinal(day)
+        return self._overlapping(hotel_id, d, d + 1)
+
+    def overlapping(
+        self, hotel_id: str, check_in: str, check_out: str
+    ) -> List[str]:
+        """resv_ids of stays sharing a night with [check_in, check_out)."""
+        return self._overlapping(
+            hotel_id, iso_ordinal(check_in), iso_ordinal(check_out)
+        )
+
+    def _overlapping(self, hotel_id: str, first: int, end: int) -> List[str]:
+        """Only stays that started within the hotel's longest stay length
+        before ``first`` can reach into the range, so the scan is limited
+        to that window of the check-in keys."""
+        h = self._hotels.get(hotel_id)
+        if h is None:
+            return []
+        rows = self._rows
+        return [
+            rid
+            for rid in _between(h.by_in, first - h.max_nights + 1, end)
+            if rows[rid].check_out_ord > first
+        ]
+
+    def busy_rooms(
+        self, hotel_id: str, check_in: str, check_out: str
+    ) -> Set[Optional[int]]:
+        """Rooms taken on at least one night of [check_in, check_out)."""
+        rows = self._rows
+        return {
+            rows[rid].room_no
+            for rid in self.overlapping(hotel_id, check_in, check_out)
+        }
+
+    def booked(
+        self, hotel_id: str, check_in: str, check_out: str, rooms_total: int
+    ) -> int:
+        """Most rooms of 1..rooms_total booked on any night of
+        [check_in, check_out).
+
+        O(nights) from the per-night counters while they are exact for
+        ``rooms_total``; otherwise the overlapping stays are counted.
+        """
+        h = self._hotels.get(hotel_id)
+        if h is None:
+            return 0
+        first, end = iso_ordinal(check_in), iso_ordinal(check_out)
+        counts = h.booked
+        if not h.exact(rooms_total):
+            counts = {}
+            rows = self._rows
+            for rid in self._overlapping(hotel_id, first, end):
+                row = rows[rid]
+                if row.room_no is None or not (
+                    1 <= row.room_no <= rooms_total
+                ):
+                    continue
+                for night in range(
+                    max(first, row.check_in_ord), min(end, row.check_out_ord)
+                ):
+                    counts[night] = counts.get(night, 0) + 1
+        return max(
+            (counts.get(night, 0) for night in range(first, end)),
+            default=0,
+        )
@@ -0,0 +1,334 @@
+"""Reproducible profiling runs of ReservationService workloads.
+
+A run works on a scratch copy of a data directory (or a generated
+dataset), drives a weighted mix of operations through the service under
+``cProfile`` and ``tracemalloc`` and writes a plain-text report with
+per-operation timings, CPU hotspots and allocation sites.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .customer import Customer
+from .exceptions import ConflictError, NotFoundError, ValidationError
+from .service import ReservationService
+from .storage import JsonStore, paths_in
+
+DEFAULT_MIX = "reserve=3,auto=3,cancel=2,update=1,delete=1"
+
+# Outcomes an operation may legitimately hit on random input.
+_EXPECTED = (ConflictError, NotFoundError, ValidationError)
+
+
+def parse_mix(spec: str, ops: Iterable[str] = ()) -> Dict[str, int]:
+    """Parse ``"name=weight,..."`` into a dict of positive weights.
+
+    ``ops`` lists the allowed names (default: the profiling operations).
+    """
+    allowed = set(ops) or set(_OPS)
+    mix: Dict[str, int] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip().lower()
+        if name not in allowed:
+            raise ValueError("Unknown operation in mix: {}".format(name))
+        try:
+            mix[name] = int(weight) if weight.strip() else 1
+        except ValueError as exc:
+            msg = "Weight for {} must be an integer.".format(name)
+            raise ValueError(msg) from exc
+        if mix[name] < 0:
+            raise ValueError("Weight for {} must be >= 0.".format(name))
+    if not any(mix.values()):
+        raise ValueError("Operation mix must have a positive weight.")
+    return mix
+
+
+def generate_dataset(
+    store: JsonStore,
+    hotels: int,
+    customers: int,
+    reservations: int,
+    seed: int = 0,
+) -> None:
+    """Write a synthetic dataset straight to ``store`` in bulk."""
+    rng = random.Random(seed)
+    hotel_rows = [
+        {
+            "hotel_id": "H{:05d}".format(i),
+            "name": "Hotel {}".format(i),
+            "city": rng.choice(("Nagoya", "Tokyo", "Osaka", "Kyoto")),
+            "rooms_total": rng.randint(5, 60),
+        }
+        for i in range(hotels)
+    ]
+    customer_rows = [
+        {
+            "customer_id": "C{:07d}".format(i),
+            "name_full": "Guest {}".format(i),
+            "email": "guest{}@example.com".format(i),
+        }
+        for i in range(customers)
+    ]
+    resv_rows = []
+    for i in range(reservations):
+        h = rng.choice(hotel_rows)
+        cin, cout = random_stay(rng)
+        resv_rows.append(
+            {
+                "resv_id": "R{:08d}".format(i),
+                "hotel_id": h["hotel_id"],
+                "customer_id": rng.choice(customer_rows)["customer_id"],
+                "check_in": cin,
+                "check_out": cout,
+                "room_no": rng.randint(1, h["rooms_total"]),
+            }
+        )
+    store.save_hotels(hotel_rows)
+    store.save_customers(customer_rows)
+    store.save_reservations(resv_rows)
+
+
+def random_stay(rng: random.Random) -> Tuple[str, str]:
+    start = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+    end = start + timedelta(days=rng.randint(1, 7))
+    return start.isoformat(), end.isoformat()
+
+
+@dataclass
+class _Workload:
+    svc: ReservationService
+    rng: random.Random
+    hotels: List[Tuple[str, int]]
+    customers: List[str]
+    live: List[str]
+    seq: int = 0
+    timings: Dict[str, List[float]] = field(default_factory=dict)
+    outcomes: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def next_id(self, prefix: str) -> str:
+        self.seq += 1
+        return "{}P{:08d}".format(prefix, self.seq)
+
+
+def _op_reserve(w: _Workload, auto: bool) -> None:
+    hotel_id, rooms = w.rng.choice(w.hotels)
+    cin, cout = random_stay(w.rng)
+    r = w.svc.reserve_room(
+        w.next_id("R"),
+        hotel_id,
+        w.rng.choice(w.customers),
+        cin,
+        cout,
+        room_no=None if auto else w.rng.randint(1, rooms),
+    )
+    w.live.append(r.resv_id)
+
+
+def _op_cancel(w: _Workload) -> None:
+    if not w.live:
+        raise NotFoundError("No reservation to cancel.")
+    i = w.rng.randrange(len(w.live))
+    w.live[i], w.live[-1] = w.live[-1], w.live[i]
+    w.svc.cancel_reservation(w.live.pop())
+
+
+def _op_update(w: _Workload) -> None:
+    if w.rng.random() < 0.5:
+        cid = w.rng.choice(w.customers)
+        w.svc.update_customer(cid, name_full="Guest {}".format(w.seq))
+    else:
+        hotel_id, _ = w.rng.choice(w.hotels)
+        w.svc.update_hotel(hotel_id, name="Hotel {}".format(w.seq))
+
+
+def _op_delete(w: _Workload) -> Callable[[], None]:
+    i = w.rng.randrange(len(w.customers))
+    w.svc.delete_customer(w.customers[i])
+    new_id = w.next_id("C")
+    w.customers[i] = new_id
+    # Replace the guest so later operations still have customers to
+    # book for; the caller runs this outside the timed section.
+    return lambda: w.svc.create_customer(
+        Customer(new_id, "Guest", "{}@example.com".format(new_id))
+    )
+
+
+_OPS: Dict[str, Callable[[_Workload], Optional[Callable[[], None]]]] = {
+    "reserve": lambda w: _op_reserve(w, auto=False),
+    "auto": lambda w: _op_reserve(w, auto=True),
+    "cancel": _op_cancel,
+    "update": _op_update,
+    "delete": _op_delete,
+}
+
+
+def _run_ops(w: _Workload, mix: Dict[str, int], ops: int) -> None:
+    names = [n for n in mix if mix[n]]
+    weights = [mix[n] for n in names]
+    for name in w.rng.choices(names, weights, k=ops):
+        after = None
+        t0 = time.perf_counter()
+        try:
+            after = _OPS[name](w)
+            outcome = "ok"
+        except _EXPECTED as exc:
+            outcome = type(exc).__name__
+        w.timings.setdefault(name, []).append(time.perf_counter() - t0)
+        counts = w.outcomes.setdefault(name, {})
+        counts[outcome] = counts.get(outcome, 0) + 1
+        if after is not None:
+            after()
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..1) of pre-sorted values."""
+    i = min(len(sorted_vals) - 1, int(round(q * (len(sorted_vals) - 1))))
+    return sorted_vals[i]
+
+
+def _format_timings(w: _Workload) -> str:
+    lines = [
+        "{:<10}{:>8}{:>12}{:>12}{:>12}{:>12}  outcomes".format(
+            "op", "count", "mean ms", "p50 ms", "p95 ms", "max ms"
+        )
+    ]
+    for name in sorted(w.timings):
+        vals = sorted(w.timings[name])
+        lines.append(
+            "{:<10}{:>8}{:>12.3f}{:>12.3f}{:>12.3f}{:>12.3f}  {}".format(
+                name,
+                len(vals),
+                1000 * sum(vals) / len(vals),
+                1000 * percentile(vals, 0.50),
+                1000 * percentile(vals, 0.95),
+                1000 * vals[-1],
+                ", ".join(
+                    "{}={}".format(k, v)
+                    for k, v in sorted(w.outcomes[name].items())
+                ),
+            )
+        )
+    return "\n".join(lines)
+
+
+def _alloc_sites(top: int) -> List[str]:
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+    return [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+
+
+def _copy_data(src: str, dst: str, layout: str) -> None:
+    src_paths = paths_in(src, layout)
+    dst_paths = paths_in(dst, layout)
+    for name in ("hotels", "customers", "reservations"):
+        path = getattr(src_paths, name)
+        if os.path.exists(path):
+            shutil.copyfile(path, getattr(dst_paths, name))
+
+
+def run_profile(
+    report: str,
+    data_dir: Optional[str] = None,
+    layout: str = "array",
+    ops: int = 200,
+    mix: str = DEFAULT_MIX,
+    top: int = 25,
+    hotels: int = 20,
+    customers: int = 500,
+    reservations: int = 2000,
+    seed: int = 0,
+    trace_allocs: bool = True,
+) -> str:
+    """Profile a workload and write the report to ``report``.
+
+    With ``data_dir`` the run uses a scratch copy of that directory's
+    data files, so the originals are never modified; otherwise a
+    synthetic dataset of the given size is generated. Allocation
+    tracing slows every allocation down, so ``trace_allocs=False``
+    gives timings closer to production. Returns the report text.
+    """
+    weights = parse_mix(mix)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JsonStore(paths_in(tmp, layout), layout=layout)
+        if data_dir is not None:
+            _copy_data(data_dir, tmp, layout)
+        else:
+            generate_dataset(store, hotels, customers, reservations, seed)
+
+        hotel_rows = store.load_hotels()
+        customer_rows = store.load_customers()
+        if not hotel_rows or not customer_rows:
+            raise ValueError("Dataset needs at least one hotel and customer.")
+        w = _Workload(
+            svc=ReservationService(store=store),
+            rng=random.Random(seed),
+            hotels=[(h["hotel_id"], h["rooms_total"]) for h in hotel_rows],
+            customers=[c["customer_id"] for c in customer_rows],
+            live=[r["resv_id"] for r in store.load_reservations()],
+        )
+
+        n_resv = len(w.live)
+        prof = cProfile.Profile()
+        if trace_allocs:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        prof.enable()
+        try:
+            _run_ops(w, weights, ops)
+        finally:
+            prof.disable()
+            elapsed = time.perf_counter() - t0
+            allocs = _alloc_sites(top) if trace_allocs else []
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    cpu = io.StringIO()
+    pstats.Stats(prof, stream=cpu).sort_stats("cumulative").print_stats(top)
+    own = io.StringIO()
+    pstats.Stats(prof, stream=own).sort_stats("tottime").print_stats(top)
+
+    text = "\n".join(
+        [
+            "Profile report",
+            "==============",
+            "dataset: {}".format(data_dir or "generated (seed={})".format(
+                seed)),
+            "layout: {}  ops: {}  mix: {}".format(layout, ops, mix),
+            "hotels: {}  customers: {}  reservations: {}".format(
+                len(hotel_rows), len(customer_rows), n_resv),
+            "wall time: {:.3f}s  peak traced memory: {:.1f} KiB".format(
+                elapsed, peak / 1024),
+            "",
+            "Per-operation timings",
+            "---------------------",
+            _format_timings(w),
+            "",
+            "Top {} by cumulative time".format(top),
+            "------------------------",
+            cpu.getvalue(),
+            "Top {} by own time".format(top),
+            "-------------------",
+            own.getvalue(),
+            "Top {} allocation sites (live at end of run)".format(top),
+            "-------------------------------------------",
+            "\n".join(allocs) or "(allocation tracing disabled)",
+            "",
+        ]
+    )
+    with open(report, "w", encoding="utf-8") as f:
+        f.write(text)
+    return text
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from .exceptions import ValidationError
-from .validators import req_iso_date, req_str
+from .validators import req_iso_ordinal, req_str
+
+if TYPE_CHECKING:
+    from .rows import ReservationRow
 
 
 @dataclass(frozen=True, slots=True)
@@ -18,19 +20,24 @@ class Reservation:
     check_in: str
     check_out: str
     room_no: Optional[int] = None
+    # True when the service picked the room, so it may move the stay
+    # to another room; False for rooms the guest asked for.
+    auto_assigned: bool = False
+    # Day ordinals of check_in/check_out, set once by __post_init__.
+    check_in_ord: int = field(init=False, repr=False, compare=False)
+    check_out_ord: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         req_str(self.resv_id, "resv_id")
         req_str(self.hotel_id, "hotel_id")
         req_str(self.customer_id, "customer_id")
 
-        cin = req_iso_date(self.check_in, "check_in")
-        cout = req_iso_date(self.check_out, "check_out")
-
-        d_in = date.fromisoformat(cin)
-        d_out = date.fromisoformat(cout)
+        d_in = req_iso_ordinal(self.check_in, "check_in")
+        d_out = req_iso_ordinal(self.check_out, "check_out")
         if d_out <= d_in:
             raise ValidationError("check_out must be after check_in.")
+        object.__setattr__(self, "check_in_ord", d_in)
+        object.__setattr__(self, "check_out_ord", d_out)
 
         if self.room_no is not None and (
             (not isinstance(self.room_no, int))
@@ -38,9 +45,11 @@ class Reservation:
         ):
             raise ValidationError(
                 "room_no must be a positive integer if provided.")
+        if not isinstance(self.auto_assigned, bool):
+            raise ValidationError("auto_assigned must be a boolean.")
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        d: Dict[str, Any] = {
             "resv_id": self.resv_id,
             "hotel_id": self.hotel_id,
             "customer_id": self.customer_id,
@@ -48,6 +57,11 @@ class Reservation:
             "check_out": self.check_out,
             "room_no": self.room_no,
         }
+        # Only written when set, so records of requested rooms (and
+        # files written before the flag existed) look the same.
+        if self.auto_assigned:
+            d["auto_assigned"] = True
+        return d
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Reservation":
@@ -58,4 +72,17 @@ class Reservation:
             check_in=d["check_in"],
             check_out=d["check_out"],
             room_no=d.get("room_no"),
+            auto_assigned=d.get("auto_assigned", False),
+        )
+
+    @staticmethod
+    def from_row(row: "ReservationRow") -> "Reservation":
+        return Reservation(
+            resv_id=row.resv_id,
+            hotel_id=row.hotel_id,
+            customer_id=row.customer_id,
+            check_in=row.check_in,
+            check_out=row.check_out,
+            room_no=row.room_no,
+            auto_assigned=row.auto_assigned,
         )
@@ -0,0 +1,80 @@
+"""Compact in-memory record rows.
+
+Loaded JSON objects are dicts that each carry their own key table and
+their own copies of repeated values (hotel ids, customer ids, dates).
+Rows are tuple-backed and their repeated strings (hotel and customer
+ids, dates) are interned, so a million reservations share one copy of
+each distinct value. Reservation ids are unique and left alone.
+
+Reservation rows also carry the day ordinals of their dates, parsed
+once at load, so date comparisons and night ranges work on ints.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, NamedTuple, Optional
+
+from .exceptions import ValidationError
+from .validators import iso_ordinal
+
+intern = sys.intern
+
+
+class ReservationRow(NamedTuple):
+    resv_id: str
+    hotel_id: str
+    customer_id: str
+    check_in: str
+    check_out: str
+    room_no: Optional[int]
+    auto_assigned: bool = False
+    # Derived from check_in/check_out by from_dict; not persisted.
+    check_in_ord: int = 0
+    check_out_ord: int = 0
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "ReservationRow":
+        """Build a row with interned strings.
+
+        Only types and the date format are checked.
+        """
+        resv_id = d.get("resv_id")
+        room_no = d.get("room_no")
+        auto_assigned = d.get("auto_assigned", False)
+        if not isinstance(resv_id, str):
+            raise ValidationError("resv_id must be a string.")
+        if room_no is not None and not isinstance(room_no, int):
+            raise ValidationError("room_no must be an integer if provided.")
+        if not isinstance(auto_assigned, bool):
+            raise ValidationError("auto_assigned must be a boolean.")
+        try:
+            # sys.intern only accepts str, so it doubles as a type check.
+            check_in = intern(d["check_in"])
+            check_out = intern(d["check_out"])
+            return ReservationRow(
+                resv_id,
+                intern(d["hotel_id"]),
+                intern(d["customer_id"]),
+                check_in,
+                check_out,
+                room_no,
+                auto_assigned,
+                iso_ordinal(check_in),
+                iso_ordinal(check_out),
+            )
+        except (KeyError, TypeError) as exc:
+            raise ValidationError(
+                "reservation ids and dates must be strings."
+            ) from exc
+        except ValueError as exc:
+            raise ValidationError(
+                "reservation dates must be ISO format YYYY-MM-DD."
+            ) from exc
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = self._asdict()
+        del d["check_in_ord"], d["check_out_ord"]
+        if not self.auto_assigned:
+            del d["auto_assigned"]
+        return d
@@ -0,0 +1,204 @@
+"""In-memory customer search by name and email.
+
+Two structures over case-folded text:
+
+* a sorted list of searchable keys (the full name, each later word of
+  the name and the email), so prefix matches come from ``bisect`` in
+  O(log n + k);
+* a trigram index mapping every three-character substring to the
+  customers containing it, so substring matches only check the
+  customers listed under the query's rarest trigram.
+
+Each document also keeps the customer's name and email as given, so
+search results come straight from the index without reading the store.
+
+Customers get consecutive document numbers, so each trigram's posting
+list is an ``array`` of increasing ints (4 bytes per entry) instead of
+a set. Removing a customer only blanks its document; postings are
+rebuilt once blank documents outnumber live ones. Likewise new keys go
+to a small sorted side list and removed ones to a tombstone set, both
+folded into the main key list once they grow, so changes cost
+O(log n) amortized instead of shifting a list of millions.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Separates a key's text from the customer id in the sorted key list.
+_SEP = "\0"
+
+
+def _norm(text: str) -> str:
+    return text.casefold().replace(_SEP, "")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _keys(cid: str, name: str, email: str) -> List[str]:
+    words = name.split()
+    texts = [name, email] + [" ".join(words[i:])
+                             for i in range(1, len(words))]
+    return [t + _SEP + cid for t in texts]
+
+
+def _prefixed(keys: List[str], q: str) -> Iterator[str]:
+    i = bisect_left(keys, q)
+    while i < len(keys) and keys[i].startswith(q):
+        yield keys[i]
+        i += 1
+
+
+class CustomerSearchIndex:
+    """Prefix and substring search over customer names and emails."""
+
+    def __init__(self, customers: Iterable[Dict[str, Any]] = ()) -> None:
+        # Document number -> (customer_id, name, email), None if removed.
+        self._docs: List[Optional[Tuple[str, str, str]]] = []
+        # Document number -> (name, email) as given, None if removed.
+        self._raw: List[Optional[Tuple[str, str]]] = []
+        self._doc_of: Dict[str, int] = {}
+        self._grams: Dict[str, array] = defaultdict(lambda: array("I"))
+        # "text\0customer_id", sorted; recent additions and removals are
+        # kept aside in _added (sorted) and _gone until the next merge.
+        self._keys: List[str] = []
+        self._added: List[str] = []
+        self._gone: Set[str] = set()
+        self._blank = 0
+        # Opaque token describing the store state this index reflects.
+        self.stamp: object = None
+        for c in customers:
+            cid, name, email = (
+                c.get("customer_id"), c.get("name_full"), c.get("email")
+            )
+            if all(isinstance(v, str) for v in (cid, name, email)):
+                self._add_doc(cid, name, email)
+                # Bulk load: append now, sort once below.
+                self._keys.extend(_keys(*self._docs[-1]))
+        self._keys.sort()
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    # -------- maintenance --------
+    def _add_doc(self, cid: str, name: str, email: str) -> None:
+        doc = len(self._docs)
+        self._raw.append((name, email))
+        name, email = _norm(name), _norm(email)
+        self._docs.append((cid, name, email))
+        self._doc_of[cid] = doc
+        grams = self._grams
+        for g in _trigrams(name) | _trigrams(email):
+            grams[g].append(doc)
+
+    def add(self, customer_id: str, name_full: str, email: str) -> None:
+        """Index a customer, replacing any earlier version."""
+        self.discard(customer_id)
+        self._add_doc(customer_id, name_full, email)
+        for key in _keys(*self._docs[-1]):
+            if key in self._gone:
+                self._gone.discard(key)  # still in the main list
+            else:
+                insort(self._added, key)
+        self._maybe_merge()
+
+    def discard(self, customer_id: str) -> None:
+        doc = self._doc_of.pop(customer_id, None)
+        if doc is None:
+            return
+        added = self._added
+        for key in _keys(*self._docs[doc]):
+            i = bisect_left(added, key)
+            if i < len(added) and added[i] == key:
+                del added[i]
+            else:
+                self._gone.add(key)
+        self._docs[doc] = self._raw[doc] = None
+        self._blank += 1
+        if self._blank > max(1024, len(self._doc_of)):
+            self._repack()
+        self._maybe_merge()
+
+    def _maybe_merge(self) -> None:
+        if len(self._added) + len(self._gone) > max(
+            1024, len(self._keys) // 64
+        ):
+            gone = self._gone
+            keys = [k for k in self._keys if k not in gone]
+            keys.extend(self._added)
+            keys.sort()  # two sorted runs: a linear merge for timsort
+            self._keys, self._added, self._gone = keys, [], set()
+
+    def _repack(self) -> None:
+        """Renumber live documents and rebuild the postings."""
+        live = [
+            (d[0],) + raw
+            for d, raw in zip(self._docs, self._raw)
+            if d is not None and raw is not None
+        ]
+        self._docs, self._raw, self._doc_of = [], [], {}
+        self._grams = defaultdict(lambda: array("I"))
+        self._blank = 0
+        for cid, name, email in live:
+            self._add_doc(cid, name, email)
+
+    # -------- queries --------
+    def record(self, customer_id: str) -> Optional[Dict[str, Any]]:
+        """The indexed customer as a record, or None if not indexed."""
+        doc = self._doc_of.get(customer_id)
+        raw = self._raw[doc] if doc is not None else None
+        if raw is None:
+            return None
+        return {
+            "customer_id": customer_id,
+            "name_full": raw[0],
+            "email": raw[1],
+        }
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Ids of up to ``limit`` customers matching ``query``.
+
+        Names or emails that start with the query come first, in
+        alphabetical order, then those that merely contain it.
+        """
+        q = _norm(query).strip()
+        if not q or limit <= 0:
+            return []
+        hits: Dict[str, None] = {}
+        gone = self._gone
+        for key in heapq.merge(
+            _prefixed(self._keys, q), _prefixed(self._added, q)
+        ):
+            if len(hits) >= limit:
+                break
+            if key not in gone:
+                hits[key[key.rindex(_SEP) + 1:]] = None
+        if len(hits) < limit and len(q) >= 3:
+            self._contains(q, limit, hits)
+        return list(hits)
+
+    def _contains(self, q: str, limit: int, hits: Dict[str, None]) -> None:
+        postings = []
+        for g in _trigrams(q):
+            posting = self._grams.get(g)
+            if posting is None:
+                return  # some trigram occurs nowhere
+            postings.append(posting)
+        docs = self._docs
+        # Every match is listed under each of the query's trigrams, so
+        # the shortest posting list holds all candidates.
+        for doc in min(postings, key=len):
+            entry = docs[doc]
+            if entry is None or entry[0] in hits:
+                continue
+            cid, name, email = entry
+            if q in name or q in email:
+                hits[cid] = None
+                if len(hits) >= limit:
+                    return
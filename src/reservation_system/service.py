@@ -2,69 +2,131 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+import itertools
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Union
 
+from .assignment import RepackReport, repack
+from .changefeed import Change, ChangeFeed
 from .customer import Customer
 from .exceptions import ConflictError, NotFoundError, ValidationError
 from .hotel import Hotel
+from .lazy import LazyRecords
+from .locking import NoLocks, ServiceLocks
+from .occupancy import OccupancyIndex
 from .reservation import Reservation
+from .rows import ReservationRow
+from .search import CustomerSearchIndex
 from .storage import JsonStore
+from .validators import iso_day, iso_ordinal, req_iso_ordinal
 
 
-def _idx(items: List[dict], key: str) -> Dict[str, dict]:
-    out: Dict[str, dict] = {}
-    for it in items:
-        val = it.get(key)
-        if isinstance(val, str) and val.strip():
-            out[val.strip()] = it
-        else:
-            msg = "[ERROR] Skipping record with invalid {}: {}".format(key, it)
-            print(msg)
-    return out
+def _window_end(start: str, end: Optional[str]) -> str:
+    first = req_iso_ordinal(start, "start")
+    if end is None:
+        return date.fromordinal(first + 1).isoformat()
+    if req_iso_ordinal(end, "end") <= first:
+        raise ValidationError("end must be after start.")
+    return end
 
 
-def _overlap(a: Tuple[str, str], b: Tuple[str, str]) -> bool:
-    a_s, a_e = a
-    b_s, b_e = b
-    return a_s < b_e and b_s < a_e
+def _before(day: object, cut: int) -> bool:
+    """Is ``day`` an ISO date earlier than the ordinal ``cut``?"""
+    try:
+        return isinstance(day, str) and iso_ordinal(day) < cut
+    except ValueError:
+        return False
 
 
 @dataclass(slots=True)
 class ReservationService:
+    """Hotels, customers and reservations on top of a JsonStore.
+
+    With ``thread_safe=True`` the service may be shared between threads:
+    bookings for different hotels run in parallel, while bookings for
+    the same hotel and changes to the hotel or customer catalogs are
+    serialized (see ``locking``).
+
+    With a ``feed`` every change is also appended to that change feed,
+    in the order it was made (see ``changefeed``).
+    """
+
     store: JsonStore
+    thread_safe: bool = False
+    feed: Optional[ChangeFeed] = None
+    # Built lazily from the store and kept in step with our own writes.
+    _occupancy: Optional[OccupancyIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _search: Optional[CustomerSearchIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _locks: Union[ServiceLocks, NoLocks] = field(
+        init=False, repr=False, compare=False
+    )
+    _hotels: LazyRecords[Hotel] = field(
+        init=False, repr=False, compare=False
+    )
+    _customers: LazyRecords[Customer] = field(
+        init=False, repr=False, compare=False
+    )
+    _reservations: LazyRecords[Reservation] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._locks = ServiceLocks() if self.thread_safe else NoLocks()
+        st = self.store
+        self._hotels = LazyRecords(
+            st.hotel_ids, st.get_hotel, Hotel.from_dict, st.hotels_stamp
+        )
+        self._customers = LazyRecords(
+            st.customer_ids,
+            st.get_customer,
+            Customer.from_dict,
+            st.customers_stamp,
+        )
+        self._reservations = LazyRecords(
+            st.reservation_ids,
+            st.get_reservation,
+            Reservation.from_dict,
+            st.reservations_stamp,
+        )
 
     # -------- Hotels --------
     def create_hotel(self, hotel: Hotel) -> None:
-        hotels = self.store.load_hotels()
-        by_id = _idx(hotels, "hotel_id")
-        if hotel.hotel_id in by_id:
-            raise ConflictError("Hotel already exists.")
-        hotels.append(hotel.to_dict())
-        self.store.save_hotels(hotels)
+        with self._locks.hotels.write():
+            if self.store.get_hotel(hotel.hotel_id) is not None:
+                raise ConflictError("Hotel already exists.")
+            self.store.put_hotels([hotel.to_dict()])
+            self._emit([("created", "hotel", hotel.hotel_id,
+                         hotel.to_dict())])
 
     def get_hotel(self, hotel_id: str) -> Hotel:
         if not isinstance(hotel_id, str) or not hotel_id.strip():
             raise ValidationError("hotel_id must be a non-empty string.")
-        hotels = self.store.load_hotels()
-        by_id = _idx(hotels, "hotel_id")
-        if hotel_id not in by_id:
-            raise NotFoundError("Hotel not found.")
-        return Hotel.from_dict(by_id[hotel_id])
+        try:
+            return self._hotels[hotel_id]
+        except KeyError:
+            raise NotFoundError("Hotel not found.") from None
+
+    def hotels(self) -> LazyRecords[Hotel]:
+        """All hotels by id; each is loaded on first access."""
+        return self._hotels
 
     def delete_hotel(self, hotel_id: str) -> None:
         if not isinstance(hotel_id, str) or not hotel_id.strip():
             raise ValidationError("hotel_id must be a non-empty string.")
-        hotels = self.store.load_hotels()
-        before = len(hotels)
-        hotels = [h for h in hotels if h.get("hotel_id") != hotel_id]
-        if len(hotels) == before:
-            raise NotFoundError("Hotel not found.")
-        # Remove linked reservations
-        res = self.store.load_reservations()
-        res = [r for r in res if r.get("hotel_id") != hotel_id]
-        self.store.save_hotels(hotels)
-        self.store.save_reservations(res)
+        with self._locks.hotels.write(), self._locks.hotel(hotel_id):
+            if not self.store.remove_hotels([hotel_id]):
+                raise NotFoundError("Hotel not found.")
+            self._hotels.discard(hotel_id)
+            self._emit([("deleted", "hotel", hotel_id, None)])
+            # Remove linked reservations
+            with self._locks.commit:
+                rows = self._occupancy_index().rows_for_hotel(hotel_id)
+                self._commit(remove=[r.resv_id for r in rows])
 
     def update_hotel(
         self,
@@ -74,16 +136,11 @@ class ReservationService:
         city: Optional[str] = None,
         rooms_total: Optional[int] = None,
     ) -> Hotel:
-        hotels = self.store.load_hotels()
-        updated: List[dict] = []
-        found = False
-
-        for it in hotels:
-            if it.get("hotel_id") != hotel_id:
-                updated.append(it)
-                continue
+        with self._locks.hotels.write():
+            it = self.store.get_hotel(hotel_id)
+            if it is None:
+                raise NotFoundError("Hotel not found.")
 
-            found = True
             patched = dict(it)
             if name is not None:
                 patched["name"] = name
@@ -93,48 +150,51 @@ class ReservationService:
                 patched["rooms_total"] = rooms_total
 
             h = Hotel.from_dict(patched)  # validates
-            updated.append(h.to_dict())
-
-        if not found:
-            raise NotFoundError("Hotel not found.")
-        self.store.save_hotels(updated)
-        return self.get_hotel(hotel_id)
+            self.store.put_hotels([h.to_dict()])
+            self._hotels.discard(hotel_id)
+            self._emit([("updated", "hotel", hotel_id, h.to_dict())])
+            return h
 
     # ---------------- Customers ----------------
     def create_customer(self, cust: Customer) -> None:
-        customers = self.store.load_customers()
-        by_id = _idx(customers, "customer_id")
-        if cust.customer_id in by_id:
-            raise ConflictError("Customer already exists.")
-        customers.append(cust.to_dict())
-        self.store.save_customers(customers)
+        with self._locks.customers.write():
+            if self.store.get_customer(cust.customer_id) is not None:
+                raise ConflictError("Customer already exists.")
+            before = self.store.customers_stamp()
+            self.store.put_customers([cust.to_dict()])
+            self._search_change(before, added=[cust])
+            self._emit([("created", "customer", cust.customer_id,
+                         cust.to_dict())])
 
     def get_customer(self, customer_id: str) -> Customer:
         if not isinstance(customer_id, str) or not customer_id.strip():
             raise ValidationError("customer_id must be a non-empty string.")
-        customers = self.store.load_customers()
-        by_id = _idx(customers, "customer_id")
-        if customer_id not in by_id:
-            raise NotFoundError("Customer not found.")
-        return Customer.from_dict(by_id[customer_id])
+        try:
+            return self._customers[customer_id]
+        except KeyError:
+            raise NotFoundError("Customer not found.") from None
+
+    def customers(self) -> LazyRecords[Customer]:
+        """All customers by id; each is loaded on first access."""
+        return self._customers
 
     def delete_customer(self, customer_id: str) -> None:
         if not isinstance(customer_id, str) or not customer_id.strip():
             raise ValidationError("customer_id must be a non-empty string.")
-        customers = self.store.load_customers()
-        before = len(customers)
-        customers = [
-            c for c in customers if c.get("customer_id") != customer_id
-        ]
-        if len(customers) == before:
-            raise NotFoundError("Customer not found.")
-
-        # Remove linked reservations to keep storage consistent
-        res = self.store.load_reservations()
-        res = [r for r in res if r.get("customer_id") != customer_id]
-
-        self.store.save_customers(customers)
-        self.store.save_reservations(res)
+        # Holding the customer catalog for writing keeps bookings (which
+        # read it) from adding reservations for this customer meanwhile.
+        with self._locks.customers.write():
+            before = self.store.customers_stamp()
+            if not self.store.remove_customers([customer_id]):
+                raise NotFoundError("Customer not found.")
+            self._customers.discard(customer_id)
+            self._search_change(before, removed=[customer_id])
+            self._emit([("deleted", "customer", customer_id, None)])
+
+            # Remove linked reservations to keep storage consistent
+            with self._locks.commit:
+                idx = self._occupancy_index()
+                self._commit(remove=idx.for_customer(customer_id))
 
     def update_customer(
         self,
@@ -143,16 +203,11 @@ class ReservationService:
         name_full: Optional[str] = None,
         email: Optional[str] = None,
     ) -> Customer:
-        customers = self.store.load_customers()
-        updated: List[dict] = []
-        found = False
+        with self._locks.customers.write():
+            it = self.store.get_customer(customer_id)
+            if it is None:
+                raise NotFoundError("Customer not found.")
 
-        for it in customers:
-            if it.get("customer_id") != customer_id:
-                updated.append(it)
-                continue
-
-            found = True
             patched = dict(it)
             if name_full is not None:
                 patched["name_full"] = name_full
@@ -160,25 +215,76 @@ class ReservationService:
                 patched["email"] = email
 
             c = Customer.from_dict(patched)  # validates
-            updated.append(c.to_dict())
-
-        if not found:
-            raise NotFoundError("Customer not found.")
-        self.store.save_customers(updated)
-        return self.get_customer(customer_id)
+            before = self.store.customers_stamp()
+            self.store.put_customers([c.to_dict()])
+            self._customers.discard(customer_id)
+            self._search_change(before, added=[c])
+            self._emit([("updated", "customer", customer_id, c.to_dict())])
+            return c
+
+    def search_customers(
+        self, query: str, limit: int = 10
+    ) -> List[Customer]:
+        """Customers whose name or email contains ``query``.
+
+        Case-insensitive. Names and emails starting with the query (or
+        a later word of the name starting with it) rank first.
+        """
+        if not isinstance(query, str):
+            raise ValidationError("query must be a string.")
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValidationError("limit must be a positive integer.")
+        # Results are built from the index: a store read per hit parses
+        # the whole file each time on the "array" layout.
+        out = []
+        with self._locks.customers.read():
+            idx = self._search_index()
+            for cid in idx.search(query, limit):
+                try:
+                    out.append(Customer.from_dict(idx.record(cid)))
+                except (KeyError, TypeError, ValidationError) as exc:
+                    msg = "[ERROR] Skip invalid record {!r}: {}".format(
+                        cid, exc
+                    )
+                    print(msg)
+        return out
 
     # ---------------- Reservations ----------------
+    def reservations(self) -> LazyRecords[Reservation]:
+        """All reservations by id; each is loaded on first access."""
+        return self._reservations
+
     def create_reservation(self, resv: Reservation) -> Reservation:
+        with (
+            self._locks.hotels.read(),
+            self._locks.customers.read(),
+            self._locks.hotel(resv.hotel_id),
+        ):
+            return self._create_reservation(resv)
+
+    def _create_reservation(self, resv: Reservation) -> Reservation:
         # Ensure hotel and customer exist
         _ = self.get_hotel(resv.hotel_id)
         _ = self.get_customer(resv.customer_id)
 
-        res_list = self.store.load_reservations()
-        by_id = _idx(res_list, "resv_id")
-        if resv.resv_id in by_id:
-            raise ConflictError("Reservation already exists.")
+        self._check_cutoff(resv.check_in)
 
+        hotel = self.get_hotel(resv.hotel_id)
         room_no = resv.room_no
+        if room_no is not None and (
+            room_no < 1 or room_no > hotel.rooms_total
+        ):
+            raise ValidationError("room_no is out of hotel room range.")
+
+        # Sold-out dates are refused from the per-night counters alone.
+        with self._locks.commit:
+            booked = self._occupancy_index().booked(
+                resv.hotel_id, resv.check_in, resv.check_out,
+                hotel.rooms_total,
+            )
+        if booked >= hotel.rooms_total:
+            raise ConflictError("No rooms available for those dates.")
+
         if room_no is None:
             room_no = self._find_room(
                 resv.hotel_id,
@@ -186,10 +292,6 @@ class ReservationService:
                 resv.check_out,
             )
 
-        hotel = self.get_hotel(resv.hotel_id)
-        if room_no < 1 or room_no > hotel.rooms_total:
-            raise ValidationError("room_no is out of hotel room range.")
-
         if self._room_busy(
             resv.hotel_id,
             room_no,
@@ -205,20 +307,20 @@ class ReservationService:
             check_in=resv.check_in,
             check_out=resv.check_out,
             room_no=room_no,
+            auto_assigned=resv.auto_assigned or resv.room_no is None,
         )
-        res_list.append(created.to_dict())
-        self.store.save_reservations(res_list)
+        self._commit(put=[created.to_dict()])
         return created
 
     def cancel_reservation(self, resv_id: str) -> None:
         if not isinstance(resv_id, str) or not resv_id.strip():
             raise ValidationError("resv_id must be a non-empty string.")
-        res_list = self.store.load_reservations()
-        before = len(res_list)
-        res_list = [r for r in res_list if r.get("resv_id") != resv_id]
-        if len(res_list) == before:
+        it = self.store.get_reservation(resv_id)
+        if it is None:
             raise NotFoundError("Reservation not found.")
-        self.store.save_reservations(res_list)
+        with self._locks.hotel(str(it.get("hotel_id"))):
+            if not self._commit(remove=[resv_id], removed_as="cancelled"):
+                raise NotFoundError("Reservation not found.")
 
     def reserve_room(
         self,
@@ -240,6 +342,430 @@ class ReservationService:
         )
         return self.create_reservation(resv)
 
+    def reserve_block(
+        self,
+        hotel_id: str,
+        customer_id: str,
+        check_in: str,
+        check_out: str,
+        count: int,
+        *,
+        block_id: Optional[str] = None,
+    ) -> List[int]:
+        """Book ``count`` rooms for the same stay, all or nothing.
+
+        Free rooms are picked lowest first in one pass over the rooms
+        busy in that range, and all reservations are persisted with one
+        store write. Reservation ids are ``"<block_id>-<n>"`` for n from
+        1 to ``count``; ``block_id`` defaults to
+        ``"<hotel_id>-<customer_id>-<check_in>"``, so repeating the same
+        block raises ConflictError instead of booking it twice, while
+        the same guest's blocks at other hotels do not clash. Returns the
+        room numbers, ascending.
+        """
+        if isinstance(count, bool) or not isinstance(count, int) or (
+            count <= 0
+        ):
+            raise ValidationError("count must be a positive integer.")
+        if block_id is None:
+            block_id = "{}-{}-{}".format(hotel_id, customer_id, check_in)
+        # Validates ids and dates before any lock is taken.
+        Reservation(block_id, hotel_id, customer_id, check_in, check_out)
+        with (
+            self._locks.hotels.read(),
+            self._locks.customers.read(),
+            self._locks.hotel(hotel_id),
+        ):
+            hotel = self.get_hotel(hotel_id)
+            self.get_customer(customer_id)
+            self._check_cutoff(check_in)
+            with self._locks.commit:
+                idx = self._occupancy_index()
+                rooms: List[int] = []
+                total = hotel.rooms_total
+                booked = idx.booked(hotel_id, check_in, check_out, total)
+                if booked + count <= total:
+                    busy = idx.busy_rooms(hotel_id, check_in, check_out)
+                    rooms = list(itertools.islice(
+                        (rn for rn in range(1, total + 1)
+                         if rn not in busy),
+                        count,
+                    ))
+            if len(rooms) < count:
+                raise ConflictError(
+                    "Not enough rooms available for those dates."
+                )
+            self._commit(put=[
+                Reservation(
+                    "{}-{}".format(block_id, n),
+                    hotel_id,
+                    customer_id,
+                    check_in,
+                    check_out,
+                    rn,
+                    auto_assigned=True,
+                ).to_dict()
+                for n, rn in enumerate(rooms, start=1)
+            ])
+        return rooms
+
+    def optimize_assignments(
+        self, hotel_id: str, from_date: str
+    ) -> RepackReport:
+        """Repack the rooms of the hotel's stays from ``from_date`` on.
+
+        Only stays whose room the service picked and that check in on
+        or after ``from_date`` move (see ``assignment``). The new rooms
+        are persisted with one store write, and only if the stays then
+        occupy no more rooms than before.
+        """
+        first = req_iso_ordinal(from_date, "from_date")
+        with self._locks.hotels.read(), self._locks.hotel(hotel_id):
+            hotel = self.get_hotel(hotel_id)
+            with self._locks.commit:
+                rows = [
+                    r
+                    for r in self._occupancy_index().rows_for_hotel(hotel_id)
+                    if r.check_out_ord > first and r.room_no is not None
+                ]
+                movable: List[ReservationRow] = []
+                fixed = []
+                for r in rows:
+                    if r.auto_assigned and r.check_in_ord >= first:
+                        movable.append(r)
+                    else:
+                        fixed.append(
+                            (r.room_no, r.check_in_ord, r.check_out_ord)
+                        )
+                before = {r.room_no for r in rows}
+                rooms = repack(
+                    [(r.resv_id, r.check_in_ord, r.check_out_ord)
+                     for r in movable],
+                    fixed,
+                    hotel.rooms_total,
+                )
+                after = before
+                moved: List[ReservationRow] = []
+                if rooms is not None:
+                    packed = {f[0] for f in fixed} | set(rooms.values())
+                    if len(packed) <= len(before):
+                        after = packed
+                        moved = [
+                            r._replace(room_no=rooms[r.resv_id])
+                            for r in movable
+                            if rooms[r.resv_id] != r.room_no
+                        ]
+                if moved:
+                    self._commit(
+                        put=[r.to_dict() for r in moved], replace=True
+                    )
+        return RepackReport(
+            hotel_id,
+            from_date,
+            len(movable),
+            len(moved),
+            len(before),
+            len(after),
+        )
+
+    # ---------------- Date-window queries ----------------
+    # The queries below read the hot set only, unless
+    # ``include_archive`` asks for archived stays as well.
+    def in_house(
+        self, hotel_id: str, day: str, include_archive: bool = False
+    ) -> List[Reservation]:
+        """Reservations staying at the hotel on the night of ``day``."""
+        self.get_hotel(hotel_id)
+        d = req_iso_ordinal(day, "day")
+        old: List[Reservation] = []
+        if include_archive:
+            old = self._archived(
+                hotel_id,
+                iso_day(d),
+                None,
+                lambda r: r.check_in_ord <= d < r.check_out_ord,
+            )
+        with self._locks.commit:
+            idx = self._occupancy_index()
+            return old + self._materialize(idx, idx.in_house(hotel_id, day))
+
+    def arrivals(
+        self,
+        hotel_id: str,
+        start: str,
+        end: Optional[str] = None,
+        include_archive: bool = False,
+    ) -> List[Reservation]:
+        """Reservations checking in on a day in [start, end).
+
+        ``end`` defaults to the day after ``start``.
+        """
+        self.get_hotel(hotel_id)
+        end = _window_end(start, end)
+        old: List[Reservation] = []
+        if include_archive:
+            lo, hi = iso_ordinal(start), iso_ordinal(end)
+            old = self._archived(
+                hotel_id, iso_day(lo), None,
+                lambda r: lo <= r.check_in_ord < hi,
+            )
+        with self._locks.commit:
+            idx = self._occupancy_index()
+            return old + self._materialize(
+                idx, idx.arrivals(hotel_id, start, end)
+            )
+
+    def departures(
+        self,
+        hotel_id: str,
+        start: str,
+        end: Optional[str] = None,
+        include_archive: bool = False,
+    ) -> List[Reservation]:
+        """Reservations checking out on a day in [start, end).
+
+        ``end`` defaults to the day after ``start``.
+        """
+        self.get_hotel(hotel_id)
+        end = _window_end(start, end)
+        old: List[Reservation] = []
+        if include_archive:
+            lo, hi = iso_ordinal(start), iso_ordinal(end)
+            old = self._archived(
+                hotel_id, iso_day(lo), iso_day(hi),
+                lambda r: lo <= r.check_out_ord < hi,
+            )
+        with self._locks.commit:
+            idx = self._occupancy_index()
+            return old + self._materialize(
+                idx, idx.departures(hotel_id, start, end)
+            )
+
+    def rooms_left(
+        self, hotel_id: str, check_in: str, check_out: Optional[str] = None
+    ) -> int:
+        """Rooms still free on every night of [check_in, check_out).
+
+        ``check_out`` defaults to the day after ``check_in``. Answered
+        from the per-night counters in O(nights); stays in rooms the
+        hotel no longer has are not counted.
+        """
+        hotel = self.get_hotel(hotel_id)
+        check_out = _window_end(check_in, check_out)
+        with self._locks.commit:
+            booked = self._occupancy_index().booked(
+                hotel_id, check_in, check_out, hotel.rooms_total
+            )
+        return max(0, hotel.rooms_total - booked)
+
+    # ---------------- Archive ----------------
+    def archive(self, before: str) -> int:
+        """Move stays checking out before ``before`` to the cold archive.
+
+        Availability checks, cascades and the date queries then only
+        read the remaining hot reservations. New bookings checking in
+        before the cutoff are refused from then on. Returns the number
+        of reservations moved.
+        """
+        cut = req_iso_ordinal(before, "before")
+        # The catalog write lock keeps bookings out while we move data;
+        # the commit lock keeps cancellations out.
+        with self._locks.hotels.write(), self._locks.commit:
+            old = [
+                r
+                for r in self.store.iter_reservations()
+                if _before(r.get("check_out"), cut)
+            ]
+            # Copy first, then delete only what reads back: a crash in
+            # between leaves a duplicate in the archive rather than
+            # losing a stay.
+            self.store.append_archive(old, iso_day(cut))
+            if not old:
+                return 0
+            outs = [r["check_out"] for r in old]
+            copied = {
+                r.get("resv_id")
+                for r in self.store.iter_archived_reservations(
+                    min(outs, key=iso_ordinal), max(outs, key=iso_ordinal)
+                )
+            }
+            return self._commit(
+                remove=[
+                    r.get("resv_id") for r in old
+                    if r.get("resv_id") in copied
+                ],
+                removed_as=None,
+            )
+
+    def _archived(
+        self,
+        hotel_id: str,
+        first: Optional[str],
+        last: Optional[str],
+        keep: Callable[[ReservationRow], bool],
+    ) -> List[Reservation]:
+        """Archived stays of a hotel with check_out in [first, last]
+        that ``keep`` accepts."""
+        out: List[Reservation] = []
+        for it in self.store.iter_archived_reservations(first, last):
+            if it.get("hotel_id") != hotel_id:
+                continue
+            try:
+                row = ReservationRow.from_dict(it)
+                if keep(row):
+                    out.append(Reservation.from_row(row))
+            except ValidationError as exc:
+                msg = "[ERROR] Skip archived reservation: {} ({})".format(
+                    it, exc
+                )
+                print(msg)
+        return out
+
+    # ---------------- Persistence ----------------
+    def _commit(
+        self,
+        put: Iterable[Dict] = (),
+        remove: Iterable[Optional[str]] = (),
+        removed_as: Optional[str] = "deleted",
+        replace: bool = False,
+    ) -> int:
+        """Persist reservation changes and mirror them in the index.
+
+        New reservations must have unused ids; with ``replace`` the
+        reservations in ``put`` overwrite existing ones and are reported
+        as "updated" instead of "created". Runs under the commit
+        lock so the uniqueness check, the store write, the index update
+        and the change events form one step for other threads.
+        Removals are reported to the feed as ``removed_as`` events, or
+        not at all if it is None. Returns the number of reservations
+        removed.
+        """
+        put = list(put)
+        remove = [rid for rid in remove if rid is not None]
+        report = self.feed is not None and removed_as is not None
+        with self._locks.commit:
+            # One id listing, not a store read per id: on the "array"
+            # layout each read parses the whole file.
+            known = (
+                set(self.store.reservation_ids())
+                if (put and not replace) or (remove and report)
+                else set()
+            )
+            for it in () if replace else put:
+                if it["resv_id"] in known:
+                    raise ConflictError("Reservation already exists.")
+            if report:
+                # Only report reservations that are really there.
+                remove = [rid for rid in remove if rid in known]
+            before = self.store.reservations_stamp()
+            removed = self.store.remove_reservations(remove) if remove else 0
+            if put:
+                self.store.put_reservations(put)
+            for rid in itertools.chain(
+                remove, (it["resv_id"] for it in put)
+            ):
+                self._reservations.discard(rid)
+            self._index_change(
+                before,
+                added=[ReservationRow.from_dict(it) for it in put],
+                removed=remove,
+            )
+            if removed_as is not None:
+                self._emit(
+                    [(removed_as, "reservation", rid, None)
+                     for rid in remove]
+                    + [("updated" if replace else "created", "reservation",
+                        it["resv_id"], it)
+                       for it in put]
+                )
+            return removed
+
+    def _emit(self, changes: List[Change]) -> None:
+        if self.feed is not None:
+            self.feed.append(changes)
+
+    # ---------------- Derived indexes ----------------
+    def _occupancy_index(self) -> OccupancyIndex:
+        """Return the occupancy index, rebuilt if the store moved on."""
+        stamp = self.store.reservations_stamp()
+        idx = self._occupancy
+        if idx is None or idx.stamp != stamp:
+            idx = OccupancyIndex(self.store.load_reservation_rows())
+            idx.stamp = stamp
+            self._occupancy = idx
+        return idx
+
+    def _index_change(
+        self,
+        before: object,
+        added: Iterable[ReservationRow] = (),
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Apply one of our own reservation writes to the index.
+
+        ``before`` is the store stamp taken just before the write. If
+        the index did not reflect that state it missed an outside
+        change, so it is dropped and rebuilt on next use instead.
+        """
+        idx = self._occupancy
+        if idx is None:
+            return
+        if idx.stamp != before:
+            self._occupancy = None
+            return
+        for rid in removed:
+            idx.discard(rid)
+        for row in added:
+            idx.add(row)
+        idx.stamp = self.store.reservations_stamp()
+
+    def _check_cutoff(self, check_in: str) -> None:
+        # Stays before the cutoff are archived and invisible to the
+        # availability checks, so nothing may be booked there.
+        cutoff = self.store.archive_cutoff()
+        if cutoff is not None and iso_ordinal(check_in) < iso_ordinal(cutoff):
+            raise ValidationError(
+                "check_in is before the archive cutoff {}.".format(cutoff)
+            )
+
+    def _search_index(self) -> CustomerSearchIndex:
+        """Return the customer search index, rebuilt if stale."""
+        stamp = self.store.customers_stamp()
+        idx = self._search
+        if idx is None or idx.stamp != stamp:
+            idx = CustomerSearchIndex(self.store.load_customers())
+            idx.stamp = stamp
+            self._search = idx
+        return idx
+
+    def _search_change(
+        self,
+        before: object,
+        added: Iterable[Customer] = (),
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Apply one of our own customer writes to the search index.
+
+        Same protocol as ``_index_change``.
+        """
+        idx = self._search
+        if idx is None:
+            return
+        if idx.stamp != before:
+            self._search = None
+            return
+        for cid in removed:
+            idx.discard(cid)
+        for c in added:
+            idx.add(c.customer_id, c.name_full, c.email)
+        idx.stamp = self.store.customers_stamp()
+
+    @staticmethod
+    def _materialize(
+        idx: OccupancyIndex, ids: Iterable[str]
+    ) -> List[Reservation]:
+        return [Reservation.from_row(idx.get(rid)) for rid in ids]
+
     def _room_busy(
         self,
         hotel_id: str,
@@ -247,27 +773,17 @@ class ReservationService:
         check_in: str,
         check_out: str,
     ) -> bool:
-        raw = self.store.load_reservations()
-        existing: List[Reservation] = []
-        for it in raw:
-            if it.get("hotel_id") == hotel_id and it.get("room_no") == room_no:
-                try:
-                    existing.append(Reservation.from_dict(it))
-                except Exception as exc:
-                    msg = "[ERROR] Skip reservation record: {} ({})".format(
-                        it, exc
-                    )
-                    print(msg)
-
-        new_range = (check_in, check_out)
-        for r in existing:
-            if _overlap(new_range, (r.check_in, r.check_out)):
-                return True
-        return False
+        with self._locks.commit:
+            idx = self._occupancy_index()
+            return room_no in idx.busy_rooms(hotel_id, check_in, check_out)
 
     def _find_room(self, hotel_id: str, check_in: str, check_out: str) -> int:
         hotel = self.get_hotel(hotel_id)
+        with self._locks.commit:
+            busy = self._occupancy_index().busy_rooms(
+                hotel_id, check_in, check_out
+            )
         for rn in range(1, hotel.rooms_total + 1):
-            if not self._room_busy(hotel_id, rn, check_in, check_out):
+            if rn not in busy:
                 return rn
         raise ConflictError("No rooms available for those dates.")
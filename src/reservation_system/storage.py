@@ -1,98 +1,1623 @@
 """Persistence layer using JSON files.
 
 Goal: if JSON is invalid or has wrong type, print an error and continue.
+
+Two on-disk layouts are supported:
+
+* ``"array"`` (default): each file is one JSON array and every change
+  rewrites the whole file.
+* ``"lines"``: one JSON record per line. Changes append the new version
+  of each dirty record (or a tombstone for deletes) and an offset
+  index points at the latest line per id, so writes cost I/O
+  proportional to the change. The index is persisted as ``<file>.idx``
+  and lines are read through ``mmap``, so a point lookup decodes one
+  line however large the file is. Superseded lines are reclaimed by
+  periodic compaction.
+* ``"blocks"``: the same record log, but written as independently
+  compressed blocks. A block index, persisted as ``<file>.idx`` as
+  well, lets point lookups decompress one block and scans stream one
+  block at a time.
+
+Reservations that checked out before a cutoff can be moved to a cold
+archive: append-only JSON-lines partitions, one file per check-out month
+(or year), under ``StorePaths.archive``. Normal reads only see the hot
+collection; the archive is read when asked for explicitly.
+
+Array files whose name ends in ``.gz``, ``.bz2`` or ``.xz`` are
+compressed transparently with the matching stdlib module.
+
+Encoding goes through a codec (see ``get_codec``): orjson when it is
+installed, the stdlib ``json`` module otherwise.
 """
 
 from __future__ import annotations
 
+import bz2
+import functools
+import gzip
+import itertools
 import json
+import lzma
+import mmap
 import os
+import struct
+import threading
+import zlib
+from array import array
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .exceptions import StorageError, ValidationError
+from .rows import ReservationRow
+from .validators import iso_day, iso_ordinal
+
+try:  # optional speedup
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+LAYOUTS = ("array", "lines", "blocks")
+
+# Marker key for a deleted record in the "lines"/"blocks" layouts.
+_TOMBSTONE = "_deleted"
+
+_Compressor = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+# Whole-file compression for the "array" layout, chosen by extension.
+_FILE_COMPRESSION: Dict[str, _Compressor] = {
+    ".gz": (lambda b: gzip.compress(b, compresslevel=6), gzip.decompress),
+    ".bz2": (bz2.compress, bz2.decompress),
+    ".xz": (lzma.compress, lzma.decompress),
+}
+
+# Per-block compression for the "blocks" layout.
+BLOCK_COMPRESSION: Dict[str, _Compressor] = {
+    "zlib": (lambda b: zlib.compress(b, 6), zlib.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+# Errors the stdlib decompressors raise on corrupt or truncated input.
+_CORRUPT = (OSError, EOFError, ValueError, zlib.error, lzma.LZMAError)
+
+# File bytes the persisted "lines" index may lag behind before it is
+# rewritten (or a quarter of the file, if that is more).
+_INDEX_SLACK = 1 << 20
+
+# Blocks the persisted "blocks" index may lag behind (or a quarter of
+# the indexed blocks, if that is more); a reopen decompresses them.
+_BLOCK_SLACK = 32
+
+# How many bytes before the indexed end must match to trust an index.
+_TAIL_BYTES = 64
+
+# Persisted "lines" index: magic, header, the tail bytes, (offset,
+# length) pairs as int64 and the ids joined by newlines. Binary because
+# decoding millions of JSON pairs costs as much as scanning the log.
+_IDX_MAGIC = b"RSIDX1\n"
+_IDX_HEAD = struct.Struct("<QQQQH")  # ino, covered, dead, count, tail
+
+# Persisted "blocks" index: magic, header, the tail bytes, (offset,
+# length) of each block, the block number of each id and the ids.
+_BLK_MAGIC = b"RSBLK1\n"
+# Header: ino, covered, dead, block count, id count, tail length.
+_BLK_HEAD = struct.Struct("<QQQQQH")
+
+# Each block on disk is its compressed length followed by the data.
+_FRAME = struct.Struct("<I")
+
+
+class StdlibCodec:
+    """JSON codec backed by the standard library.
+
+    ``compact`` drops indentation and the spaces after separators,
+    roughly halving file size and encode time.
+    """
+
+    name = "json"
+
+    def __init__(self, compact: bool = False) -> None:
+        self.compact = compact
+
+    def dumps(self, data: Any) -> bytes:
+        if self.compact:
+            return self.dumps_line(data)[:-1]
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def dumps_line(self, data: Any) -> bytes:
+        """Encode on a single line, newline-terminated."""
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return text.encode("utf-8") + b"\n"
+
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw)
+
+
+class OrjsonCodec(StdlibCodec):
+    """JSON codec backed by the optional ``orjson`` package."""
 
-from .exceptions import StorageError
+    name = "orjson"
 
+    def dumps(self, data: Any) -> bytes:
+        option = 0 if self.compact else orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
 
-def _read_json_safe(path: str) -> Any:
+    def dumps_line(self, data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+
+    def loads(self, raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+
+CODECS = {"json": StdlibCodec, "orjson": OrjsonCodec}
+
+
+def available_codecs() -> List[str]:
+    return [name for name in CODECS if name != "orjson" or orjson]
+
+
+def get_codec(name: str = "auto", compact: bool = False) -> StdlibCodec:
+    """Return a codec by name; ``"auto"`` picks the fastest installed."""
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name not in available_codecs():
+        raise ValueError("JSON codec not available: {}".format(name))
+    return CODECS[name](compact=compact)
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _synchronized(method: _F) -> _F:
+    """Run a collection method under the collection's lock."""
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _file_compression(path: str) -> Optional[_Compressor]:
+    return _FILE_COMPRESSION.get(os.path.splitext(path)[1].lower())
+
+
+def _read_json_safe(path: str, codec: Optional[StdlibCodec] = None) -> Any:
     """Read JSON. If missing/empty/invalid, return []."""
     if not os.path.exists(path):
         return []
 
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            raw = f.read().strip()
-            if not raw:
-                return []
-            return json.loads(raw)
-    except json.JSONDecodeError as exc:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as exc:
+        msg = "Failed reading {}: {}".format(path, exc)
+        raise StorageError(msg) from exc
+
+    compression = _file_compression(path)
+    if compression is not None and raw:
+        try:
+            raw = compression[1](raw)
+        except _CORRUPT as exc:
+            msg = "[ERROR] Invalid compressed data in {}: {}".format(
+                path, exc
+            )
+            print(msg)
+            return []
+
+    try:
+        # Decode straight from the bytes; no stripped or str copy.
+        if not raw or raw.isspace():
+            return []
+        return (codec or _DEFAULT_CODEC).loads(raw)
+    except ValueError as exc:
         msg = "[ERROR] Invalid JSON in {}: {}".format(path, exc)
         print(msg)
         return []
+
+
+def _write_json_safe(
+    path: str, data: Any, codec: Optional[StdlibCodec] = None
+) -> None:
+    """Write JSON to disk."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        payload = (codec or _DEFAULT_CODEC).dumps(data)
+        compression = _file_compression(path)
+        if compression is not None:
+            payload = compression[0](payload)
+        with open(path, "wb") as f:
+            f.write(payload)
+    except OSError as exc:
+        msg = "Failed writing {}: {}".format(path, exc)
+        raise StorageError(msg) from exc
+
+
+_DEFAULT_CODEC = get_codec()
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Return (size, mtime_ns) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
     except OSError as exc:
         msg = "Failed reading {}: {}".format(path, exc)
         raise StorageError(msg) from exc
+    return (st.st_size, st.st_mtime_ns)
 
 
-def _write_json_safe(path: str, data: Any) -> None:
-    """Write JSON to disk."""
+def _ends_mid_line(f: BinaryIO) -> bool:
+    """Does the open file end in a line cut short (no final newline)?
+
+    A crash during an append leaves such a line behind; a record
+    appended straight after it would merge into it and be lost.
+    """
+    end = f.seek(0, os.SEEK_END)
+    if not end:
+        return False
+    f.seek(end - 1)
+    return f.read(1) != b"\n"
+
+
+def _tail_matches(path: str, covered: int, tail: bytes) -> bool:
+    """Do the first ``covered`` bytes of a file still end in ``tail``?"""
+    n = len(tail)
+    if covered < n or (covered and not n):
+        return False
+    with open(path, "rb") as f:
+        f.seek(covered - n)
+        return f.read(n) == tail
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    """Write bytes to a sibling temp file and move it over ``path``."""
+    tmp = path + ".tmp"
     try:
         os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
     except OSError as exc:
         msg = "Failed writing {}: {}".format(path, exc)
         raise StorageError(msg) from exc
 
 
+class _ArrayFile:
+    """A file holding one JSON array; every change rewrites the file."""
+
+    def __init__(
+        self, path: str, key: str, label: str, codec: StdlibCodec
+    ) -> None:
+        self.path = path
+        self.key = key
+        self.label = label
+        self.codec = codec
+        # Makes each collection call atomic for concurrent callers.
+        self.lock = threading.RLock()
+
+    @_synchronized
+    def load(self) -> List[Dict[str, Any]]:
+        data = _read_json_safe(self.path, self.codec)
+        if isinstance(data, list):
+            return [x for x in data if isinstance(x, dict)]
+        msg = "[ERROR] {} file must be a JSON array. Got: {}".format(
+            self.label, type(data).__name__
+        )
+        print(msg)
+        return []
+
+    @_synchronized
+    def save(self, items: List[Dict[str, Any]]) -> None:
+        _write_json_safe(self.path, items, self.codec)
+
+    @_synchronized
+    def get(self, rid: str) -> Optional[Dict[str, Any]]:
+        for it in self.load():
+            if it.get(self.key) == rid:
+                return it
+        return None
+
+    @_synchronized
+    def ids(self) -> List[str]:
+        return [
+            it[self.key]
+            for it in self.load()
+            if isinstance(it.get(self.key), str)
+        ]
+
+    @_synchronized
+    def put(self, items: List[Dict[str, Any]]) -> None:
+        current = self.load()
+        pos = {it.get(self.key): i for i, it in enumerate(current)}
+        for it in items:
+            i = pos.get(it[self.key])
+            if i is None:
+                pos[it[self.key]] = len(current)
+                current.append(it)
+            else:
+                current[i] = it
+        self.save(current)
+
+    @_synchronized
+    def remove(self, ids: Iterable[str]) -> int:
+        drop = set(ids)
+        current = self.load()
+        kept = [it for it in current if it.get(self.key) not in drop]
+        removed = len(current) - len(kept)
+        if removed:
+            self.save(kept)
+        return removed
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        return _file_stamp(self.path)
+
+    @_synchronized
+    def compact(self) -> None:
+        """Nothing to reclaim: the file is rewritten on every change."""
+
+    def close(self) -> None:
+        """Nothing is held between calls."""
+
+
+class _LineLog:
+    """A file holding one JSON record per line, appended on change.
+
+    The offset index maps each live id to the (offset, length) of its
+    latest line. It is persisted next to the file (``<path>.idx``), so a
+    new process does not parse the whole log, and lines are read
+    through an ``mmap`` of the file, so a point lookup decodes only its
+    own line. If the file grew behind our back only the new tail is
+    scanned; any other outside change (size or mtime differ from our
+    last write and the file was not just appended to) triggers a full
+    rescan.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str,
+        label: str,
+        codec: StdlibCodec,
+        compact_min: int = 1024,
+    ) -> None:
+        self.path = path
+        self.index_path = path + ".idx"
+        self.key = key
+        self.label = label
+        self.codec = codec
+        # Makes each collection call atomic for concurrent callers.
+        self.lock = threading.RLock()
+        self.compact_min = compact_min
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._dead = 0
+        self._stamp: Optional[Tuple[int, int]] = None
+        # File bytes the index covers, the last few of those bytes and
+        # the file's inode. An append by someone else keeps all three.
+        self._covered = 0
+        self._tail = b""
+        self._ino: Optional[int] = None
+        # File bytes covered by the index on disk.
+        self._persisted = 0
+        self._tried_index = False
+        self._map: Optional[mmap.mmap] = None
+
+    # -------- index maintenance --------
+    def _fresh(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Bring the index up to date with the file.
+
+        Returns the live records when that took a full scan, else None.
+        """
+        if _file_stamp(self.path) == self._stamp:
+            return None
+        if not self._tried_index:
+            self._tried_index = True
+            self._load_index()
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return self._scan()
+        except OSError as exc:
+            msg = "Failed reading {}: {}".format(self.path, exc)
+            raise StorageError(msg) from exc
+        if (
+            st.st_ino == self._ino
+            and st.st_size >= self._covered
+            and _tail_matches(self.path, self._covered, self._tail)
+        ):
+            self._scan_tail()
+            return None
+        return self._scan()
+
+    def _read_from(self, offset: int) -> Tuple[bytes, Optional[Any]]:
+        """Bytes of the file from ``offset`` and its stat afterwards."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                raw = f.read()
+                return raw, os.fstat(f.fileno())
+        except FileNotFoundError:
+            return b"", None
+        except OSError as exc:
+            msg = "Failed reading {}: {}".format(self.path, exc)
+            raise StorageError(msg) from exc
+
+    def _scan(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild the index from the file and return the live records."""
+        self._unmap()
+        raw, st = self._read_from(0)
+        self._index = {}
+        self._dead = 0
+        live: Dict[str, Dict[str, Any]] = {}
+        self._apply(raw, 0, live)
+        self._ino = st.st_ino if st else None
+        self._set_stamp(st)
+        self._save_index()
+        return live
+
+    def _scan_tail(self) -> None:
+        """Index the lines appended after the covered part of the file."""
+        raw, st = self._read_from(self._covered)
+        self._apply(raw, self._covered, None)
+        self._set_stamp(st)
+        self._maybe_save_index()
+
+    def _set_stamp(self, st: Optional[Any]) -> None:
+        # A writer may have appended after our read; leaving the stamp
+        # unset makes the next call pick those lines up.
+        if st is not None and st.st_size == self._covered:
+            self._stamp = (st.st_size, st.st_mtime_ns)
+        else:
+            self._stamp = None
+
+    def _apply(
+        self,
+        raw: bytes,
+        base: int,
+        live: Optional[Dict[str, Dict[str, Any]]],
+    ) -> None:
+        """Index the lines of ``raw``, which starts at byte ``base``.
+
+        A last line that lacks its newline and does not parse may still
+        be being written; it is left for a later call.
+        """
+        lines = raw.splitlines(keepends=True)
+        if lines and not lines[-1].endswith(b"\n"):
+            try:
+                self.codec.loads(lines[-1])
+            except ValueError:
+                raw = raw[:-len(lines.pop())]
+        index = self._index
+        dead = 0
+        offset = base
+        for line, rec in zip(lines, self._parse_all(lines, base)):
+            if rec is None:
+                dead += 1 if line.strip() else 0
+            elif _TOMBSTONE in rec:
+                rid = rec[_TOMBSTONE]
+                dead += 2 if index.pop(rid, None) else 1
+                if live is not None:
+                    live.pop(rid, None)
+            else:
+                rid = rec[self.key]
+                if rid in index:
+                    dead += 1
+                index[rid] = (offset, len(line))
+                if live is not None:
+                    live[rid] = rec
+            offset += len(line)
+        self._dead += dead
+        self._covered = offset
+        tail = self._tail if base else b""
+        self._tail = (tail + raw[-_TAIL_BYTES:])[-_TAIL_BYTES:]
+
+    def _parse_all(
+        self, lines: List[bytes], base: int = 0
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Decode every line; None for blank or unusable lines.
+
+        A well-formed file is decoded in a single parse; if that fails,
+        or a damaged line (``1,2``) yields more or fewer values than
+        there are lines, the lines are decoded one by one so only the
+        bad ones are lost and no record is paired with the wrong line.
+        """
+        body = [line for line in lines if line.strip()]
+        try:
+            decoded = self.codec.loads(b"[" + b",".join(body) + b"]")
+        except ValueError:
+            decoded = None
+        if not isinstance(decoded, list) or len(decoded) != len(body):
+            out = []
+            offset = base
+            for line in lines:
+                out.append(self._parse(line, offset))
+                offset += len(line)
+            return out
+        values = iter(decoded)
+        offset = base
+        out = []
+        for line in lines:
+            rec = next(values) if line.strip() else None
+            out.append(None if rec is None else self._check(rec, offset))
+            offset += len(line)
+        return out
+
+    def _parse(self, line: bytes, offset: int) -> Optional[Dict[str, Any]]:
+        if not line.strip():
+            return None
+        try:
+            rec = self.codec.loads(line)
+        except ValueError as exc:
+            msg = "[ERROR] Invalid JSON in {} at byte {}: {}".format(
+                self.path, offset, exc
+            )
+            print(msg)
+            return None
+        return self._check(rec, offset)
+
+    def _check(self, rec: Any, offset: int) -> Optional[Dict[str, Any]]:
+        if isinstance(rec, dict) and (
+            isinstance(rec.get(_TOMBSTONE), str)
+            or isinstance(rec.get(self.key), str)
+        ):
+            return rec
+        msg = "[ERROR] Skipping {} line at byte {}: {}".format(
+            self.label, offset, rec
+        )
+        print(msg)
+        return None
+
+    # -------- persisted index --------
+    def _load_index(self) -> None:
+        """Start from the index on disk, if it is usable."""
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return
+        at = len(_IDX_MAGIC) + _IDX_HEAD.size
+        if not raw.startswith(_IDX_MAGIC) or len(raw) < at:
+            print("[ERROR] Ignoring unreadable index {}".format(
+                self.index_path))
+            return
+        ino, covered, dead, count, n = _IDX_HEAD.unpack_from(
+            raw, len(_IDX_MAGIC)
+        )
+        tail = raw[at:at + n]
+        at += n
+        pos = array("q")
+        pos.frombytes(raw[at:at + 16 * count])
+        at += 16 * count
+        try:
+            keys = raw[at:].decode("utf-8").split("\n") if count else []
+        except UnicodeDecodeError:
+            keys = []
+        if len(tail) != n or len(pos) != 2 * count or len(keys) != count:
+            print("[ERROR] Ignoring unreadable index {}".format(
+                self.index_path))
+            return
+        vals = pos.tolist()
+        self._index = dict(zip(keys, zip(vals[0::2], vals[1::2])))
+        self._ino, self._covered, self._dead = ino, covered, dead
+        self._tail = tail
+        self._persisted = covered
+
+    def _save_index(self) -> None:
+        if self._ino is None:
+            return
+        keys = "\n".join(self._index).encode("utf-8")
+        if keys.count(b"\n") != max(len(self._index) - 1, 0):
+            return  # an id holds a newline; rely on scans instead
+        pos = array("q", itertools.chain.from_iterable(self._index.values()))
+        _replace_file(self.index_path, b"".join((
+            _IDX_MAGIC,
+            _IDX_HEAD.pack(self._ino, self._covered, self._dead,
+                           len(self._index), len(self._tail)),
+            self._tail,
+            pos.tobytes(),
+            keys,
+        )))
+        self._persisted = self._covered
+
+    def _maybe_save_index(self) -> None:
+        # Rewriting the index costs O(ids), so it is only refreshed once
+        # the unindexed tail is large; a reopen scans just that tail.
+        lag = self._covered - self._persisted
+        if lag > max(_INDEX_SLACK, self._persisted // 4):
+            self._save_index()
+
+    # -------- file access --------
+    def _view(self) -> mmap.mmap:
+        """A read-only map of the file, remapped once the file grew."""
+        if self._map is None or len(self._map) < self._covered:
+            self._unmap()
+            try:
+                with open(self.path, "rb") as f:
+                    self._map = mmap.mmap(
+                        f.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+            except (OSError, ValueError) as exc:
+                msg = "Failed reading {}: {}".format(self.path, exc)
+                raise StorageError(msg) from exc
+        return self._map
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _read_at(self, pos: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """Decode the line at ``pos``; None if it is not a record."""
+        try:
+            rec = self.codec.loads(self._view()[pos[0]:pos[0] + pos[1]])
+        except ValueError:
+            return None
+        return rec if isinstance(rec, dict) else None
+
+    def _append(self, lines: List[Tuple[Optional[str], bytes]]) -> None:
+        """Append encoded lines; index those with an id, drop the rest.
+
+        A torn last line is closed with a newline first, so it stays
+        a (skipped) line of its own.
+        """
+        payload = b"".join(data for _, data in lines)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a+b") as f:
+                if _ends_mid_line(f):
+                    payload = b"\n" + payload
+                    self._dead += 1
+                offset = f.seek(0, os.SEEK_END)
+                f.write(payload)
+                if self._ino is None:
+                    self._ino = os.fstat(f.fileno()).st_ino
+        except OSError as exc:
+            msg = "Failed writing {}: {}".format(self.path, exc)
+            raise StorageError(msg) from exc
+        offset += len(payload) - sum(len(data) for _, data in lines)
+        for rid, data in lines:
+            if rid is not None:
+                self._index[rid] = (offset, len(data))
+            offset += len(data)
+        self._covered = offset
+        self._tail = (self._tail + payload)[-_TAIL_BYTES:]
+        self._stamp = _file_stamp(self.path)
+        self._maybe_save_index()
+
+    def _maybe_compact(self) -> None:
+        if self._dead > max(self.compact_min, len(self._index)):
+            self.compact()
+
+    # -------- collection API --------
+    @_synchronized
+    def load(self) -> List[Dict[str, Any]]:
+        live = self._fresh()
+        if live is not None:
+            return list(live.values())
+        if not self._index:
+            return []
+        view = self._view()
+        # One parse over all live lines lets the decoder share key
+        # strings between records instead of allocating them per line.
+        body = b",".join(view[o:o + n] for o, n in self._index.values())
+        return self.codec.loads(b"[" + body + b"]")
+
+    @_synchronized
+    def save(self, items: List[Dict[str, Any]]) -> None:
+        lines: Dict[str, bytes] = {}
+        for it in items:
+            rid = it.get(self.key)
+            if not isinstance(rid, str):
+                msg = "[ERROR] Skipping {} record without {}: {}".format(
+                    self.label, self.key, it
+                )
+                print(msg)
+                continue
+            lines[rid] = self.codec.dumps_line(it)
+        index: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        for rid, data in lines.items():
+            index[rid] = (offset, len(data))
+            offset += len(data)
+        payload = b"".join(lines.values())
+        # Unmap first: some platforms refuse to replace a mapped file.
+        self._unmap()
+        _replace_file(self.path, payload)
+        self._index = index
+        self._dead = 0
+        self._covered = offset
+        self._tail = payload[-_TAIL_BYTES:]
+        self._tried_index = True
+        st = os.stat(self.path)
+        self._ino = st.st_ino
+        self._stamp = (st.st_size, st.st_mtime_ns)
+        self._save_index()
+
+    @_synchronized
+    def get(self, rid: str) -> Optional[Dict[str, Any]]:
+        self._fresh()
+        pos = self._index.get(rid)
+        if pos is None:
+            return None
+        rec = self._read_at(pos)
+        if rec is None or rec.get(self.key) != rid:
+            # The file was rewritten in place behind our back.
+            self._scan()
+            pos = self._index.get(rid)
+            rec = self._read_at(pos) if pos is not None else None
+            if rec is not None and rec.get(self.key) != rid:
+                return None
+        return rec
+
+    @_synchronized
+    def ids(self) -> List[str]:
+        """Live ids, from the offset index without decoding records."""
+        self._fresh()
+        return list(self._index)
+
+    @_synchronized
+    def put(self, items: List[Dict[str, Any]]) -> None:
+        self._fresh()
+        lines = []
+        for it in items:
+            rid = it[self.key]
+            if rid in self._index:
+                self._dead += 1
+            lines.append((rid, self.codec.dumps_line(it)))
+        if lines:
+            self._append(lines)
+            self._maybe_compact()
+
+    @_synchronized
+    def remove(self, ids: Iterable[str]) -> int:
+        self._fresh()
+        gone = [rid for rid in dict.fromkeys(ids) if rid in self._index]
+        if not gone:
+            return 0
+        dumps = self.codec.dumps_line
+        self._append([(None, dumps({_TOMBSTONE: rid})) for rid in gone])
+        for rid in gone:
+            del self._index[rid]
+        self._dead += 2 * len(gone)
+        self._maybe_compact()
+        return len(gone)
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        return _file_stamp(self.path)
+
+    @_synchronized
+    def compact(self) -> None:
+        """Rewrite the file with only the latest line of each live id."""
+        self._fresh()
+        if self._dead:
+            self.save(self.load())
+
+    @_synchronized
+    def close(self) -> None:
+        """Persist the offset index and unmap the file.
+
+        The log stays usable; the next call maps the file again.
+        """
+        if self._covered != self._persisted:
+            self._save_index()
+        self._unmap()
+
+
+class _BlockLog:
+    """A record log stored as independently compressed blocks.
+
+    Every put/remove appends one block with the dirty records (or
+    tombstones); save() and compact() repack live records into blocks of
+    ``block_records``. The block index holds the (offset, length) of each
+    block and the block number of each live id, so a lookup decompresses
+    one block and a scan holds only one block in memory. Like the
+    "lines" offset index it is persisted next to the file
+    (``<path>.idx``), so a new process decompresses only the blocks
+    appended since it was written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str,
+        label: str,
+        codec: StdlibCodec,
+        compression: str = "zlib",
+        block_records: int = 1000,
+        compact_min: int = 1024,
+    ) -> None:
+        self.path = path
+        self.index_path = path + ".idx"
+        self.key = key
+        self.label = label
+        self.codec = codec
+        # Makes each collection call atomic for concurrent callers.
+        self.lock = threading.RLock()
+        self._compress, self._decompress = BLOCK_COMPRESSION[compression]
+        self.block_records = block_records
+        self.compact_min = compact_min
+        self._blocks: List[Tuple[int, int]] = []
+        self._where: Dict[str, int] = {}
+        self._dead = 0
+        self._stamp: Optional[Tuple[int, int]] = None
+        # File bytes the index covers, the last few of those bytes and
+        # the file's inode, as for the "lines" layout.
+        self._covered = 0
+        self._tail = b""
+        self._ino: Optional[int] = None
+        # File bytes and blocks covered by the index on disk.
+        self._persisted = 0
+        self._persisted_blocks = 0
+        self._tried_index = False
+        # Most recently decoded block for lookups: (block no, records).
+        self._cache: Optional[Tuple[int, Dict[str, Dict[str, Any]]]] = None
+
+    # -------- block index maintenance --------
+    def _fresh(self, live: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
+        """Bring the block index up to date with the file.
+
+        Blocks appended since the index was built are decoded; any other
+        change rescans the file. Returns True after a full rescan, which
+        fills ``live`` (if given) with the live records.
+        """
+        if _file_stamp(self.path) == self._stamp:
+            return False
+        if not self._tried_index:
+            self._tried_index = True
+            self._load_index()
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._scan(live)
+            return True
+        except OSError as exc:
+            msg = "Failed reading {}: {}".format(self.path, exc)
+            raise StorageError(msg) from exc
+        if (
+            st.st_ino == self._ino
+            and st.st_size >= self._covered
+            and _tail_matches(self.path, self._covered, self._tail)
+        ):
+            self._index_from(self._covered, None)
+            self._maybe_save_index()
+            return False
+        self._scan(live)
+        return True
+
+    def _scan(self, live: Optional[Dict[str, Dict[str, Any]]]) -> None:
+        """Rebuild the block index from the whole file.
+
+        Blocks are decoded one at a time; records are kept only in
+        ``live``, when the caller wants them.
+        """
+        self._blocks = []
+        self._where = {}
+        self._dead = 0
+        self._covered = 0
+        self._tail = b""
+        self._cache = None
+        self._index_from(0, live)
+        self._save_index()
+
+    def _index_from(
+        self, offset: int, live: Optional[Dict[str, Dict[str, Any]]]
+    ) -> None:
+        """Index the blocks from byte ``offset`` to the end of the file."""
+        pos = offset
+        tail = self._tail
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                while True:
+                    head = f.read(_FRAME.size)
+                    if len(head) < _FRAME.size:
+                        break
+                    (size,) = _FRAME.unpack(head)
+                    data = f.read(size)
+                    if len(data) < size:
+                        msg = "[ERROR] Truncated block in {} at byte {}"
+                        print(msg.format(self.path, pos + _FRAME.size))
+                        break
+                    pos += _FRAME.size
+                    self._index_block(self._decode(data, pos), live)
+                    self._blocks.append((pos, size))
+                    pos += size
+                    tail = (tail + head + data)[-_TAIL_BYTES:]
+                ino = os.fstat(f.fileno()).st_ino
+        except FileNotFoundError:
+            ino = None
+        except OSError as exc:
+            msg = "Failed reading {}: {}".format(self.path, exc)
+            raise StorageError(msg) from exc
+        self._ino = ino
+        self._covered = pos
+        self._tail = tail
+        self._stamp = _file_stamp(self.path)
+
+    def _index_block(
+        self,
+        recs: List[Dict[str, Any]],
+        live: Optional[Dict[str, Dict[str, Any]]],
+    ) -> None:
+        """Apply the records of the next block to the index."""
+        b = len(self._blocks)
+        where = self._where
+        dead = 0
+        for rec in recs:
+            if _TOMBSTONE in rec:
+                rid = rec[_TOMBSTONE]
+                dead += 1 if where.pop(rid, None) is None else 2
+                if live is not None:
+                    live.pop(rid, None)
+            else:
+                rid = rec[self.key]
+                if rid in where:
+                    dead += 1
+                where[rid] = b
+                if live is not None:
+                    live[rid] = rec
+        self._dead += dead
+
+    def _decode(self, data: bytes, offset: int) -> List[Dict[str, Any]]:
+        """Decompress one block into its valid records."""
+        try:
+            payload = self._decompress(data)
+            # Encoded lines never contain a raw newline inside a value.
+            recs = self.codec.loads(
+                b"[" + payload.rstrip(b"\n").replace(b"\n", b",") + b"]"
+            )
+        except _CORRUPT as exc:
+            msg = "[ERROR] Invalid block in {} at byte {}: {}".format(
+                self.path, offset, exc
+            )
+            print(msg)
+            return []
+        return [
+            rec
+            for rec in recs
+            if isinstance(rec, dict)
+            and (
+                isinstance(rec.get(_TOMBSTONE), str)
+                or isinstance(rec.get(self.key), str)
+            )
+        ]
+
+    # -------- persisted index --------
+    def _load_index(self) -> None:
+        """Start from the index on disk, if it is usable."""
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return
+        at = len(_BLK_MAGIC) + _BLK_HEAD.size
+        if not raw.startswith(_BLK_MAGIC) or len(raw) < at:
+            print("[ERROR] Ignoring unreadable index {}".format(
+                self.index_path))
+            return
+        ino, covered, dead, nblocks, count, n = _BLK_HEAD.unpack_from(
+            raw, len(_BLK_MAGIC)
+        )
+        tail = raw[at:at + n]
+        at += n
+        pos = array("q")
+        pos.frombytes(raw[at:at + 16 * nblocks])
+        at += 16 * nblocks
+        nums = array("q")
+        nums.frombytes(raw[at:at + 8 * count])
+        at += 8 * count
+        try:
+            keys = raw[at:].decode("utf-8").split("\n") if count else []
+        except UnicodeDecodeError:
+            keys = []
+        if (
+            len(tail) != n
+            or len(pos) != 2 * nblocks
+            or len(nums) != count
+            or len(keys) != count
+            or any(not 0 <= b < nblocks for b in nums)
+        ):
+            print("[ERROR] Ignoring unreadable index {}".format(
+                self.index_path))
+            return
+        vals = pos.tolist()
+        self._blocks = list(zip(vals[0::2], vals[1::2]))
+        self._where = dict(zip(keys, nums.tolist()))
+        self._ino, self._covered, self._dead = ino, covered, dead
+        self._tail = tail
+        self._persisted = covered
+        self._persisted_blocks = nblocks
+
+    def _save_index(self) -> None:
+        if self._ino is None:
+            return
+        keys = "\n".join(self._where).encode("utf-8")
+        if keys.count(b"\n") != max(len(self._where) - 1, 0):
+            return  # an id holds a newline; rely on scans instead
+        pos = array("q", itertools.chain.from_iterable(self._blocks))
+        _replace_file(self.index_path, b"".join((
+            _BLK_MAGIC,
+            _BLK_HEAD.pack(self._ino, self._covered, self._dead,
+                           len(self._blocks), len(self._where),
+                           len(self._tail)),
+            self._tail,
+            pos.tobytes(),
+            array("q", self._where.values()).tobytes(),
+            keys,
+        )))
+        self._persisted = self._covered
+        self._persisted_blocks = len(self._blocks)
+
+    def _maybe_save_index(self) -> None:
+        # As for the "lines" layout, the O(ids) rewrite is amortized;
+        # it is also due once many (small) blocks are unindexed, since
+        # each of those costs a reopen a decompression.
+        lag = self._covered - self._persisted
+        behind = len(self._blocks) - self._persisted_blocks
+        if lag > max(_INDEX_SLACK, self._persisted // 4) or behind > max(
+            _BLOCK_SLACK, self._persisted_blocks // 4
+        ):
+            self._save_index()
+
+    def _encode(self, recs: Iterable[Dict[str, Any]]) -> bytes:
+        data = self._compress(
+            b"".join(self.codec.dumps_line(rec) for rec in recs)
+        )
+        return _FRAME.pack(len(data)) + data
+
+    def _append(self, recs: List[Dict[str, Any]]) -> int:
+        """Append one block and return its block number.
+
+        Bytes past the last complete block (a frame cut short by a
+        crash) are dropped first: its length header would otherwise
+        swallow the new block. Callers bring the index up to date first.
+        """
+        frame = self._encode(recs)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                if offset > self._covered:
+                    f.truncate(self._covered)
+                    offset = self._covered
+                f.write(frame)
+                if self._ino is None:
+                    self._ino = os.fstat(f.fileno()).st_ino
+        except OSError as exc:
+            msg = "Failed writing {}: {}".format(self.path, exc)
+            raise StorageError(msg) from exc
+        self._blocks.append((offset + _FRAME.size, len(frame) - _FRAME.size))
+        self._covered = offset + len(frame)
+        self._tail = (self._tail + frame)[-_TAIL_BYTES:]
+        self._stamp = _file_stamp(self.path)
+        return len(self._blocks) - 1
+
+    def _maybe_compact(self) -> None:
+        if self._dead > max(self.compact_min, len(self._where)):
+            self.compact()
+
+    # -------- collection API --------
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Stream the live records, decompressing one block at a time.
+
+        The block index is snapshotted and the file opened under the
+        lock; later writes (or a compaction replacing the file) do not
+        affect a scan already in progress. Without a usable persisted
+        index the blocks are decoded twice: once to rebuild the index,
+        then while streaming; no more than one block is held at a time.
+        """
+        with self.lock:
+            self._fresh()
+            blocks, where = list(self._blocks), dict(self._where)
+            try:
+                f = open(self.path, "rb")  # pylint: disable=R1732
+            except FileNotFoundError:
+                return
+            except OSError as exc:
+                msg = "Failed reading {}: {}".format(self.path, exc)
+                raise StorageError(msg) from exc
+        try:
+            with f:
+                for b, (off, size) in enumerate(blocks):
+                    f.seek(off)
+                    for rec in self._decode(f.read(size), off):
+                        rid = rec.get(self.key)
+                        if rid is not None and where.get(rid) == b:
+                            yield rec
+        except OSError as exc:
+            msg = "Failed reading {}: {}".format(self.path, exc)
+            raise StorageError(msg) from exc
+
+    @_synchronized
+    def load(self) -> List[Dict[str, Any]]:
+        live: Dict[str, Dict[str, Any]] = {}
+        if self._fresh(live):
+            # A rescan decoded every block anyway; reuse its result.
+            return list(live.values())
+        return list(self.iter_records())
+
+    @_synchronized
+    def save(self, items: List[Dict[str, Any]]) -> None:
+        live: Dict[str, Dict[str, Any]] = {}
+        for it in items:
+            rid = it.get(self.key)
+            if not isinstance(rid, str):
+                msg = "[ERROR] Skipping {} record without {}: {}".format(
+                    self.label, self.key, it
+                )
+                print(msg)
+                continue
+            live[rid] = it
+        recs = list(live.values())
+        frames: List[bytes] = []
+        blocks: List[Tuple[int, int]] = []
+        where: Dict[str, int] = {}
+        offset = 0
+        for start in range(0, len(recs), self.block_records):
+            chunk = recs[start:start + self.block_records]
+            frame = self._encode(chunk)
+            for rec in chunk:
+                where[rec[self.key]] = len(blocks)
+            blocks.append((offset + _FRAME.size, len(frame) - _FRAME.size))
+            frames.append(frame)
+            offset += len(frame)
+        payload = b"".join(frames)
+        _replace_file(self.path, payload)
+        self._blocks = blocks
+        self._where = where
+        self._dead = 0
+        self._cache = None
+        self._covered = offset
+        self._tail = payload[-_TAIL_BYTES:]
+        self._tried_index = True
+        st = os.stat(self.path)
+        self._ino = st.st_ino
+        self._stamp = (st.st_size, st.st_mtime_ns)
+        self._save_index()
+
+    @_synchronized
+    def get(self, rid: str) -> Optional[Dict[str, Any]]:
+        self._fresh()
+        b = self._where.get(rid)
+        if b is None:
+            return None
+        if self._cache is None or self._cache[0] != b:
+            off, size = self._blocks[b]
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(off)
+                    data = f.read(size)
+            except OSError as exc:
+                msg = "Failed reading {}: {}".format(self.path, exc)
+                raise StorageError(msg) from exc
+            recs = {
+                rec[self.key]: rec
+                for rec in self._decode(data, off)
+                if _TOMBSTONE not in rec
+            }
+            self._cache = (b, recs)
+        return self._cache[1].get(rid)
+
+    @_synchronized
+    def ids(self) -> List[str]:
+        """Live ids, from the block index without decompressing."""
+        self._fresh()
+        return list(self._where)
+
+    @_synchronized
+    def put(self, items: List[Dict[str, Any]]) -> None:
+        self._fresh()
+        dirty = {it[self.key]: it for it in items}
+        if not dirty:
+            return
+        self._dead += sum(1 for rid in dirty if rid in self._where)
+        b = self._append(list(dirty.values()))
+        for rid in dirty:
+            self._where[rid] = b
+        self._maybe_save_index()
+        self._maybe_compact()
+
+    @_synchronized
+    def remove(self, ids: Iterable[str]) -> int:
+        self._fresh()
+        gone = [rid for rid in dict.fromkeys(ids) if rid in self._where]
+        if not gone:
+            return 0
+        self._append([{_TOMBSTONE: rid} for rid in gone])
+        for rid in gone:
+            del self._where[rid]
+        self._dead += 2 * len(gone)
+        self._maybe_save_index()
+        self._maybe_compact()
+        return len(gone)
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        return _file_stamp(self.path)
+
+    @_synchronized
+    def compact(self) -> None:
+        """Repack the live records into full blocks."""
+        self._fresh()
+        needed = -(-len(self._where) // self.block_records)
+        if self._dead or len(self._blocks) > needed:
+            self.save(self.load())
+
+    @_synchronized
+    def close(self) -> None:
+        """Persist the block index if it lags and drop the cached block.
+
+        The log stays usable; the next call reads from disk again.
+        """
+        if self._covered != self._persisted:
+            self._save_index()
+        self._cache = None
+
+
+# Archive partition granularity -> length of the check_out prefix.
+ARCHIVE_PARTITIONS = {"month": 7, "year": 4}
+
+
+class _ColdArchive:
+    """Append-only reservation partitions keyed by check-out period.
+
+    ``reservations-<key>.jsonl`` holds the stays whose check_out, in
+    YYYY-MM-DD form, starts with ``key`` (``YYYY-MM`` or ``YYYY``).
+    ``meta.json`` records the cutoff: every stay checking out before it
+    has been archived.
+    """
+
+    _PREFIX = "reservations-"
+    _SUFFIX = ".jsonl"
+
+    def __init__(
+        self, directory: str, codec: StdlibCodec, by: str = "month"
+    ) -> None:
+        self.directory = directory
+        self.codec = codec
+        self.key_len = ARCHIVE_PARTITIONS[by]
+        self.lock = threading.RLock()
+        # (meta.json stamp, cutoff): bookings check the cutoff often.
+        self._cutoff: Tuple[object, Optional[str]] = (None, None)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(
+            self.directory, self._PREFIX + key + self._SUFFIX
+        )
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    @_synchronized
+    def cutoff(self) -> Optional[str]:
+        stamp = _file_stamp(self._meta_path())
+        if stamp is None:
+            return None
+        if self._cutoff[0] != stamp:
+            meta = _read_json_safe(self._meta_path(), self.codec)
+            value = meta.get("cutoff") if isinstance(meta, dict) else None
+            try:
+                value = iso_day(iso_ordinal(value))
+            except (TypeError, ValueError):
+                value = None
+            self._cutoff = (stamp, value)
+        return self._cutoff[1]
+
+    @_synchronized
+    def partitions(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        except OSError as exc:
+            msg = "Failed reading {}: {}".format(self.directory, exc)
+            raise StorageError(msg) from exc
+        return sorted(
+            n[len(self._PREFIX):-len(self._SUFFIX)]
+            for n in names
+            if n.startswith(self._PREFIX) and n.endswith(self._SUFFIX)
+        )
+
+    @_synchronized
+    def append(self, items: List[Dict[str, Any]], cutoff: str) -> None:
+        """Append ``items`` to their partitions and raise the cutoff.
+
+        ``cutoff`` and the items' check_out must be valid ISO dates. A
+        torn last line, left by an interrupted run, is closed with a
+        newline first, so it stays a (skipped) line of its own.
+        """
+        cutoff = iso_day(iso_ordinal(cutoff))
+        groups: Dict[str, List[bytes]] = {}
+        for it in items:
+            key = iso_day(iso_ordinal(it["check_out"]))[:self.key_len]
+            groups.setdefault(key, []).append(self.codec.dumps_line(it))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for key, lines in groups.items():
+                with open(self._path(key), "a+b") as f:
+                    if _ends_mid_line(f):
+                        lines.insert(0, b"\n")
+                    f.seek(0, os.SEEK_END)
+                    f.write(b"".join(lines))
+        except OSError as exc:
+            msg = "Failed writing {}: {}".format(self.directory, exc)
+            raise StorageError(msg) from exc
+        current = self.cutoff()
+        if current is None or iso_ordinal(cutoff) > iso_ordinal(current):
+            _write_json_safe(
+                self._meta_path(), {"cutoff": cutoff}, self.codec
+            )
+            self._cutoff = (_file_stamp(self._meta_path()), cutoff)
+
+    def iter_records(
+        self, first: Optional[str] = None, last: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream archived stays, skipping partitions that cannot hold a
+        check_out in [first, last] (either bound may be omitted).
+
+        Bounds must be valid ISO dates; they are compared in YYYY-MM-DD
+        form, like the partition keys.
+        """
+        if first is not None:
+            first = iso_day(iso_ordinal(first))
+        if last is not None:
+            last = iso_day(iso_ordinal(last))
+        for key in self.partitions():
+            n = len(key)
+            if first is not None and key < first[:n]:
+                continue
+            if last is not None and key > last[:n]:
+                continue
+            path = self._path(key)
+            try:
+                with self.lock, open(path, "rb") as f:
+                    lines = f.readlines()
+            except OSError as exc:
+                msg = "Failed reading {}: {}".format(path, exc)
+                raise StorageError(msg) from exc
+            for offset, line in enumerate(lines):
+                if not line.strip():
+                    continue
+                try:
+                    rec = self.codec.loads(line)
+                except ValueError as exc:
+                    msg = "[ERROR] Invalid JSON in {} line {}: {}".format(
+                        path, offset + 1, exc
+                    )
+                    print(msg)
+                    continue
+                if isinstance(rec, dict):
+                    yield rec
+
+
 @dataclass(frozen=True, slots=True)
 class StorePaths:
-    """Paths for JSON storage files."""
+    """Paths for JSON storage files.
+
+    ``archive`` is the directory of the cold reservation archive, if
+    the store has one.
+    """
     hotels: str
     customers: str
     reservations: str
+    archive: Optional[str] = None
+
+
+_EXTENSIONS = {"array": ".json", "lines": ".jsonl", "blocks": ".blk"}
+
+
+def paths_in(directory: str, layout: str = "array") -> StorePaths:
+    """Return the conventional file names for a store rooted at a dir."""
+    ext = _EXTENSIONS[layout]
+    return StorePaths(
+        hotels=os.path.join(directory, "hotels" + ext),
+        customers=os.path.join(directory, "customers" + ext),
+        reservations=os.path.join(directory, "reservations" + ext),
+        archive=os.path.join(directory, "archive"),
+    )
 
 
 class JsonStore:
-    """Simple JSON store: each file is a list of dict records."""
+    """Simple JSON store: each file is a collection of dict records.
 
-    def __init__(self, paths: StorePaths) -> None:
+    ``layout`` selects the on-disk format (see module docstring) and
+    ``codec`` the JSON encoder (default: ``get_codec()``).
+    ``compression`` names the block compressor of the "blocks" layout
+    (see ``BLOCK_COMPRESSION``). ``archive_by`` picks one archive
+    partition per check-out "month" or "year". The
+    ``put_*``/``remove_*`` methods persist only the records they are
+    given; ``save_*`` replaces a whole collection.
+    """
+
+    def __init__(
+        self,
+        paths: StorePaths,
+        layout: str = "array",
+        codec: Optional[StdlibCodec] = None,
+        compression: str = "zlib",
+        archive_by: str = "month",
+    ) -> None:
+        if layout not in LAYOUTS:
+            raise ValueError("Unknown storage layout: {}".format(layout))
+        if compression not in BLOCK_COMPRESSION:
+            raise ValueError("Unknown compression: {}".format(compression))
+        if archive_by not in ARCHIVE_PARTITIONS:
+            raise ValueError(
+                "Unknown archive partitioning: {}".format(archive_by)
+            )
+        if layout == "lines" and any(
+            _file_compression(p) for p in (
+                paths.hotels, paths.customers, paths.reservations
+            )
+        ):
+            raise ValueError(
+                "Compressed files need the 'array' or 'blocks' layout."
+            )
         self._p = paths
+        self.layout = layout
+        self.codec = codec or _DEFAULT_CODEC
+        self._hotels = self._collection(
+            paths.hotels, "hotel_id", "Hotels", compression
+        )
+        self._customers = self._collection(
+            paths.customers, "customer_id", "Customers", compression
+        )
+        self._reservations = self._collection(
+            paths.reservations, "resv_id", "Reservations", compression
+        )
+        self._archive = (
+            _ColdArchive(paths.archive, self.codec, archive_by)
+            if paths.archive
+            else None
+        )
+
+    def _collection(
+        self, path: str, key: str, label: str, compression: str
+    ) -> Any:
+        if self.layout == "array":
+            return _ArrayFile(path, key, label, self.codec)
+        if self.layout == "lines":
+            return _LineLog(path, key, label, self.codec)
+        return _BlockLog(path, key, label, self.codec, compression)
+
+    def compact(self) -> None:
+        """Reclaim space held by superseded or deleted records."""
+        self._hotels.compact()
+        self._customers.compact()
+        self._reservations.compact()
 
+    def close(self) -> None:
+        """Flush index state to disk and release mapped files.
+
+        Writes are persisted as they happen, so this only saves what
+        makes the next open fast. The store stays usable afterwards.
+        """
+        self._hotels.close()
+        self._customers.close()
+        self._reservations.close()
+
+    # -------- Hotels --------
     def load_hotels(self) -> List[Dict[str, Any]]:
-        data = _read_json_safe(self._p.hotels)
-        if isinstance(data, list):
-            return [x for x in data if isinstance(x, dict)]
-        msg = "[ERROR] Hotels file must be a JSON array. Got: {}".format(
-            type(data).__name__
-        )
-        print(msg)
-        return []
+        return self._hotels.load()
 
     def save_hotels(self, items: List[Dict[str, Any]]) -> None:
-        _write_json_safe(self._p.hotels, items)
+        self._hotels.save(items)
+
+    def get_hotel(self, hotel_id: str) -> Optional[Dict[str, Any]]:
+        return self._hotels.get(hotel_id)
+
+    def hotel_ids(self) -> List[str]:
+        return self._hotels.ids()
+
+    def hotels_stamp(self) -> Optional[Tuple[int, int]]:
+        """Token that changes whenever the hotels file changes."""
+        return self._hotels.stamp()
 
+    def put_hotels(self, items: List[Dict[str, Any]]) -> None:
+        self._hotels.put(items)
+
+    def remove_hotels(self, ids: Iterable[str]) -> int:
+        return self._hotels.remove(ids)
+
+    # -------- Customers --------
     def load_customers(self) -> List[Dict[str, Any]]:
-        data = _read_json_safe(self._p.customers)
-        if isinstance(data, list):
-            return [x for x in data if isinstance(x, dict)]
-        msg = "[ERROR] Customers file must be a JSON array. Got: {}".format(
-            type(data).__name__
-        )
-        print(msg)
-        return []
+        return self._customers.load()
 
     def save_customers(self, items: List[Dict[str, Any]]) -> None:
-        _write_json_safe(self._p.customers, items)
+        self._customers.save(items)
+
+    def get_customer(self, customer_id: str) -> Optional[Dict[str, Any]]:
+        return self._customers.get(customer_id)
+
+    def customer_ids(self) -> List[str]:
+        return self._customers.ids()
+
+    def put_customers(self, items: List[Dict[str, Any]]) -> None:
+        self._customers.put(items)
+
+    def remove_customers(self, ids: Iterable[str]) -> int:
+        return self._customers.remove(ids)
+
+    def customers_stamp(self) -> Optional[Tuple[int, int]]:
+        """Token that changes whenever the customers file changes."""
+        return self._customers.stamp()
+
+    # -------- Reservations --------
+    def reservations_stamp(self) -> Optional[Tuple[int, int]]:
+        """Token that changes whenever the reservations file changes."""
+        return self._reservations.stamp()
 
     def load_reservations(self) -> List[Dict[str, Any]]:
-        data = _read_json_safe(self._p.reservations)
-        if isinstance(data, list):
-            return [x for x in data if isinstance(x, dict)]
-        msg = "[ERROR] Reservations file must be a JSON array. Got: {}".format(
-            type(data).__name__
-        )
-        print(msg)
-        return []
+        return self._reservations.load()
+
+    def iter_reservations(self) -> Iterator[Dict[str, Any]]:
+        """Stream reservations; the "blocks" layout decodes lazily."""
+        if isinstance(self._reservations, _BlockLog):
+            return self._reservations.iter_records()
+        return iter(self._reservations.load())
+
+    def load_reservation_rows(self) -> List[ReservationRow]:
+        """Load reservations as compact rows with interned strings."""
+        rows: List[ReservationRow] = []
+        for it in self.iter_reservations():
+            try:
+                rows.append(ReservationRow.from_dict(it))
+            except ValidationError as exc:
+                msg = "[ERROR] Skip reservation record: {} ({})".format(
+                    it, exc
+                )
+                print(msg)
+        return rows
 
     def save_reservations(self, items: List[Dict[str, Any]]) -> None:
-        _write_json_safe(self._p.reservations, items)
+        self._reservations.save(items)
+
+    def get_reservation(self, resv_id: str) -> Optional[Dict[str, Any]]:
+        return self._reservations.get(resv_id)
+
+    def reservation_ids(self) -> List[str]:
+        return self._reservations.ids()
+
+    def put_reservations(self, items: List[Dict[str, Any]]) -> None:
+        self._reservations.put(items)
+
+    def remove_reservations(self, ids: Iterable[str]) -> int:
+        return self._reservations.remove(ids)
+
+    # -------- Reservation archive --------
+    def _cold(self) -> _ColdArchive:
+        if self._archive is None:
+            raise StorageError("This store has no archive directory.")
+        return self._archive
+
+    def archive_cutoff(self) -> Optional[str]:
+        """Date before which every check-out has been archived."""
+        return self._archive.cutoff() if self._archive else None
+
+    def append_archive(
+        self, items: List[Dict[str, Any]], cutoff: str
+    ) -> None:
+        """Copy reservations into the archive; the caller removes them
+        from the hot collection afterwards."""
+        self._cold().append(items, cutoff)
+
+    def iter_archived_reservations(
+        self, first: Optional[str] = None, last: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream archived reservations, reading only the partitions
+        that can hold a check_out in [first, last]."""
+        if self._archive is None:
+            return iter(())
+        return self._archive.iter_records(first, last)
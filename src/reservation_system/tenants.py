@@ -0,0 +1,242 @@
+"""Registry of per-tenant stores and services for one process.
+
+Each tenant (an independent property group) has its own data directory
+``<root>/<tenant>``. The registry opens a tenant's ``JsonStore`` and
+``ReservationService`` on first use and keeps recently used tenants
+open, up to ``max_tenants`` of them and, optionally, ``max_bytes`` of
+estimated memory. Past either budget the least recently used tenant is
+closed. All tenants share one codec and one worker thread pool.
+
+A tenant is pinned while a caller uses it (``tenant()`` or
+``submit()``) and is never evicted then, so two services never work on
+the same files at once.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional
+
+from .exceptions import ValidationError
+from .service import ReservationService
+from .storage import (
+    LAYOUTS,
+    JsonStore,
+    StdlibCodec,
+    StorePaths,
+    get_codec,
+    paths_in,
+)
+
+
+@dataclass(slots=True)
+class _Tenant:
+    service: ReservationService
+    paths: StorePaths
+    # Estimated memory in bytes, refreshed whenever the tenant is idle.
+    size: int = 0
+    pins: int = 0
+
+
+def _data_size(paths: StorePaths) -> int:
+    """Bytes in a tenant's data files.
+
+    The offset and occupancy indexes a tenant builds grow with its
+    data, so this is the estimate of what it keeps in memory.
+    """
+    total = 0
+    for path in (paths.hotels, paths.customers, paths.reservations):
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+class TenantRegistry:
+    """Lazily opened tenants under a count and memory budget.
+
+    ``max_bytes`` (None: no limit) bounds the summed size estimates of
+    the open tenants; at least the tenant in use is always kept open.
+    ``workers`` sizes the shared pool used by ``submit``.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        layout: str = "lines",
+        max_tenants: int = 256,
+        max_bytes: Optional[int] = None,
+        thread_safe: bool = True,
+        codec: Optional[StdlibCodec] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        if layout not in LAYOUTS:
+            raise ValueError("Unknown storage layout: {}".format(layout))
+        if max_tenants < 1:
+            raise ValueError("max_tenants must be >= 1.")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0.")
+        self.root = root
+        self.layout = layout
+        self.max_tenants = max_tenants
+        self.max_bytes = max_bytes
+        self.thread_safe = thread_safe
+        self.codec = codec or get_codec()
+        self.workers = workers
+        # Least recently used first.
+        self._open: "OrderedDict[str, _Tenant]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._open
+
+    def __enter__(self) -> "TenantRegistry":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def open_bytes(self) -> int:
+        """Summed size estimate of the open tenants."""
+        return self._bytes
+
+    # -------- access --------
+    @contextmanager
+    def tenant(self, name: str) -> Iterator[ReservationService]:
+        """The tenant's service, pinned for the duration of the block."""
+        entry = self._acquire(name)
+        try:
+            yield entry.service
+        finally:
+            self._release(name, entry)
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> "Future[Any]":
+        """Run ``fn(service, *args, **kwargs)`` on the shared pool."""
+        self._check_name(name)
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="tenant",
+                )
+            pool = self._pool
+
+        def run() -> Any:
+            with self.tenant(name) as svc:
+                return fn(svc, *args, **kwargs)
+
+        return pool.submit(run)
+
+    def evict(self, name: str) -> bool:
+        """Close an idle tenant now; False if it is not open or busy."""
+        with self._lock:
+            entry = self._open.get(name)
+            if entry is None or entry.pins:
+                return False
+            self._drop(name, entry)
+            self.evictions += 1
+        self._close([entry])
+        return True
+
+    def close(self) -> None:
+        """Wait for submitted work, then close every open tenant."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        with self._lock:
+            idle = [(n, e) for n, e in self._open.items() if not e.pins]
+            for name, entry in idle:
+                self._drop(name, entry)
+        self._close([entry for _, entry in idle])
+
+    # -------- internals --------
+    def _check_name(self, name: str) -> None:
+        if (
+            not isinstance(name, str)
+            or not name.strip()
+            or name in (".", "..")
+            or os.sep in name
+            or (os.altsep is not None and os.altsep in name)
+        ):
+            raise ValidationError(
+                "Tenant name must be a plain directory name."
+            )
+
+    def _acquire(self, name: str) -> _Tenant:
+        self._check_name(name)
+        with self._lock:
+            entry = self._open.get(name)
+            if entry is None:
+                entry = self._load(name)
+                self._open[name] = entry
+                self._bytes += entry.size
+            else:
+                self._open.move_to_end(name)
+            entry.pins += 1
+            victims = self._over_budget()
+        self._close(victims)
+        return entry
+
+    def _release(self, name: str, entry: _Tenant) -> None:
+        with self._lock:
+            entry.pins -= 1
+            victims: List[_Tenant] = []
+            if not entry.pins and self._open.get(name) is entry:
+                size = _data_size(entry.paths)
+                self._bytes += size - entry.size
+                entry.size = size
+                victims = self._over_budget()
+        self._close(victims)
+
+    def _load(self, name: str) -> _Tenant:
+        paths = paths_in(os.path.join(self.root, name), self.layout)
+        store = JsonStore(paths, layout=self.layout, codec=self.codec)
+        svc = ReservationService(store=store, thread_safe=self.thread_safe)
+        return _Tenant(svc, paths, _data_size(paths))
+
+    def _over_budget(self) -> List[_Tenant]:
+        """Unlink idle tenants, oldest first, until within budget.
+
+        Runs under the registry lock; the caller closes the returned
+        tenants after releasing it.
+        """
+        victims: List[_Tenant] = []
+        for name in list(self._open):
+            if len(self._open) <= self.max_tenants and (
+                self.max_bytes is None or self._bytes <= self.max_bytes
+            ):
+                break
+            entry = self._open[name]
+            if not entry.pins:
+                self._drop(name, entry)
+                self.evictions += 1
+                victims.append(entry)
+        return victims
+
+    def _drop(self, name: str, entry: _Tenant) -> None:
+        del self._open[name]
+        self._bytes -= entry.size
+
+    def _close(self, victims: List[_Tenant]) -> None:
+        for entry in victims:
+            entry.service.store.close()
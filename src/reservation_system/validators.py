@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 from datetime import date
+from functools import lru_cache
 
 from .exceptions import ValidationError
 
+# Distinct dates a process sees are few (about 365 per year of
+# bookings), so a small cache catches nearly every parse.
+_DATE_CACHE_SIZE = 8192
+
 
 def req_str(val: str, field: str) -> str:
     """Require a non-empty string."""
@@ -21,13 +26,34 @@ def req_pos_int(val: int, field: str) -> int:
     return val
 
 
-def req_iso_date(val: str, field: str) -> str:
-    """Require an ISO date string (YYYY-MM-DD)."""
+@lru_cache(maxsize=_DATE_CACHE_SIZE)
+def iso_ordinal(val: str) -> int:
+    """Day ordinal of an ISO date string, memoized.
+
+    Raises ValueError for malformed dates (those are not cached).
+    Equal strings map to the same int object, so rows holding the
+    ordinals of a date share it.
+    """
+    return date.fromisoformat(val).toordinal()
+
+
+def iso_day(ordinal: int) -> str:
+    """ISO date string (YYYY-MM-DD) of a day ordinal."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+def req_iso_ordinal(val: str, field: str) -> int:
+    """Require an ISO date string (YYYY-MM-DD); return its day ordinal."""
     if not isinstance(val, str):
         raise ValidationError(f"{field} must be an ISO date string.")
     try:
-        date.fromisoformat(val)
+        return iso_ordinal(val)
     except ValueError as exc:
         msg = "{field} must be ISO format YYYY-MM-DD.".format(field=field)
         raise ValidationError(msg) from exc
+
+
+def req_iso_date(val: str, field: str) -> str:
+    """Require an ISO date string (YYYY-MM-DD)."""
+    req_iso_ordinal(val, field)
     return val
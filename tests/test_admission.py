@@ -0,0 +1,119 @@
+import tempfile
+import threading
+import time
+import unittest
+from typing import Callable, List
+from unittest import mock
+
+from reservation_system.admission import CATALOG, AdmissionControl
+from reservation_system.customer import Customer
+from reservation_system.exceptions import OverloadError
+from reservation_system.hotel import Hotel
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, paths_in
+
+
+def wait_until(cond: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not cond():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+
+class TestAdmissionControl(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.svc = ReservationService(
+            store=JsonStore(paths_in(self.tmp.name)), thread_safe=True
+        )
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 3))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        self.release = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+    def tearDown(self) -> None:
+        self.release.set()
+        for t in self.threads:
+            t.join()
+        self.tmp.cleanup()
+
+    def start(self, fn: Callable[[], object]) -> None:
+        t = threading.Thread(target=fn)
+        t.start()
+        self.threads.append(t)
+
+    def block(self, ctl: AdmissionControl, hotel_id: str) -> None:
+        """Occupy a slot for ``hotel_id`` until the test releases it."""
+        self.start(lambda: ctl.call(hotel_id, self.release.wait))
+        wait_until(lambda: ctl.stats().running >= 1)
+
+    def test_wraps_service_calls(self) -> None:
+        ctl = AdmissionControl(self.svc)
+        r = ctl.reserve_room("R1", "H1", "C1", "2026-07-01", "2026-07-02")
+        self.assertEqual(r.room_no, 1)
+        self.assertEqual(ctl.reserve_block("H1", "C1", "2026-07-01",
+                                           "2026-07-02", 2), [2, 3])
+        self.assertEqual(ctl.rooms_left("H1", "2026-07-01"), 0)
+        ctl.cancel_reservation("R1")
+        stats = ctl.stats()
+        self.assertEqual((stats.admitted, stats.running, stats.queued),
+                         (5, 0, 0))
+
+    def test_full_queue_fails_fast(self) -> None:
+        ctl = AdmissionControl(self.svc, max_per_hotel=1, max_queue=1,
+                               timeout=5)
+        self.block(ctl, "H1")
+        self.start(lambda: ctl.call("H1", lambda: None))
+        wait_until(lambda: ctl.stats().queued == 1)
+        self.assertEqual(ctl.stats().queue_depth, {"H1": 1})
+        t0 = time.monotonic()
+        with self.assertRaises(OverloadError):
+            ctl.call("H1", lambda: None)
+        self.assertLess(time.monotonic() - t0, 1)
+        self.release.set()
+        wait_until(lambda: ctl.stats().admitted == 2)
+        self.assertEqual(ctl.stats().rejected, 1)
+
+    def test_deadline_sheds_waiting_request(self) -> None:
+        ctl = AdmissionControl(self.svc, max_per_hotel=1, timeout=0.05)
+        self.block(ctl, "H1")
+        with self.assertRaises(OverloadError):
+            ctl.call("H1", lambda: None)
+        stats = ctl.stats()
+        self.assertEqual((stats.timed_out, stats.queued), (1, 0))
+        # Other hotels are not held up by the busy one.
+        self.assertEqual(ctl.call("H2", lambda: "ok"), "ok")
+
+    def test_global_limit_and_fifo_order(self) -> None:
+        ctl = AdmissionControl(self.svc, max_concurrent=1, timeout=5)
+        self.block(ctl, "H1")
+        with self.assertRaises(OverloadError):
+            ctl.call("H2", lambda: None, timeout=0.01)
+        order: List[int] = []
+        for i in range(3):
+            self.start(lambda i=i: ctl.call("H2", order.append, i))
+            wait_until(lambda i=i: ctl.stats().queued == i + 1)
+        self.release.set()
+        wait_until(lambda: len(order) == 3)
+        self.assertEqual(order, [0, 1, 2])
+        self.assertEqual(ctl.stats().max_queued, 3)
+
+    def test_cancel_lookup_is_admitted(self) -> None:
+        ctl = AdmissionControl(self.svc, max_per_hotel=1, max_queue=0)
+        self.block(ctl, CATALOG)
+        with mock.patch.object(self.svc.store, "get_reservation") as get:
+            with self.assertRaises(OverloadError):
+                ctl.cancel_reservation("R1")
+        get.assert_not_called()
+
+    def test_invalid_limits(self) -> None:
+        for kw in ({"max_concurrent": 0}, {"max_per_hotel": 0},
+                   {"max_queue": -1}, {"timeout": 0}):
+            with self.assertRaises(ValueError):
+                AdmissionControl(self.svc, **kw)
+
+    def test_requires_thread_safe_service(self) -> None:
+        svc = ReservationService(store=self.svc.store)
+        with self.assertRaises(ValueError):
+            AdmissionControl(svc)
@@ -0,0 +1,132 @@
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from reservation_system.changefeed import ChangeFeed
+from reservation_system.cli import main
+from reservation_system.customer import Customer
+from reservation_system.hotel import Hotel
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, paths_in
+
+
+def summary(events: list) -> list:
+    return [(e.op, e.entity, e.key) for e in events]
+
+
+class TestChangeFeed(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "changes.jsonl")
+        self.feed = ChangeFeed(self.path)
+        self.svc = ReservationService(
+            store=JsonStore(paths_in(self.tmp.name)), feed=self.feed
+        )
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_service_emits_ordered_events(self) -> None:
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 2))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        self.svc.reserve_room("R1", "H1", "C1", "2026-07-01", "2026-07-03")
+        self.svc.reserve_room("R2", "H1", "C1", "2026-07-01", "2026-07-03")
+        self.svc.update_customer("C1", name_full="B")
+        self.svc.cancel_reservation("R1")
+        self.svc.delete_hotel("H1")
+
+        events = list(self.feed.follow())
+        self.assertEqual([e.seq for e in events], list(range(1, 9)))
+        self.assertEqual(
+            summary(events),
+            [
+                ("created", "hotel", "H1"),
+                ("created", "customer", "C1"),
+                ("created", "reservation", "R1"),
+                ("created", "reservation", "R2"),
+                ("updated", "customer", "C1"),
+                ("cancelled", "reservation", "R1"),
+                ("deleted", "hotel", "H1"),
+                ("deleted", "reservation", "R2"),
+            ],
+        )
+        self.assertEqual(events[2].data["room_no"], 1)
+        self.assertEqual(events[4].data["name_full"], "B")
+        self.assertIsNone(events[5].data)
+
+    def test_failed_changes_emit_nothing(self) -> None:
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 1))
+        with self.assertRaises(Exception):
+            self.svc.create_hotel(Hotel("H1", "Again", "Nagoya", 1))
+        with self.assertRaises(Exception):
+            self.svc.cancel_reservation("R404")
+        self.assertEqual(self.feed.last_seq(), 1)
+
+    def test_resume_from_seq_and_reopen(self) -> None:
+        for i in range(50):
+            self.svc.create_customer(
+                Customer("C{}".format(i), "A", "a@x.com"))
+        self.assertEqual(
+            [e.seq for e in self.feed.follow(after=47)], [48, 49, 50]
+        )
+        self.assertEqual(list(self.feed.follow(after=50)), [])
+        # A new feed object continues the numbering from the file.
+        again = ChangeFeed(self.path)
+        self.assertEqual(again.last_seq(), 50)
+        ev = again.append([("deleted", "customer", "C0", None)])
+        self.assertEqual(ev[0].seq, 51)
+        # ...and so does the old one, noticing the outside append.
+        self.svc.create_customer(Customer("X", "A", "a@x.com"))
+        self.assertEqual(self.feed.last_seq(), 52)
+
+    def test_append_after_torn_event_keeps_new_event(self) -> None:
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 1))
+        # A crash mid-append leaves half an event with no newline.
+        with open(self.path, "ab") as f:
+            f.write(b'{"seq": 2, "op": "crea')
+        again = ChangeFeed(self.path)
+        ev = again.append([("deleted", "hotel", "H1", None)])
+        self.assertEqual(ev[0].seq, 2)
+        self.assertEqual(
+            [(e.seq, e.op) for e in again.follow(after=0)],
+            [(1, "created"), (2, "deleted")],
+        )
+
+    def test_follow_tails_new_events(self) -> None:
+        tail = self.feed.follow(poll=0.01)
+        timer = threading.Timer(
+            0.05,
+            self.svc.create_hotel,
+            args=(Hotel("H1", "Michelle Inn", "Nagoya", 1),),
+        )
+        timer.start()
+        try:
+            self.assertEqual(next(tail).key, "H1")
+        finally:
+            timer.join()
+            tail.close()
+
+    def test_archive_is_not_reported(self) -> None:
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 1))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        self.svc.reserve_room("R1", "H1", "C1", "2025-07-01", "2025-07-03")
+        self.svc.archive("2026-01-01")
+        self.assertEqual(self.feed.last_seq(), 3)
+
+    def test_cli_changes_command(self) -> None:
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 1))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        out = StringIO()
+        with redirect_stdout(out):
+            code = main(["cli", "changes", self.path, "--after", "1"])
+        self.assertEqual(code, 0)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn('"seq": 2', lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from reservation_system import integrity
+from reservation_system.cli import main
+from reservation_system.integrity import check_store
+from reservation_system.storage import JsonStore, paths_in
+
+
+def resv(resv_id: str, hotel_id: str, room_no: object, cin: str,
+         cout: str, customer_id: str = "C1") -> dict:
+    return {
+        "resv_id": resv_id,
+        "hotel_id": hotel_id,
+        "customer_id": customer_id,
+        "check_in": cin,
+        "check_out": cout,
+        "room_no": room_no,
+    }
+
+
+class TestIntegrityCheck(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JsonStore(paths_in(self.tmp.name))
+        self.store.save_hotels([
+            {"hotel_id": "H1", "name": "A", "city": "X", "rooms_total": 2},
+            {"hotel_id": "H2", "name": "B", "city": "Y", "rooms_total": 1},
+        ])
+        self.store.save_customers([
+            {"customer_id": "C1", "name_full": "A", "email": "a@x.com"},
+        ])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_clean_store(self) -> None:
+        self.store.save_reservations([
+            resv("R1", "H1", 1, "2026-07-01", "2026-07-03"),
+            resv("R2", "H1", 1, "2026-07-03", "2026-07-05"),
+            resv("R3", "H1", 2, "2026-07-01", "2026-07-05"),
+        ])
+        report = check_store(self.store)
+        self.assertTrue(report.ok)
+        self.assertEqual(report.checked, 3)
+
+    def test_detects_every_issue_kind(self) -> None:
+        self.store.save_reservations([
+            resv("R1", "H1", 1, "2026-07-01", "2026-07-10"),
+            resv("R2", "H1", 1, "2026-07-02", "2026-07-03"),
+            resv("R3", "H1", 1, "2026-07-05", "2026-07-06"),
+            resv("R4", "H1", 3, "2026-07-01", "2026-07-02"),
+            resv("R5", "GONE", 1, "2026-07-01", "2026-07-02"),
+            resv("R6", "H2", 1, "2026-07-01", "2026-07-02", "NOBODY"),
+            resv("R7", "H2", 1, "2026-07-04", "2026-07-03"),
+            resv("R8", "H2", 1, None, "2026-07-03"),
+        ])
+        report = check_store(self.store)
+        found = {(i.kind, i.resv_id) for i in report.issues}
+        self.assertEqual(found, {
+            ("double_booked", "R2"),
+            ("double_booked", "R3"),
+            ("room_out_of_range", "R4"),
+            ("orphan_hotel", "R5"),
+            ("orphan_customer", "R6"),
+            ("invalid_dates", "R7"),
+            ("invalid_record", "R8"),
+        })
+        plan = {p["resv_id"]: p["action"] for p in report.repair_plan()}
+        self.assertEqual(plan["R2"], "reassign")
+        self.assertEqual(plan["R5"], "delete")
+
+    def test_compact_dates_compare_as_days(self) -> None:
+        self.store.save_reservations([
+            resv("R1", "H1", 1, "2026-07-01", "2026-07-10"),
+            resv("R2", "H1", 1, "20260702", "20260703"),
+            resv("R3", "H1", 1, "20260711", "2026-07-12"),
+        ])
+        report = check_store(self.store)
+        self.assertEqual(
+            [(i.kind, i.resv_id, i.other) for i in report.issues],
+            [("double_booked", "R2", "R1")],
+        )
+
+    def test_parallel_matches_serial(self) -> None:
+        rows = []
+        for h in ("H1", "H2"):
+            for i in range(20):
+                rows.append(resv("{}-{}".format(h, i), h, 1,
+                                 "2026-07-{:02d}".format(1 + i),
+                                 "2026-07-{:02d}".format(3 + i)))
+        self.store.save_reservations(rows)
+        serial = check_store(self.store, workers=1)
+        with mock.patch.object(integrity, "_MIN_PARALLEL", 1):
+            parallel = check_store(self.store, workers=2)
+        self.assertEqual(sorted(serial.issues, key=lambda i: i.resv_id),
+                         sorted(parallel.issues, key=lambda i: i.resv_id))
+        self.assertEqual(len(serial.issues), 38)
+
+    def test_cli_check_writes_plan(self) -> None:
+        self.store.save_reservations([
+            resv("R1", "GONE", 1, "2026-07-01", "2026-07-02"),
+        ])
+        plan = os.path.join(self.tmp.name, "plan.json")
+        code = main(["cli", "check", "--data", self.tmp.name,
+                     "--plan", plan])
+        self.assertEqual(code, 1)
+        with open(plan, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)[0]["action"], "delete")
@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from reservation_system.customer import Customer
+from reservation_system.exceptions import NotFoundError
+from reservation_system.hotel import Hotel
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, paths_in
+
+
+class TestLazyRecords(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JsonStore(paths_in(self.tmp.name, "lines"),
+                               layout="lines")
+        self.svc = ReservationService(store=self.store)
+        for i in range(5):
+            self.svc.create_hotel(
+                Hotel("H{}".format(i), "Inn {}".format(i), "Nagoya", 3)
+            )
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        self.svc.create_customer(Customer("C2", "B", "b@x.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_listing_ids_decodes_nothing(self) -> None:
+        hotels = self.svc.hotels()
+        with mock.patch.object(
+            self.store.codec, "loads", wraps=self.store.codec.loads
+        ) as loads:
+            self.assertEqual(len(hotels), 5)
+            self.assertEqual(sorted(hotels)[:2], ["H0", "H1"])
+            self.assertEqual(loads.call_count, 0)
+            self.assertEqual(hotels["H3"].name, "Inn 3")
+            self.assertEqual(loads.call_count, 1)
+        self.assertEqual(hotels.cached(), 1)
+
+    def test_entities_are_cached_until_the_collection_changes(self) -> None:
+        with mock.patch.object(
+            self.store.codec, "loads", wraps=self.store.codec.loads
+        ) as loads:
+            first = self.svc.get_hotel("H1")
+            self.assertIs(self.svc.get_hotel("H1"), first)
+            self.assertEqual(loads.call_count, 1)
+        self.svc.update_hotel("H1", name="Renamed")
+        self.assertEqual(self.svc.get_hotel("H1").name, "Renamed")
+        # A change made through another store is seen as well.
+        other = JsonStore(paths_in(self.tmp.name, "lines"), layout="lines")
+        other.put_hotels([{"hotel_id": "H1", "name": "Other",
+                           "city": "Nagoya", "rooms_total": 3}])
+        self.assertEqual(self.svc.get_hotel("H1").name, "Other")
+        self.svc.delete_hotel("H1")
+        self.assertNotIn("H1", self.svc.hotels())
+
+    def test_invalid_record_reads_as_missing(self) -> None:
+        self.store.put_customers([{"customer_id": "C9", "name_full": ""}])
+        out = StringIO()
+        with redirect_stdout(out):
+            self.assertIsNone(self.svc.customers().get("C9"))
+            with self.assertRaises(NotFoundError):
+                self.svc.get_customer("C9")
+        self.assertIn("[ERROR]", out.getvalue())
+        self.assertEqual(self.svc.customers()["C2"].email, "b@x.com")
+
+    def test_reservations_view_and_cascade_without_full_load(self) -> None:
+        self.svc.reserve_room("R1", "H0", "C1", "2026-07-01", "2026-07-02")
+        self.svc.reserve_room("R2", "H1", "C2", "2026-07-01", "2026-07-02")
+        self.assertEqual(self.svc.reservations()["R1"].customer_id, "C1")
+        with mock.patch.object(
+            self.store, "load_reservations",
+            side_effect=AssertionError("full load"),
+        ):
+            self.svc.delete_customer("C1")
+            self.svc.delete_hotel("H1")
+        self.assertEqual(len(self.svc.reservations()), 0)
+        self.assertNotIn("R1", self.svc.reservations())
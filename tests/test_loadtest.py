@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from reservation_system import loadtest
+from reservation_system.cli import main
+from reservation_system.exceptions import StorageError
+from reservation_system.loadtest import run_loadtest
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_reports_every_operation(self) -> None:
+        result = run_loadtest(
+            clients=4,
+            duration=0.5,
+            interval=0.25,
+            hotels=2,
+            customers=10,
+            reservations=20,
+        )
+        self.assertGreater(len(result.samples), 0)
+        self.assertEqual(
+            set(result.by_op()), {"auto", "cancel", "get", "reserve",
+                                  "update"}
+        )
+        self.assertTrue(0.0 <= result.conflict_rate() <= 1.0)
+        self.assertGreaterEqual(len(result.timeline()), 2)
+        text = result.format()
+        self.assertIn("p99 ms", text)
+        self.assertIn("\nall", text)
+
+    def test_other_failures_are_counted_as_errors(self) -> None:
+        def broken(s: object, rng: object) -> None:
+            raise StorageError("disk full")
+
+        with mock.patch.dict(loadtest._OPS, {"get": broken}):
+            result = run_loadtest(clients=2, duration=0.2, mix="get=1",
+                                  hotels=2, customers=5, reservations=5)
+        outcomes = {s[3] for s in result.samples}
+        self.assertEqual(outcomes, {"error"})
+        self.assertGreater(len(result.samples), 2)
+
+    def test_rejects_bad_settings(self) -> None:
+        with self.assertRaises(ValueError):
+            run_loadtest(clients=0, duration=0.1)
+        with self.assertRaises(ValueError):
+            run_loadtest(mix="delete=1", duration=0.1)
+
+    def test_cli_loadtest_command(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = os.path.join(tmp, "load.txt")
+            code = main(
+                [
+                    "cli",
+                    "loadtest",
+                    "--clients", "2",
+                    "--duration", "0.2",
+                    "--hotels", "2",
+                    "--customers", "5",
+                    "--reservations", "5",
+                    "--report", report,
+                ]
+            )
+            self.assertEqual(code, 0)
+            self.assertTrue(os.path.exists(report))
+
+
+if __name__ == "__main__":
+    unittest.main()
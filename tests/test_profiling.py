@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from reservation_system.cli import main
+from reservation_system.profiling import parse_mix, run_profile
+
+
+class TestProfiling(unittest.TestCase):
+    def test_parse_mix(self) -> None:
+        self.assertEqual(parse_mix("auto=2, cancel"), {"auto": 2, "cancel": 1})
+        with self.assertRaises(ValueError):
+            parse_mix("teleport=1")
+        with self.assertRaises(ValueError):
+            parse_mix("auto=0")
+
+    def test_report_lists_every_operation(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = os.path.join(tmp, "report.txt")
+            text = run_profile(
+                report,
+                layout="lines",
+                ops=40,
+                hotels=3,
+                customers=10,
+                reservations=30,
+            )
+            self.assertTrue(os.path.exists(report))
+            for op in ("auto", "cancel", "delete", "reserve", "update"):
+                self.assertIn("\n" + op, text)
+            self.assertIn("allocation sites", text)
+
+    def test_cli_profile_command(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = os.path.join(tmp, "report.txt")
+            code = main(
+                [
+                    "cli",
+                    "profile",
+                    "--ops", "10",
+                    "--hotels", "2",
+                    "--customers", "5",
+                    "--reservations", "5",
+                    "--no-alloc",
+                    "--report", report,
+                ]
+            )
+            self.assertEqual(code, 0)
+            self.assertTrue(os.path.exists(report))
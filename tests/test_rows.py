@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from reservation_system.exceptions import ValidationError
+from reservation_system.reservation import Reservation
+from reservation_system.rows import ReservationRow
+from reservation_system.storage import JsonStore, paths_in
+from reservation_system.validators import iso_ordinal
+
+
+def record(resv_id: str, **kw: object) -> dict:
+    d = {
+        "resv_id": resv_id,
+        "hotel_id": "H1",
+        "customer_id": "C1",
+        "check_in": "2026-02-25",
+        "check_out": "2026-02-28",
+        "room_no": 1,
+    }
+    d.update(kw)
+    return d
+
+
+class TestReservationRows(unittest.TestCase):
+    def test_loaded_rows_share_interned_strings(self) -> None:
+        a, b = json.loads(json.dumps([record("R1"), record("R2")]))
+        self.assertIsNot(a["hotel_id"], b["hotel_id"])
+        ra = ReservationRow.from_dict(a)
+        rb = ReservationRow.from_dict(b)
+        self.assertIs(ra.hotel_id, rb.hotel_id)
+        self.assertIs(ra.check_in, rb.check_in)
+        self.assertEqual(ra.to_dict(), a)
+
+    def test_malformed_record_rejected(self) -> None:
+        with self.assertRaises(ValidationError):
+            ReservationRow.from_dict(record("R1", hotel_id=7))
+        with self.assertRaises(ValidationError):
+            ReservationRow.from_dict(record("R1", room_no="1"))
+        with self.assertRaises(ValidationError):
+            ReservationRow.from_dict(record("R1", auto_assigned=1))
+
+    def test_rows_carry_day_ordinals(self) -> None:
+        row = ReservationRow.from_dict(record("R1"))
+        self.assertEqual(
+            (row.check_in_ord, row.check_out_ord),
+            (date(2026, 2, 25).toordinal(), date(2026, 2, 28).toordinal()),
+        )
+        self.assertNotIn("check_in_ord", row.to_dict())
+        resv = Reservation.from_row(row)
+        self.assertEqual(resv.check_out_ord, row.check_out_ord)
+        self.assertEqual(resv.to_dict(), row.to_dict())
+        with self.assertRaises(ValidationError):
+            ReservationRow.from_dict(record("R1", check_in="2026-02-30"))
+
+    def test_date_parsing_is_memoized(self) -> None:
+        iso_ordinal("2031-05-17")
+        hits = iso_ordinal.cache_info().hits
+        for _ in range(3):
+            ReservationRow.from_dict(
+                record("R1", check_in="2031-05-17", check_out="2031-05-18")
+            )
+        self.assertGreaterEqual(iso_ordinal.cache_info().hits, hits + 3)
+        with self.assertRaises(ValueError):
+            iso_ordinal("2031-13-01")
+
+    def test_auto_assigned_flag_is_written_only_when_set(self) -> None:
+        auto = record("R1", auto_assigned=True)
+        self.assertEqual(ReservationRow.from_dict(auto).to_dict(), auto)
+        self.assertTrue(ReservationRow.from_dict(auto).auto_assigned)
+        self.assertFalse(ReservationRow.from_dict(record("R1")).auto_assigned)
+
+    def test_store_skips_malformed_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonStore(paths_in(tmp))
+            store.save_reservations(
+                [record("R1"), record("R2", check_out=None),
+                 record("R3", check_in="25/02/2026")]
+            )
+            rows = store.load_reservation_rows()
+            self.assertEqual([r.resv_id for r in rows], ["R1"])
+            self.assertTrue(os.path.exists(paths_in(tmp).reservations))
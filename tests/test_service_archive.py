@@ -0,0 +1,152 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from reservation_system.cli import main
+from reservation_system.customer import Customer
+from reservation_system.exceptions import StorageError, ValidationError
+from reservation_system.hotel import Hotel
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, StorePaths, paths_in
+
+
+def ids(resvs: list) -> list:
+    return sorted(r.resv_id for r in resvs)
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JsonStore(paths_in(self.tmp.name, "lines"),
+                               layout="lines")
+        self.svc = ReservationService(store=self.store)
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 1))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        self.svc.reserve_room("R1", "H1", "C1", "2025-03-01", "2025-03-04")
+        self.svc.reserve_room("R2", "H1", "C1", "2025-11-28", "2025-12-02")
+        self.svc.reserve_room("R3", "H1", "C1", "2026-07-01", "2026-07-03")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_moves_past_stays_to_monthly_partitions(self) -> None:
+        self.assertEqual(self.svc.archive("2026-01-01"), 2)
+        hot = [r["resv_id"] for r in self.store.load_reservations()]
+        self.assertEqual(hot, ["R3"])
+        archive = os.path.join(self.tmp.name, "archive")
+        self.assertEqual(
+            sorted(os.listdir(archive)),
+            ["meta.json", "reservations-2025-03.jsonl",
+             "reservations-2025-12.jsonl"],
+        )
+        self.assertEqual(self.store.archive_cutoff(), "2026-01-01")
+        # Running again moves nothing and keeps the cutoff.
+        self.assertEqual(self.svc.archive("2025-06-01"), 0)
+        self.assertEqual(self.store.archive_cutoff(), "2026-01-01")
+
+    def test_yearly_partitions(self) -> None:
+        store = JsonStore(paths_in(self.tmp.name, "lines"),
+                          layout="lines", archive_by="year")
+        ReservationService(store=store).archive("2026-01-01")
+        self.assertIn(
+            "reservations-2025.jsonl",
+            os.listdir(os.path.join(self.tmp.name, "archive")),
+        )
+
+    def test_queries_reach_archive_only_when_asked(self) -> None:
+        self.svc.archive("2026-01-01")
+        self.assertEqual(self.svc.in_house("H1", "2025-03-02"), [])
+        self.assertEqual(
+            ids(self.svc.in_house("H1", "2025-03-02",
+                                  include_archive=True)),
+            ["R1"],
+        )
+        self.assertEqual(
+            ids(self.svc.arrivals("H1", "2025-01-01", "2026-12-31",
+                                  include_archive=True)),
+            ["R1", "R2", "R3"],
+        )
+        self.assertEqual(
+            ids(self.svc.departures("H1", "2025-12-01", "2025-12-31",
+                                    include_archive=True)),
+            ["R2"],
+        )
+
+    def test_archived_room_is_free_but_past_dates_are_closed(self) -> None:
+        self.svc.archive("2026-01-01")
+        with self.assertRaises(ValidationError):
+            self.svc.reserve_room("R4", "H1", "C1", "2025-03-02",
+                                  "2025-03-03")
+        r = self.svc.reserve_room("R5", "H1", "C1", "2026-01-01",
+                                  "2026-01-02")
+        self.assertEqual(r.room_no, 1)
+
+    def test_compact_dates_are_compared_as_days(self) -> None:
+        self.svc.reserve_room("R4", "H1", "C1", "20250501", "20250503")
+        self.assertEqual(self.svc.archive("20260101"), 3)
+        self.assertEqual(self.store.archive_cutoff(), "2026-01-01")
+        self.assertEqual(
+            [r["resv_id"] for r in self.store.load_reservations()], ["R3"]
+        )
+        self.assertIn(
+            "reservations-2025-05.jsonl",
+            os.listdir(os.path.join(self.tmp.name, "archive")),
+        )
+        self.assertEqual(
+            ids(self.svc.in_house("H1", "20250502", include_archive=True)),
+            ["R4"],
+        )
+        r = self.svc.reserve_room("R5", "H1", "C1", "2026-03-01",
+                                  "2026-03-02")
+        self.assertEqual(r.room_no, 1)
+        with self.assertRaises(ValidationError):
+            self.svc.reserve_room("R6", "H1", "C1", "20251231", "20260102")
+
+    def test_retry_after_interrupted_run_keeps_every_stay(self) -> None:
+        # The first run died mid-write: half a record, hot copy kept.
+        archive = os.path.join(self.tmp.name, "archive")
+        os.makedirs(archive)
+        part = os.path.join(archive, "reservations-2025-03.jsonl")
+        with open(part, "wb") as f:
+            f.write(b'{"resv_id": "R1", "hotel_id": "H')
+        with redirect_stdout(StringIO()):
+            self.assertEqual(self.svc.archive("2026-01-01"), 2)
+            old = self.svc.departures("H1", "2025-01-01", "2025-12-31",
+                                      include_archive=True)
+        self.assertEqual(ids(old), ["R1", "R2"])
+        hot = [r["resv_id"] for r in self.store.load_reservations()]
+        self.assertEqual(hot, ["R3"])
+
+    def test_keeps_hot_stays_that_do_not_read_back(self) -> None:
+        with mock.patch.object(self.store, "iter_archived_reservations",
+                               return_value=iter(())):
+            self.assertEqual(self.svc.archive("2026-01-01"), 0)
+        hot = [r["resv_id"] for r in self.store.load_reservations()]
+        self.assertEqual(hot, ["R1", "R2", "R3"])
+
+    def test_store_without_archive_dir(self) -> None:
+        paths = StorePaths(
+            hotels=os.path.join(self.tmp.name, "h.json"),
+            customers=os.path.join(self.tmp.name, "c.json"),
+            reservations=os.path.join(self.tmp.name, "r.json"),
+        )
+        svc = ReservationService(store=JsonStore(paths))
+        self.assertIsNone(svc.store.archive_cutoff())
+        with self.assertRaises(StorageError):
+            svc.archive("2026-01-01")
+
+    def test_cli_archive_command(self) -> None:
+        code = main(["cli", "archive", "--before", "2026-01-01",
+                     "--data", self.tmp.name, "--layout", "lines"])
+        self.assertEqual(code, 0)
+        self.assertEqual(self.store.archive_cutoff(), "2026-01-01")
+        code = main(["cli", "archive", "--before", "soon",
+                     "--data", self.tmp.name, "--layout", "lines"])
+        self.assertEqual(code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from reservation_system.customer import Customer
+from reservation_system.exceptions import ValidationError
+from reservation_system.search import CustomerSearchIndex
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, paths_in
+
+
+def ids(customers: list) -> list:
+    return [c.customer_id for c in customers]
+
+
+class TestCustomerSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.svc = ReservationService(
+            store=JsonStore(paths_in(self.tmp.name, "lines"),
+                            layout="lines")
+        )
+        for cid, name, email in (
+            ("C1", "Michelle Arceo", "michelle@example.com"),
+            ("C2", "Ana Michel", "ana.m@example.org"),
+            ("C3", "Bob Stone", "bob@stone.mx"),
+            ("C4", "Carla Miche", "carla@example.com"),
+        ):
+            self.svc.create_customer(Customer(cid, name, email))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_prefix_matches_rank_first(self) -> None:
+        # C2 and C4 have a name word starting with "miche"; C1's whole
+        # name does too. All are prefix matches, in alphabetical order.
+        self.assertEqual(
+            ids(self.svc.search_customers("MICHE")), ["C4", "C2", "C1"]
+        )
+        self.assertEqual(ids(self.svc.search_customers("b")), ["C3"])
+
+    def test_substring_of_name_or_email(self) -> None:
+        self.assertEqual(ids(self.svc.search_customers("tone")), ["C3"])
+        self.assertEqual(
+            sorted(ids(self.svc.search_customers("example"))),
+            ["C1", "C2", "C4"],
+        )
+        self.assertEqual(self.svc.search_customers("zzz"), [])
+
+    def test_limit(self) -> None:
+        self.assertEqual(len(self.svc.search_customers("example", 2)), 2)
+        with self.assertRaises(ValidationError):
+            self.svc.search_customers("a", limit=0)
+
+    def test_index_follows_changes(self) -> None:
+        self.assertEqual(ids(self.svc.search_customers("stone")), ["C3"])
+        self.svc.update_customer("C3", name_full="Robert Rock",
+                                 email="rob@rock.mx")
+        self.svc.delete_customer("C1")
+        self.svc.create_customer(Customer("C5", "Rocky", "r@x.com"))
+        self.assertEqual(self.svc.search_customers("stone"), [])
+        self.assertEqual(ids(self.svc.search_customers("rock")),
+                         ["C3", "C5"])
+        self.assertEqual(ids(self.svc.search_customers("michelle")), [])
+
+    def test_index_sees_changes_from_other_service(self) -> None:
+        self.assertEqual(ids(self.svc.search_customers("bob")), ["C3"])
+        other = ReservationService(store=JsonStore(
+            paths_in(self.tmp.name, "lines"), layout="lines"))
+        other.create_customer(Customer("C6", "Bobby", "bobby@x.com"))
+        self.assertEqual(ids(self.svc.search_customers("bob")),
+                         ["C3", "C6"])
+
+    def test_results_come_from_the_index(self) -> None:
+        self.svc.search_customers("x")  # build the index
+        with mock.patch.object(self.svc.store, "get_customer") as get:
+            found = self.svc.search_customers("ana")
+        get.assert_not_called()
+        self.assertEqual(
+            found, [Customer("C2", "Ana Michel", "ana.m@example.org")]
+        )
+
+
+class TestCustomerSearchIndex(unittest.TestCase):
+    def test_repack_keeps_results(self) -> None:
+        idx = CustomerSearchIndex(
+            {"customer_id": "C{}".format(i), "name_full": "Guest {}".format(i),
+             "email": "g{}@x.com".format(i)}
+            for i in range(3000)
+        )
+        for i in range(2000):
+            idx.discard("C{}".format(i))
+        self.assertEqual(len(idx), 1000)
+        self.assertEqual(idx.search("uest 2999"), ["C2999"])
+        self.assertEqual(idx.search("guest 1"), [])
+        self.assertEqual(idx.record("C2999")["name_full"], "Guest 2999")
+        self.assertIsNone(idx.record("C1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
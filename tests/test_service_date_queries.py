@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from reservation_system.customer import Customer
+from reservation_system.exceptions import (
+    ConflictError,
+    NotFoundError,
+    ValidationError,
+)
+from reservation_system.hotel import Hotel
+from reservation_system.occupancy import OccupancyIndex
+from reservation_system.rows import ReservationRow
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, StorePaths
+
+
+def make_service(tmpdir: str) -> ReservationService:
+    paths = StorePaths(
+        hotels=os.path.join(tmpdir, "hotels.json"),
+        customers=os.path.join(tmpdir, "customers.json"),
+        reservations=os.path.join(tmpdir, "reservations.json"),
+    )
+    return ReservationService(store=JsonStore(paths))
+
+
+def ids(resvs: list) -> list:
+    return sorted(r.resv_id for r in resvs)
+
+
+class TestDateWindowQueries(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.svc = make_service(self.tmp.name)
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 5))
+        self.svc.create_hotel(Hotel("H2", "Other Inn", "Tokyo", 5))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        self.svc.create_customer(Customer("C2", "B", "b@x.com"))
+        self.svc.reserve_room("R1", "H1", "C1", "2026-07-01", "2026-07-03")
+        self.svc.reserve_room("R2", "H1", "C2", "2026-06-20", "2026-07-05")
+        self.svc.reserve_room("R3", "H1", "C1", "2026-07-03", "2026-07-04")
+        self.svc.reserve_room("R4", "H2", "C1", "2026-07-01", "2026-07-03")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_in_house(self) -> None:
+        self.assertEqual(ids(self.svc.in_house("H1", "2026-07-02")),
+                         ["R1", "R2"])
+        self.assertEqual(ids(self.svc.in_house("H1", "2026-07-03")),
+                         ["R2", "R3"])
+        self.assertEqual(self.svc.in_house("H1", "2026-07-05"), [])
+
+    def test_arrivals_and_departures(self) -> None:
+        self.assertEqual(ids(self.svc.arrivals("H1", "2026-07-01")), ["R1"])
+        self.assertEqual(
+            ids(self.svc.departures("H1", "2026-07-01", "2026-07-08")),
+            ["R1", "R2", "R3"],
+        )
+
+    def test_index_follows_cancel_and_cascades(self) -> None:
+        self.assertEqual(len(self.svc.in_house("H1", "2026-07-02")), 2)
+        self.svc.cancel_reservation("R1")
+        self.svc.delete_customer("C2")
+        self.assertEqual(self.svc.in_house("H1", "2026-07-02"), [])
+        self.svc.reserve_room("R5", "H1", "C1", "2026-07-02", "2026-07-03")
+        self.assertEqual(ids(self.svc.in_house("H1", "2026-07-02")), ["R5"])
+
+    def test_index_sees_changes_from_other_service(self) -> None:
+        self.assertEqual(len(self.svc.arrivals("H1", "2026-07-01")), 1)
+        other = make_service(self.tmp.name)
+        other.cancel_reservation("R1")
+        self.assertEqual(self.svc.arrivals("H1", "2026-07-01"), [])
+
+    def test_rooms_left(self) -> None:
+        self.assertEqual(self.svc.rooms_left("H1", "2026-07-02"), 3)
+        self.assertEqual(
+            self.svc.rooms_left("H1", "2026-07-01", "2026-07-05"), 3
+        )
+        self.assertEqual(self.svc.rooms_left("H1", "2026-07-04"), 4)
+        self.svc.cancel_reservation("R1")
+        self.svc.delete_customer("C2")
+        self.assertEqual(self.svc.rooms_left("H1", "2026-07-02"), 5)
+
+    def test_sold_out_rejected_from_counters(self) -> None:
+        self.svc.create_hotel(Hotel("H3", "Tiny Inn", "Kyoto", 1))
+        self.svc.reserve_room("R6", "H3", "C1", "2026-08-01", "2026-08-05")
+        self.assertEqual(self.svc.rooms_left("H3", "2026-08-03"), 0)
+        # Neither request may fall back to reading the reservations.
+        with mock.patch.object(
+            self.svc.store, "load_reservation_rows",
+            side_effect=AssertionError("scanned"),
+        ):
+            with self.assertRaises(ConflictError):
+                self.svc.reserve_room("R7", "H3", "C1", "2026-08-04",
+                                      "2026-08-06")
+            with self.assertRaises(ConflictError):
+                self.svc.reserve_room("R8", "H3", "C1", "2026-07-30",
+                                      "2026-08-02", room_no=1)
+            r = self.svc.reserve_room("R9", "H3", "C1", "2026-08-05",
+                                      "2026-08-06")
+        self.assertEqual(r.room_no, 1)
+
+    def test_counters_ignore_rooms_beyond_a_shrunk_hotel(self) -> None:
+        self.svc.create_hotel(Hotel("H3", "Tiny Inn", "Kyoto", 3))
+        self.svc.reserve_room("R6", "H3", "C1", "2026-08-01", "2026-08-03",
+                              room_no=1)
+        self.svc.reserve_room("R7", "H3", "C1", "2026-08-01", "2026-08-03",
+                              room_no=3)
+        self.svc.update_hotel("H3", rooms_total=2)
+        self.assertEqual(self.svc.rooms_left("H3", "2026-08-01"), 1)
+        r = self.svc.reserve_room("R8", "H3", "C1", "2026-08-01",
+                                  "2026-08-02", room_no=2)
+        self.assertEqual(r.room_no, 2)
+        self.assertEqual(self.svc.rooms_left("H3", "2026-08-01"), 0)
+        with self.assertRaises(ConflictError):
+            self.svc.reserve_room("R9", "H3", "C1", "2026-08-01",
+                                  "2026-08-02")
+
+    def test_in_house_window_shrinks_after_long_stay_leaves(self) -> None:
+        def row(resv_id: str, check_out: str) -> ReservationRow:
+            return ReservationRow.from_dict({
+                "resv_id": resv_id, "hotel_id": "H1", "customer_id": "C1",
+                "check_in": "2026-01-01", "check_out": check_out,
+                "room_no": 1,
+            })
+
+        idx = OccupancyIndex([row("A", "2026-01-03"),
+                              row("B", "2026-12-31")])
+        stays = idx._hotels["H1"]  # pylint: disable=protected-access
+        self.assertEqual(stays.max_nights, 364)
+        idx.discard("B")
+        self.assertEqual(stays.max_nights, 2)
+        self.assertEqual(idx.in_house("H1", "2026-01-02"), ["A"])
+
+    def test_invalid_queries(self) -> None:
+        with self.assertRaises(NotFoundError):
+            self.svc.in_house("NOPE", "2026-07-02")
+        with self.assertRaises(ValidationError):
+            self.svc.arrivals("H1", "2026-07-02", "2026-07-01")
+        with self.assertRaises(ValidationError):
+            self.svc.departures("H1", "July 1st")
+        with self.assertRaises(ValidationError):
+            self.svc.rooms_left("H1", "2026-07-02", "2026-07-02")
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from reservation_system.assignment import repack
+from reservation_system.changefeed import ChangeFeed
+from reservation_system.cli import main
+from reservation_system.customer import Customer
+from reservation_system.exceptions import ConflictError, ValidationError
+from reservation_system.hotel import Hotel
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, paths_in
+from reservation_system.validators import iso_ordinal
+
+
+class TestOptimizeAssignments(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JsonStore(paths_in(self.tmp.name))
+        self.feed = ChangeFeed(os.path.join(self.tmp.name, "changes.jsonl"))
+        self.svc = ReservationService(store=self.store, feed=self.feed)
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 2))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def room_of(self, resv_id: str) -> int:
+        return self.store.get_reservation(resv_id)["room_no"]
+
+    def fragment(self, **q_room: int) -> None:
+        """Leave Q in room 2 and R in room 1 with no night in common."""
+        self.svc.reserve_room("P", "H1", "C1", "2026-07-01", "2026-07-03")
+        self.svc.reserve_room(
+            "Q", "H1", "C1", "2026-07-02", "2026-07-04", **q_room
+        )
+        self.svc.cancel_reservation("P")
+        self.svc.reserve_room("R", "H1", "C1", "2026-07-05", "2026-07-07")
+        self.assertEqual((self.room_of("Q"), self.room_of("R")), (2, 1))
+
+    def test_repack_frees_a_room_for_a_long_stay(self) -> None:
+        self.fragment()
+        with self.assertRaises(ConflictError):
+            self.svc.reserve_room(
+                "L", "H1", "C1", "2026-07-02", "2026-07-08"
+            )
+        with mock.patch.object(
+            self.store, "put_reservations", wraps=self.store.put_reservations
+        ) as put:
+            report = self.svc.optimize_assignments("H1", "2026-06-01")
+        self.assertEqual(put.call_count, 1)
+        self.assertEqual(
+            (report.movable, report.moved, report.rooms_before,
+             report.rooms_after, report.rooms_freed),
+            (2, 1, 2, 1, 1),
+        )
+        self.assertEqual((self.room_of("Q"), self.room_of("R")), (1, 1))
+        last = list(self.feed.follow())[-1]
+        self.assertEqual((last.op, last.key, last.data["room_no"]),
+                         ("updated", "Q", 1))
+        self.svc.reserve_room("L", "H1", "C1", "2026-07-02", "2026-07-08")
+        self.assertEqual(self.room_of("L"), 2)
+
+    def test_requested_room_stays_and_others_pack_around_it(self) -> None:
+        self.fragment(room_no=2)
+        report = self.svc.optimize_assignments("H1", "2026-06-01")
+        self.assertEqual((report.movable, report.moved), (1, 1))
+        self.assertEqual((self.room_of("Q"), self.room_of("R")), (2, 2))
+
+    def test_started_stays_keep_their_rooms(self) -> None:
+        self.fragment()
+        report = self.svc.optimize_assignments("H1", "2026-07-03")
+        self.assertEqual((report.movable, report.rooms_freed), (1, 1))
+        self.assertEqual((self.room_of("Q"), self.room_of("R")), (2, 2))
+
+    def test_invalid_input(self) -> None:
+        with self.assertRaises(ValidationError):
+            self.svc.optimize_assignments("H1", "July")
+        with self.assertRaises(LookupError):
+            self.svc.optimize_assignments("H9", "2026-07-01")
+
+    def test_cli_repack_command(self) -> None:
+        self.fragment()
+        out = StringIO()
+        with redirect_stdout(out):
+            code = main(["cli", "repack", "H1", "--from", "2026-06-01",
+                         "--data", self.tmp.name])
+        self.assertEqual(code, 0)
+        self.assertIn("(1 freed)", out.getvalue())
+        with redirect_stdout(StringIO()):
+            code = main(["cli", "repack", "H9", "--from", "2026-06-01",
+                         "--data", self.tmp.name])
+        self.assertEqual(code, 2)
+
+
+def days(*stays: tuple) -> list:
+    return [
+        (a, iso_ordinal(b), iso_ordinal(c)) for a, b, c in stays
+    ]
+
+
+class TestRepack(unittest.TestCase):
+    def test_uses_as_few_rooms_as_the_busiest_night(self) -> None:
+        stays = days(
+            ("a", "2026-07-01", "2026-07-03"),
+            ("b", "2026-07-02", "2026-07-05"),
+            ("c", "2026-07-03", "2026-07-06"),
+            ("d", "2026-07-05", "2026-07-07"),
+        )
+        rooms = repack(stays, [], 10)
+        self.assertEqual(len(set(rooms.values())), 2)
+        self.assertEqual(rooms["a"], rooms["c"])
+        self.assertEqual(rooms["b"], rooms["d"])
+
+    def test_fixed_stays_block_their_rooms(self) -> None:
+        fixed = days((1, "2026-07-02", "2026-07-03"))
+        stays = days(("a", "2026-07-01", "2026-07-03"))
+        self.assertEqual(repack(stays, fixed, 2), {"a": 2})
+        self.assertIsNone(repack(stays, fixed, 1))
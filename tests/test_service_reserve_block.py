@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from reservation_system.changefeed import ChangeFeed
+from reservation_system.customer import Customer
+from reservation_system.exceptions import (
+    ConflictError,
+    NotFoundError,
+    ValidationError,
+)
+from reservation_system.hotel import Hotel
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, paths_in
+
+
+class TestReserveBlock(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.feed = ChangeFeed(os.path.join(self.tmp.name, "changes.jsonl"))
+        self.store = JsonStore(paths_in(self.tmp.name))
+        self.svc = ReservationService(store=self.store, feed=self.feed)
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 5))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        self.svc.reserve_room(
+            "R1", "H1", "C1", "2026-07-01", "2026-07-03", room_no=2
+        )
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def resv_ids(self) -> list:
+        return sorted(r["resv_id"] for r in self.store.load_reservations())
+
+    def test_assigns_lowest_free_rooms(self) -> None:
+        rooms = self.svc.reserve_block(
+            "H1", "C1", "2026-07-02", "2026-07-04", 3, block_id="B1"
+        )
+        self.assertEqual(rooms, [1, 3, 4])
+        self.assertEqual(
+            self.resv_ids(), ["B1-1", "B1-2", "B1-3", "R1"]
+        )
+        self.assertEqual(self.svc.rooms_left("H1", "2026-07-02"), 1)
+
+    def test_single_store_write_and_feed_events(self) -> None:
+        with mock.patch.object(
+            self.store, "put_reservations", wraps=self.store.put_reservations
+        ) as put:
+            self.svc.reserve_block("H1", "C1", "2026-08-01", "2026-08-02", 5)
+        self.assertEqual(put.call_count, 1)
+        self.assertEqual(len(put.call_args.args[0]), 5)
+        events = [e for e in self.feed.follow() if e.entity == "reservation"]
+        self.assertEqual(
+            [e.key for e in events][1:],
+            ["H1-C1-2026-08-01-{}".format(n) for n in range(1, 6)],
+        )
+        with mock.patch.object(
+            self.store, "get_reservation", wraps=self.store.get_reservation
+        ) as get:
+            self.svc.reserve_block("H1", "C1", "2026-08-03", "2026-08-04", 5)
+        # Ids are checked against one listing, not one read each.
+        get.assert_not_called()
+
+    def test_not_enough_rooms_books_nothing(self) -> None:
+        with self.assertRaises(ConflictError):
+            self.svc.reserve_block(
+                "H1", "C1", "2026-07-01", "2026-07-02", 5
+            )
+        self.assertEqual(self.resv_ids(), ["R1"])
+
+    def test_repeated_block_is_refused(self) -> None:
+        self.svc.reserve_block("H1", "C1", "2026-09-01", "2026-09-02", 1)
+        with self.assertRaises(ConflictError):
+            self.svc.reserve_block(
+                "H1", "C1", "2026-09-01", "2026-09-02", 1
+            )
+        # The same dates at another hotel are a different block.
+        self.svc.create_hotel(Hotel("H2", "Other Inn", "Tokyo", 2))
+        self.assertEqual(
+            self.svc.reserve_block("H2", "C1", "2026-09-01", "2026-09-02",
+                                   2),
+            [1, 2],
+        )
+
+    def test_invalid_input(self) -> None:
+        for count in (0, -1, True, 1.5):
+            with self.assertRaises(ValidationError):
+                self.svc.reserve_block(
+                    "H1", "C1", "2026-09-01", "2026-09-02", count
+                )
+        with self.assertRaises(ValidationError):
+            self.svc.reserve_block("H1", "C1", "2026-09-02", "2026-09-01", 1)
+        with self.assertRaises(NotFoundError):
+            self.svc.reserve_block("H9", "C1", "2026-09-01", "2026-09-02", 1)
+        with self.assertRaises(NotFoundError):
+            self.svc.reserve_block("H1", "C9", "2026-09-01", "2026-09-02", 1)
@@ -0,0 +1,107 @@
+import sys
+import tempfile
+import threading
+import unittest
+from typing import Callable, List
+
+from reservation_system.customer import Customer
+from reservation_system.exceptions import ConflictError
+from reservation_system.hotel import Hotel
+from reservation_system.integrity import check_store
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, paths_in
+
+
+def run_threads(n: int, target: Callable[[int], None]) -> None:
+    barrier = threading.Barrier(n)
+
+    def worker(i: int) -> None:
+        barrier.wait()
+        target(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+class TestThreadSafeService(unittest.TestCase):
+    def setUp(self) -> None:
+        # Switch threads very often so check-then-write races surface.
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JsonStore(paths_in(self.tmp.name, "lines"),
+                               layout="lines")
+        self.svc = ReservationService(store=self.store, thread_safe=True)
+        for h in ("H1", "H2", "H3"):
+            self.svc.create_hotel(Hotel(h, "Inn " + h, "Nagoya", 4))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+
+    def tearDown(self) -> None:
+        sys.setswitchinterval(self.interval)
+        self.tmp.cleanup()
+
+    def _book_many(self, n: int, hotel_of: Callable[[int], str],
+                   room_of: Callable[[int], object]) -> List[str]:
+        booked: List[str] = []
+        lock = threading.Lock()
+
+        def book(i: int) -> None:
+            for attempt in range(4):
+                try:
+                    r = self.svc.reserve_room(
+                        "R{}-{}".format(i, attempt), hotel_of(i), "C1",
+                        "2026-07-01", "2026-07-03", room_no=room_of(i),
+                    )
+                except ConflictError:
+                    continue
+                with lock:
+                    booked.append(r.resv_id)
+
+        run_threads(n, book)
+        return booked
+
+    def test_auto_assign_never_double_books(self) -> None:
+        booked = self._book_many(
+            24, lambda i: "H{}".format(1 + i % 3), lambda i: None
+        )
+        # 3 hotels x 4 rooms for the same nights: exactly 12 fit.
+        self.assertEqual(len(booked), 12)
+        stored = self.store.load_reservations()
+        self.assertEqual(sorted(r["resv_id"] for r in stored),
+                         sorted(booked))
+        self.assertTrue(check_store(self.store, workers=1).ok)
+
+    def test_same_room_race_has_one_winner(self) -> None:
+        booked = self._book_many(16, lambda i: "H1", lambda i: 2)
+        self.assertEqual(len(booked), 1)
+        self.assertEqual(len(self.store.load_reservations()), 1)
+
+    def test_concurrent_cancel_and_rebook(self) -> None:
+        for room in range(1, 5):
+            self.svc.reserve_room("R{}".format(room), "H2", "C1",
+                                  "2026-07-01", "2026-07-03", room_no=room)
+        booked: List[str] = []
+
+        def churn(i: int) -> None:
+            if i < 4:
+                self.svc.cancel_reservation("R{}".format(i + 1))
+                return
+            try:
+                r = self.svc.reserve_room("N{}".format(i), "H2", "C1",
+                                          "2026-07-02", "2026-07-04")
+                booked.append(r.resv_id)
+            except ConflictError:
+                pass
+
+        run_threads(12, churn)
+        stored = self.store.load_reservations()
+        self.assertEqual(sorted(r["resv_id"] for r in stored),
+                         sorted(booked))
+        self.assertLessEqual(len(stored), 4)
+        self.assertTrue(check_store(self.store, workers=1).ok)
+        self.assertEqual(
+            len(self.svc.in_house("H2", "2026-07-02")), len(stored)
+        )
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from reservation_system.storage import (
+    JsonStore,
+    available_codecs,
+    get_codec,
+    paths_in,
+)
+
+HOTEL = {"hotel_id": "H1", "name": "Hôtel", "city": "Nagoya",
+         "rooms_total": 2}
+
+
+class TestStorageCodecs(unittest.TestCase):
+    def test_round_trip_with_every_codec(self) -> None:
+        for name in available_codecs():
+            for compact in (False, True):
+                with tempfile.TemporaryDirectory() as tmp:
+                    codec = get_codec(name, compact=compact)
+                    store = JsonStore(paths_in(tmp), codec=codec)
+                    store.save_hotels([HOTEL])
+                    self.assertEqual(store.load_hotels(), [HOTEL])
+                    with open(paths_in(tmp).hotels, "rb") as f:
+                        raw = f.read()
+                    self.assertEqual(b"\n" in raw, not compact)
+
+    def test_codecs_read_each_others_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for writer in available_codecs():
+                JsonStore(paths_in(tmp), codec=get_codec(writer)) \
+                    .save_hotels([HOTEL])
+                for reader in available_codecs():
+                    store = JsonStore(paths_in(tmp),
+                                      codec=get_codec(reader, True))
+                    self.assertEqual(store.load_hotels(), [HOTEL])
+
+    def test_unknown_codec_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+    def test_whitespace_only_file_is_empty(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "hotels.json"), "w",
+                      encoding="utf-8") as f:
+                f.write("  \n\t")
+            self.assertEqual(JsonStore(paths_in(tmp)).load_hotels(), [])
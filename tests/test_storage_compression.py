@@ -0,0 +1,186 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from reservation_system.customer import Customer
+from reservation_system.hotel import Hotel
+from reservation_system.service import ReservationService
+from reservation_system.storage import (
+    BLOCK_COMPRESSION,
+    JsonStore,
+    StorePaths,
+    _BlockLog,
+    paths_in,
+)
+
+
+def resv(i: int) -> dict:
+    return {
+        "resv_id": "R{:05d}".format(i),
+        "hotel_id": "H1",
+        "customer_id": "C1",
+        "check_in": "2026-07-01",
+        "check_out": "2026-07-03",
+        "room_no": 1 + i % 50,
+    }
+
+
+def compressed_paths(tmp: str, ext: str) -> StorePaths:
+    return StorePaths(
+        hotels=os.path.join(tmp, "hotels.json" + ext),
+        customers=os.path.join(tmp, "customers.json" + ext),
+        reservations=os.path.join(tmp, "reservations.json" + ext),
+    )
+
+
+class TestCompressedArrayFiles(unittest.TestCase):
+    def test_round_trip_and_smaller_files(self) -> None:
+        items = [resv(i) for i in range(500)]
+        with tempfile.TemporaryDirectory() as tmp:
+            plain = JsonStore(paths_in(tmp))
+            plain.save_reservations(items)
+            size = os.path.getsize(paths_in(tmp).reservations)
+            for ext in (".gz", ".bz2", ".xz"):
+                paths = compressed_paths(tmp, ext)
+                JsonStore(paths).save_reservations(items)
+                self.assertLess(os.path.getsize(paths.reservations),
+                                size // 5)
+                self.assertEqual(
+                    JsonStore(paths).load_reservations(), items
+                )
+
+    def test_corrupt_compressed_file_returns_empty_list(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = compressed_paths(tmp, ".gz")
+            with open(paths.hotels, "wb") as f:
+                f.write(b"not gzip at all")
+            self.assertEqual(JsonStore(paths).load_hotels(), [])
+
+    def test_lines_layout_rejects_compressed_paths(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                JsonStore(compressed_paths(tmp, ".gz"), layout="lines")
+
+
+class TestBlocksLayout(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = paths_in(self.tmp.name, "blocks")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_round_trip_with_every_compressor(self) -> None:
+        items = [resv(i) for i in range(2500)]
+        for name in BLOCK_COMPRESSION:
+            store = JsonStore(self.paths, layout="blocks", compression=name)
+            store.save_reservations(items)
+            fresh = JsonStore(self.paths, layout="blocks", compression=name)
+            self.assertEqual(fresh.load_reservations(), items)
+            self.assertEqual(fresh.get_reservation("R01234"), resv(1234))
+
+    def test_lookup_decodes_a_single_block(self) -> None:
+        store = JsonStore(self.paths, layout="blocks")
+        store.save_reservations([resv(i) for i in range(2500)])
+        store = JsonStore(self.paths, layout="blocks")
+        store.load_reservations()  # builds the block index
+        coll = store._reservations  # pylint: disable=protected-access
+        decoded = []
+        original = coll._decode
+
+        def spy(data: bytes, offset: int) -> list:
+            decoded.append(offset)
+            return original(data, offset)
+
+        coll._decode = spy
+        self.assertEqual(store.get_reservation("R02499"), resv(2499))
+        self.assertEqual(len(decoded), 1)
+
+    def spy_decode(self, store: JsonStore) -> list:
+        """Record the offset of every block ``store`` decompresses."""
+        coll = store._reservations  # pylint: disable=protected-access
+        decoded: list = []
+        original = coll._decode
+
+        def spy(data: bytes, offset: int) -> list:
+            decoded.append(offset)
+            return original(data, offset)
+
+        coll._decode = spy
+        return decoded
+
+    def test_new_process_uses_persisted_block_index(self) -> None:
+        store = JsonStore(self.paths, layout="blocks")
+        store.save_reservations([resv(i) for i in range(2500)])
+        store.put_reservations([dict(resv(7), room_no=9)])
+        store.remove_reservations(["R00008"])
+        store.close()
+        self.assertTrue(os.path.exists(self.paths.reservations + ".idx"))
+        with mock.patch.object(
+            _BlockLog, "_scan", side_effect=AssertionError("full scan")
+        ):
+            fresh = JsonStore(self.paths, layout="blocks")
+            decoded = self.spy_decode(fresh)
+            self.assertEqual(fresh.get_reservation("R02499"), resv(2499))
+            self.assertEqual(len(decoded), 1)
+            recs = list(fresh.iter_reservations())
+            # One pass over the five blocks.
+            self.assertEqual(len(decoded), 6)
+        self.assertEqual(len(recs), 2499)
+        self.assertEqual(fresh.get_reservation("R00007")["room_no"], 9)
+        self.assertIsNone(fresh.get_reservation("R00008"))
+
+    def test_index_catches_up_with_appended_blocks(self) -> None:
+        store = JsonStore(self.paths, layout="blocks")
+        store.save_reservations([resv(i) for i in range(2500)])
+        # Small appends leave the index on disk behind the file.
+        store.put_reservations([dict(resv(1), room_no=9)])
+        fresh = JsonStore(self.paths, layout="blocks")
+        decoded = self.spy_decode(fresh)
+        self.assertEqual(fresh.get_reservation("R00001")["room_no"], 9)
+        # The appended block, decoded once to index and once to read.
+        self.assertEqual(len(set(decoded)), 1)
+
+    def test_missing_or_broken_index_is_rebuilt(self) -> None:
+        store = JsonStore(self.paths, layout="blocks")
+        items = [resv(i) for i in range(1500)]
+        store.save_reservations(items)
+        os.remove(self.paths.reservations + ".idx")
+        fresh = JsonStore(self.paths, layout="blocks")
+        self.assertEqual(list(fresh.iter_reservations()), items)
+        with open(self.paths.reservations + ".idx", "wb") as f:
+            f.write(b"RSBLK1\ngarbage")
+        with redirect_stdout(StringIO()) as out:
+            again = JsonStore(self.paths, layout="blocks")
+            self.assertEqual(again.get_reservation("R01499"), resv(1499))
+        self.assertIn("[ERROR]", out.getvalue())
+
+    def test_append_after_torn_block_keeps_new_blocks(self) -> None:
+        store = JsonStore(self.paths, layout="blocks")
+        store.save_reservations([resv(i) for i in range(10)])
+        with open(self.paths.reservations, "ab") as f:
+            f.write(b"\x40\x00\x00\x00partial")  # crash mid-frame
+        with redirect_stdout(StringIO()):
+            store = JsonStore(self.paths, layout="blocks")
+            store.put_reservations([resv(10)])
+            store.put_reservations([resv(11)])
+            os.remove(self.paths.reservations + ".idx")  # force a rescan
+            fresh = JsonStore(self.paths, layout="blocks")
+            self.assertEqual(len(fresh.load_reservations()), 12)
+        self.assertEqual(fresh.get_reservation("R00011"), resv(11))
+
+    def test_service_on_blocks_layout(self) -> None:
+        svc = ReservationService(store=JsonStore(self.paths, layout="blocks"))
+        svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 1))
+        svc.create_customer(Customer("C1", "A", "a@x.com"))
+        svc.reserve_room("R1", "H1", "C1", "2026-07-01", "2026-07-03")
+        svc.update_customer("C1", name_full="Alice")
+        svc.cancel_reservation("R1")
+        store = JsonStore(self.paths, layout="blocks")
+        self.assertEqual(store.load_reservations(), [])
+        self.assertEqual(store.get_customer("C1")["name_full"], "Alice")
+        store.compact()
+        self.assertEqual(store.load_customers()[0]["name_full"], "Alice")
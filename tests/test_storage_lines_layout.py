@@ -0,0 +1,161 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from reservation_system.customer import Customer
+from reservation_system.hotel import Hotel
+from reservation_system.service import ReservationService
+from reservation_system.storage import JsonStore, StorePaths, _LineLog
+
+
+def make_store(tmpdir: str) -> JsonStore:
+    paths = StorePaths(
+        hotels=os.path.join(tmpdir, "hotels.jsonl"),
+        customers=os.path.join(tmpdir, "customers.jsonl"),
+        reservations=os.path.join(tmpdir, "reservations.jsonl"),
+    )
+    return JsonStore(paths, layout="lines")
+
+
+def count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+class TestLinesLayout(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = make_store(self.tmp.name)
+        self.svc = ReservationService(store=self.store)
+        self.svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 2))
+        self.svc.create_customer(Customer("C1", "A", "a@x.com"))
+        self.svc.create_customer(Customer("C2", "B", "b@x.com"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_update_appends_one_line(self) -> None:
+        path = os.path.join(self.tmp.name, "customers.jsonl")
+        self.assertEqual(count_lines(path), 2)
+        self.svc.update_customer("C1", name_full="Alice")
+        self.assertEqual(count_lines(path), 3)
+        self.assertEqual(self.svc.get_customer("C1").name_full, "Alice")
+        self.assertEqual(len(self.store.load_customers()), 2)
+
+    def test_cancel_writes_tombstone(self) -> None:
+        self.svc.reserve_room("R1", "H1", "C1", "2026-02-25", "2026-02-28")
+        self.svc.cancel_reservation("R1")
+        path = os.path.join(self.tmp.name, "reservations.jsonl")
+        self.assertEqual(count_lines(path), 2)
+        self.assertEqual(self.store.load_reservations(), [])
+
+    def test_compact_drops_superseded_lines(self) -> None:
+        for i in range(5):
+            self.svc.update_customer("C1", name_full="A{}".format(i))
+        self.svc.delete_customer("C2")
+        self.store.compact()
+        path = os.path.join(self.tmp.name, "customers.jsonl")
+        self.assertEqual(count_lines(path), 1)
+        self.assertEqual(self.svc.get_customer("C1").name_full, "A4")
+
+    def test_reopened_store_sees_latest_versions(self) -> None:
+        self.svc.update_hotel("H1", rooms_total=5)
+        self.svc.delete_customer("C2")
+        fresh = make_store(self.tmp.name)
+        self.assertEqual(fresh.get_hotel("H1")["rooms_total"], 5)
+        self.assertIsNone(fresh.get_customer("C2"))
+
+    def test_external_edit_triggers_rescan(self) -> None:
+        path = os.path.join(self.tmp.name, "hotels.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"hotel_id": "H2", "name": "N", "city": "C",'
+                    ' "rooms_total": 1}\n')
+        self.assertEqual(self.svc.get_hotel("H2").rooms_total, 1)
+
+    def test_reopen_uses_persisted_index(self) -> None:
+        # The first reopen scans the log and persists its index.
+        self.assertEqual(make_store(self.tmp.name).get_hotel("H1")["name"],
+                         "Michelle Inn")
+        idx = os.path.join(self.tmp.name, "hotels.jsonl.idx")
+        self.assertTrue(os.path.exists(idx))
+        self.svc.update_hotel("H1", name="Renamed")
+        # Later reopens start from it and only read the appended line.
+        with mock.patch.object(
+            _LineLog, "_scan", side_effect=AssertionError("full scan")
+        ):
+            fresh = make_store(self.tmp.name)
+            self.assertEqual(fresh.get_hotel("H1")["name"], "Renamed")
+            self.assertEqual(len(fresh.load_hotels()), 1)
+
+    def test_stale_or_broken_index_is_rebuilt(self) -> None:
+        make_store(self.tmp.name).get_customer("C1")
+        path = os.path.join(self.tmp.name, "customers.jsonl")
+        # Rewrite the file in place: same inode, different bytes.
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"customer_id": "C9", "name_full": "Z",'
+                    ' "email": "z@x.com"}\n' * 3)
+        fresh = make_store(self.tmp.name)
+        self.assertIsNone(fresh.get_customer("C1"))
+        self.assertEqual(fresh.get_customer("C9")["name_full"], "Z")
+        with open(path + ".idx", "wb") as f:
+            f.write(b"{not json")
+        with redirect_stdout(StringIO()):
+            again = make_store(self.tmp.name)
+            self.assertEqual(
+                [c["customer_id"] for c in again.load_customers()], ["C9"]
+            )
+
+    def test_point_read_decodes_one_line(self) -> None:
+        self.svc.update_customer("C2", name_full="Bee")
+        store = make_store(self.tmp.name)
+        store.get_customer("C1")  # builds the index
+        with mock.patch.object(
+            store.codec, "loads", wraps=store.codec.loads
+        ) as loads:
+            self.assertEqual(store.get_customer("C2")["name_full"], "Bee")
+        self.assertEqual(loads.call_count, 1)
+        self.assertLess(len(loads.call_args[0][0]), 80)
+
+    def test_close_saves_index_and_store_stays_usable(self) -> None:
+        store = self.svc.store
+        store.get_customer("C1")
+        self.svc.update_customer("C1", name_full="Ann")
+        store.close()
+        # The index on disk now covers the whole file.
+        path = os.path.join(self.tmp.name, "customers.jsonl")
+        log = _LineLog(path, "customer_id", "Customers", store.codec)
+        log._load_index()
+        self.assertEqual(log._covered, os.path.getsize(path))
+        self.assertEqual(store.get_customer("C1")["name_full"], "Ann")
+
+    def test_damaged_line_does_not_shift_later_records(self) -> None:
+        path = os.path.join(self.tmp.name, "customers.jsonl")
+        with open(path, "rb") as f:
+            c1, c2 = f.read().splitlines(keepends=True)
+        c3 = c2.replace(b"C2", b"C3")
+        for bad in (b"1,2\n", c1.rstrip() + b"," + c1):
+            with open(path, "wb") as f:
+                f.write(c1 + bad + c2 + c3)
+            with redirect_stdout(StringIO()) as out:
+                fresh = make_store(self.tmp.name)
+                self.assertEqual(fresh.get_customer("C2")["customer_id"],
+                                 "C2")
+                self.assertEqual(fresh.get_customer("C3")["customer_id"],
+                                 "C3")
+            self.assertIn("[ERROR]", out.getvalue())
+
+    def test_append_after_torn_write_keeps_new_record(self) -> None:
+        path = os.path.join(self.tmp.name, "customers.jsonl")
+        with open(path, "ab") as f:
+            f.write(b'{"customer_id": "C9", "name_fu')  # crash mid-write
+        with redirect_stdout(StringIO()):
+            store = make_store(self.tmp.name)
+            store.put_customers([{"customer_id": "C3", "name_full": "C",
+                                  "email": "c@x.com"}])
+            fresh = make_store(self.tmp.name)
+            ids = sorted(c["customer_id"] for c in fresh.load_customers())
+            self.assertEqual(store.get_customer("C3")["name_full"], "C")
+        self.assertEqual(ids, ["C1", "C2", "C3"])
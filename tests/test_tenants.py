@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+
+from reservation_system.customer import Customer
+from reservation_system.exceptions import ValidationError
+from reservation_system.hotel import Hotel
+from reservation_system.storage import JsonStore, paths_in
+from reservation_system.tenants import TenantRegistry
+
+
+def seed(svc, n: int = 1) -> None:
+    svc.create_hotel(Hotel("H1", "Michelle Inn", "Nagoya", 5))
+    for i in range(n):
+        svc.create_customer(
+            Customer("C{}".format(i), "A", "a{}@x.com".format(i))
+        )
+
+
+class TestTenantRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_tenants_are_isolated_and_share_a_codec(self) -> None:
+        with TenantRegistry(self.root) as reg:
+            with reg.tenant("a") as svc:
+                seed(svc)
+                svc.reserve_room("R1", "H1", "C0", "2026-07-01", "2026-07-02")
+                codec = svc.store.codec
+            with reg.tenant("b") as svc:
+                seed(svc)
+                self.assertIs(svc.store.codec, codec)
+                self.assertEqual(svc.store.load_reservations(), [])
+        store = JsonStore(paths_in(os.path.join(self.root, "a"), "lines"),
+                          layout="lines")
+        self.assertEqual(
+            [r["resv_id"] for r in store.load_reservations()], ["R1"]
+        )
+
+    def test_least_recently_used_tenant_is_evicted(self) -> None:
+        reg = TenantRegistry(self.root, max_tenants=2)
+        for name in ("a", "b"):
+            with reg.tenant(name) as svc:
+                seed(svc)
+        with reg.tenant("a"):
+            pass
+        with reg.tenant("c"):
+            pass
+        self.assertEqual(("a" in reg, "b" in reg, "c" in reg),
+                         (True, False, True))
+        self.assertEqual(reg.evictions, 1)
+        # Reopening an evicted tenant finds its data again.
+        with reg.tenant("b") as svc:
+            self.assertEqual(svc.get_hotel("H1").name, "Michelle Inn")
+        self.assertNotIn("a", reg)
+        reg.close()
+        self.assertEqual(len(reg), 0)
+
+    def test_memory_budget_and_pinning(self) -> None:
+        reg = TenantRegistry(self.root, max_bytes=1)
+        with reg.tenant("a") as svc_a:
+            seed(svc_a, 20)
+            with reg.tenant("b") as svc_b:
+                seed(svc_b)
+                # Both are in use, so neither may be closed yet.
+                self.assertEqual(len(reg), 2)
+            self.assertNotIn("b", reg)
+            self.assertIn("a", reg)
+            self.assertFalse(reg.evict("a"))
+        # Once idle, "a" alone is over the budget too.
+        self.assertEqual((len(reg), reg.open_bytes, reg.evictions),
+                         (0, 0, 2))
+
+    def test_explicit_evict(self) -> None:
+        reg = TenantRegistry(self.root)
+        with reg.tenant("a") as svc:
+            seed(svc)
+        self.assertGreater(reg.open_bytes, 0)
+        self.assertTrue(reg.evict("a"))
+        self.assertFalse(reg.evict("a"))
+        self.assertEqual(reg.open_bytes, 0)
+
+    def test_submit_runs_on_shared_pool(self) -> None:
+        with TenantRegistry(self.root, workers=4) as reg:
+            futures = [
+                reg.submit(name, seed, 3) for name in ("a", "b", "c")
+            ]
+            for f in futures:
+                f.result()
+            counts = [
+                reg.submit(name, lambda s: len(s.store.load_customers()))
+                for name in ("a", "b", "c")
+            ]
+            self.assertEqual([f.result() for f in counts], [3, 3, 3])
+
+    def test_invalid_tenant_names(self) -> None:
+        reg = TenantRegistry(self.root)
+        for name in ("", " ", ".", "..", "a/b", None):
+            with self.assertRaises(ValidationError):
+                with reg.tenant(name):
+                    pass
+        with self.assertRaises(ValueError):
+            TenantRegistry(self.root, max_tenants=0)